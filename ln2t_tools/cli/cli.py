@@ -15,7 +15,7 @@ from ln2t_tools.utils.defaults import (
 )
 
 # Import tool registry for dynamic tool loading
-from ln2t_tools.tools import get_all_tools, auto_discover_tools
+from ln2t_tools.tools import get_all_tools, get_tool, list_tool_names
 
 # Custom logging levels
 MINIMAL = 25  # Between INFO (20) and WARNING (30)
@@ -375,6 +375,63 @@ def add_common_arguments(parser, exclude_participant_label=False):
         help="FreeSurfer version to use for input data (when tool depends on FreeSurfer). "
              "Default: auto-detect latest"
     )
+    
+    paths.add_argument(
+        "--bids-db",
+        type=Path,
+        default=None,
+        help="Directory where BIDS layout indexes are saved and reused across runs. "
+             "Default: $BIDS_DB_PATH if set, otherwise re-index on every run"
+    )
+
+
+def add_cohort_arguments(parser, supports_batch=False):
+    """Add options for processing several participants concurrently.
+    
+    Only tools that main() dispatches through BaseTool.process_cohort
+    (see BaseTool.supports_cohort) get these options.
+    
+    Args:
+        parser: argparse parser to add arguments to
+        supports_batch: If True, also add --batch-size
+                        (for tools implementing build_batch_command)
+    """
+    cohort = parser.add_argument_group(
+        f'{Colors.BOLD}Parallel Processing Options{Colors.END}'
+    )
+    
+    cohort.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of participants to process concurrently on this machine "
+             "(default: 1). Use 0 to size from the CPU count and the tool's cores per job"
+    )
+    
+    cohort.add_argument(
+        "--async-jobs",
+        type=int,
+        default=0,
+        help="Run up to N participants concurrently from a single asyncio event loop "
+             "instead of a thread pool (default: 0, disabled)"
+    )
+    
+    cohort.add_argument(
+        "--parallel-backend",
+        choices=["thread", "process"],
+        default="thread",
+        help="Executor used by --jobs: threads sharing one BIDS layout, or "
+             "processes that each load the layout (default: thread)"
+    )
+    
+    if supports_batch:
+        cohort.add_argument(
+            "--batch-size",
+            type=int,
+            default=1,
+            help="Number of participants to run in a single container invocation "
+                 "(default: 1)"
+        )
 
 
 def add_hpc_arguments(parser):
@@ -388,6 +445,22 @@ def add_hpc_arguments(parser):
         action="store_true",
         help="Submit job to HPC cluster instead of running locally"
     )
+    hpc_submit.add_argument(
+        "--hpc-wait",
+        action="store_true",
+        help="Wait for submitted HPC jobs to finish before returning"
+    )
+    hpc_submit.add_argument(
+        "--hpc-array",
+        action="store_true",
+        help="Submit all participants as a single SLURM job array"
+    )
+    hpc_submit.add_argument(
+        "--hpc-array-max",
+        type=int,
+        metavar="N",
+        help="Maximum number of array tasks running at once (with --hpc-array)"
+    )
     
     hpc_auth = parser.add_argument_group(
         f'{Colors.BOLD}HPC Authentication{Colors.END}'
@@ -475,6 +548,33 @@ def add_hpc_arguments(parser):
     )
 
 
+def _tools_for_argv(argv: List[str]):
+    """Return the tool classes needed to parse a command line.
+    
+    When the command line names a tool subcommand, only that tool is
+    imported and given a subparser; ``import`` needs no tool at all.
+    Every tool is discovered otherwise, e.g. for the top-level help.
+    
+    Args:
+        argv: Command line arguments, without the program name
+        
+    Returns:
+        Mapping[str, Type[BaseTool]]: Tool names to tool classes
+    """
+    tool_names = set(list_tool_names())
+    for arg in argv:
+        if arg in ('-h', '--help'):
+            break
+        if arg == 'import':
+            return {}
+        if arg in tool_names:
+            tool_class = get_tool(arg)
+            if tool_class is not None:
+                return {arg: tool_class}
+            break
+    return get_all_tools()
+
+
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments.
 
@@ -485,8 +585,8 @@ def parse_args() -> argparse.Namespace:
     Returns:
         argparse.Namespace: Parsed command line arguments
     """
-    # Auto-discover tools from the tools/ directory
-    auto_discover_tools()
+    # Import only the tool named on the command line, if any
+    tools = _tools_for_argv(sys.argv[1:])
     
     description = textwrap.dedent(f"""
     {Colors.BOLD}{Colors.GREEN}╔══════════════════════════════════════════════════════════════════════════════╗
@@ -654,7 +754,7 @@ def parse_args() -> argparse.Namespace:
     dataset_wide_tools = ['bids_validator']
 
     # Dynamically create subparsers from registered tools
-    for tool_name, tool_class in get_all_tools().items():
+    for tool_name, tool_class in tools.items():
         tool_parser = subparsers.add_parser(
             tool_name,
             help=tool_class.help_text if hasattr(tool_class, 'help_text') else tool_class.description,
@@ -667,6 +767,8 @@ def parse_args() -> argparse.Namespace:
         # Add HPC arguments for cluster submission (not for dataset-wide tools)
         if tool_name not in dataset_wide_tools:
             add_hpc_arguments(tool_parser)
+        if tool_class.supports_cohort:
+            add_cohort_arguments(tool_parser, supports_batch=tool_class.supports_batch)
         # Add tool-specific arguments if the tool class provides them
         if hasattr(tool_class, 'add_arguments'):
             tool_class.add_arguments(tool_parser)
@@ -707,6 +809,25 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip compressing source data after import (by default, source is compressed and original deleted)"
     )
+    parser_import.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of participants converted in parallel for MRS data (default: 2)"
+    )
+    parser_import.add_argument(
+        "--source-compressor",
+        choices=["gzip", "zstd"],
+        default="gzip",
+        help="Compression for MRS source archives (default: gzip). zstd needs the "
+             "'zstd' extra (zstandard); without it, gzip is used and a warning is shown"
+    )
+    parser_import.add_argument(
+        "--verify-archives",
+        action="store_true",
+        help="Re-read each new MRS source archive and compare it with the source "
+             "directory before the original is deleted (slower)"
+    )
     parser_import.add_argument(
         "--deface",
         action="store_true",
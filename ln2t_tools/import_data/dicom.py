@@ -89,9 +89,8 @@ def verify_archive_integrity(archive_path: Path, extracted_dir: Path) -> bool:
     """
     try:
         # Get list of files in archive
-        with tarfile.open(archive_path, 'r:gz') as tar:
-            archive_members = tar.getmembers()
-            archive_files = {m.name: m.size for m in archive_members if m.isfile()}
+        with tarfile.open(archive_path, 'r|gz') as tar:
+            archive_files = {m.name: m.size for m in tar if m.isfile()}
         
         # Get list of files in extracted directory
         extracted_files = {}
@@ -149,9 +148,8 @@ def create_verified_archive(source_path: Path, archive_path: Path) -> bool:
         
         # Verify archive by reading it back
         logger.info(f"Verifying archive integrity...")
-        with tarfile.open(temp_archive, 'r:gz') as tar:
-            members = tar.getmembers()
-            archive_files = {m.name: m.size for m in members if m.isfile()}
+        with tarfile.open(temp_archive, 'r|gz') as tar:
+            archive_files = {m.name: m.size for m in tar if m.isfile()}
         
         # Compare with source
         source_files = {}
@@ -5,10 +5,14 @@ import subprocess
 import shutil
 import tarfile
 import os
+import re
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import List, Optional, Tuple, Dict, Iterator
 from datetime import datetime, timedelta
 import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +20,17 @@ logger = logging.getLogger(__name__)
 DEFAULT_MRRAW_DIR = Path("/home/ln2t-worker/PETMR/backup/auto/daily_backups/mrraw")
 DEFAULT_TMP_DIR = Path("/home/ln2t-worker/PETMR/backup/auto/daily_backups/tmp")
 
+# I/O buffer size used when reading and writing source archives (1 MiB)
+ARCHIVE_BUFFER_SIZE = 1 << 20
+
+# Recognised source archive extensions, in lookup order
+ARCHIVE_SUFFIXES = ('.tar.zst', '.tar.gz')
+
+# Participants converted at once by import_mrs unless told otherwise. The
+# spec2bids runs all write into the same rawdata directory and each may
+# hold an extracted source tree, so this is kept small.
+DEFAULT_MRS_WORKERS = 2
+
 
 # =============================================================================
 # Pre-import functions: Gather P-files from scanner backup locations
@@ -363,7 +378,7 @@ def pre_import_mrs(
         
         metadata = get_dicom_metadata(dicom_file)
         
-        logger.info(f"  DICOM metadata:")
+        logger.info("  DICOM metadata:")
         logger.info(f"    Exam Date: {metadata['exam_date']}")
         logger.info(f"    Exam Time: {metadata['exam_time']}")
         logger.info(f"    Exam Number: {metadata['exam_number']}")
@@ -386,7 +401,7 @@ def pre_import_mrs(
                 logger.info(f"  Found {len(mrraw_pfiles)} P-file(s) in mrraw by datetime")
                 pfiles.extend(mrraw_pfiles)
             else:
-                logger.info(f"  No P-files found in mrraw matching datetime")
+                logger.info("  No P-files found in mrraw matching datetime")
         
         # From tmp by exam number
         if metadata['exam_number'] is not None:
@@ -444,7 +459,7 @@ def pre_import_mrs(
     
     # Summary
     logger.info(f"\n{'='*60}")
-    logger.info(f"MRS Pre-import Summary:")
+    logger.info("MRS Pre-import Summary:")
     logger.info(f"  Successful: {success_count}/{len(participant_labels)}")
     if failed_participants:
         logger.info(f"  Failed: {', '.join(failed_participants)}")
@@ -475,7 +490,7 @@ def discover_participants_from_mrs_dir(
         Dataset initials prefix (e.g., 'CB', 'HP')
     only_uncompressed : bool
         If True, only consider uncompressed folders (e.g., AB001) and skip
-        .tar.gz archives. If False, consider both folders and archives.
+        .tar.zst/.tar.gz archives. If False, consider both folders and archives.
         Default: False
         
     Returns
@@ -486,44 +501,157 @@ def discover_participants_from_mrs_dir(
     participants = set()
     
     # Pattern: {ds_initials}* (e.g., CB001, CB002, HP042SES1)
-    # Look for both directories and .tar.gz archives (or only directories if only_uncompressed=True)
+    # Look for both directories and archives (or only directories if only_uncompressed=True)
     
-    for item in mrs_dir.iterdir():
-        name = item.name
-        is_archive = name.endswith('.tar.gz')
-        
-        # Skip archives if only_uncompressed is True
-        if is_archive and only_uncompressed:
-            continue
-        
-        # Remove .tar.gz extension if present
-        if is_archive:
-            name = name[:-7]  # Remove '.tar.gz'
-        
-        # Check if it starts with the dataset initials
-        if name.startswith(ds_initials):
-            # Extract participant ID by removing the initials
-            participant_part = name[len(ds_initials):]
-            
-            # Handle session suffix (e.g., "042SES1" -> "042")
-            if 'SES' in participant_part.upper():
-                participant_part = participant_part.upper().split('SES')[0]
-            
+    # Single precompiled match: initials, participant, optional session suffix
+    # (case-insensitive, e.g. "042SES1" -> "042") and optional archive extension
+    name_pattern = re.compile(
+        rf"{re.escape(ds_initials)}(?P<participant>.*?)"
+        r"(?P<session>(?i:SES).*?)?(?P<archive>\.tar\.(?:zst|gz))?"
+    )
+    
+    # os.scandir avoids building a Path object per entry; only the name is needed
+    with os.scandir(mrs_dir) as entries:
+        for entry in entries:
+            match = name_pattern.fullmatch(entry.name)
+            if match is None:
+                continue
+
+            # Skip archives if only_uncompressed is True
+            if only_uncompressed and match['archive']:
+                continue
+
+            participant_part = match['participant']
+            if match['session'] is not None:
+                participant_part = participant_part.upper()
+
             if participant_part:
                 participants.add(participant_part)
     
     result = sorted(list(participants))
-    logger.info(f"Discovered {len(result)} participants from {mrs_dir}: {result}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Discovered %d participants from %s: %s", len(result), mrs_dir, result)
     return result
 
 
+def _collect_file_sizes(directory: Path) -> Dict[str, int]:
+    """Map regular files below a directory to their sizes.
+    
+    Keys are paths relative to the parent of ``directory``, which matches
+    the member names used in the archives. Sizes come from the cached
+    ``os.DirEntry`` data so that no extra ``Path`` objects are built, and
+    symlinks are not followed (tar stores them as links, not files).
+    
+    Parameters
+    ----------
+    directory : Path
+        Directory to scan recursively
+        
+    Returns
+    -------
+    Dict[str, int]
+        Relative file path -> size in bytes
+    """
+    file_sizes = {}
+    # Each pending item carries its path relative to directory.parent, so
+    # relative keys are built by joining names instead of os.path.relpath
+    pending = [(os.fspath(directory), directory.name)]
+    while pending:
+        current, rel_dir = pending.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}"
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, rel_path))
+                elif entry.is_file(follow_symlinks=False):
+                    file_sizes[rel_path] = entry.stat(follow_symlinks=False).st_size
+    return file_sizes
+
+
+def _default_archive_suffix(compressor: str = 'gzip') -> str:
+    """Return the archive extension to use for newly compressed sources.
+    
+    zstd archives require the optional ``zstandard`` package (the ``zstd``
+    extra); if it is missing, a warning is logged and gzip is used.
+    """
+    if compressor == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+            return '.tar.zst'
+        except ImportError:
+            logger.warning(
+                "zstandard is not installed (pip install 'ln2t_tools[zstd]'), "
+                "compressing sources with gzip instead"
+            )
+    return '.tar.gz'
+
+
+def find_source_archive(mrs_dir: Path, source_name: str) -> Optional[Path]:
+    """Return the existing archive for a source directory, if any.
+    
+    Parameters
+    ----------
+    mrs_dir : Path
+        Path to mrs directory
+    source_name : str
+        Name of the source directory (e.g., 'CB042')
+        
+    Returns
+    -------
+    Optional[Path]
+        Path to the .tar.zst or .tar.gz archive, or None if neither exists
+    """
+    for suffix in ARCHIVE_SUFFIXES:
+        archive_path = mrs_dir / f"{source_name}{suffix}"
+        if archive_path.exists():
+            return archive_path
+    return None
+
+
+@contextmanager
+def _open_archive_stream(
+    path: Path,
+    mode: str,
+    archive_name: Optional[str] = None
+) -> Iterator[tarfile.TarFile]:
+    """Open a .tar.zst or .tar.gz archive as a sequential tar stream.
+    
+    Parameters
+    ----------
+    path : Path
+        File to read from or write to
+    mode : str
+        'r' to read, 'w' to write
+    archive_name : Optional[str]
+        Name whose extension selects the compression (defaults to
+        ``path.name``; useful when writing to a temporary file)
+    """
+    archive_name = archive_name or path.name
+    with ExitStack() as stack:
+        fileobj = stack.enter_context(open(path, f"{mode}b", buffering=ARCHIVE_BUFFER_SIZE))
+        if archive_name.endswith('.tar.zst'):
+            import zstandard
+            if mode == 'w':
+                cctx = zstandard.ZstdCompressor(level=3, threads=-1)
+                fileobj = stack.enter_context(cctx.stream_writer(fileobj))
+            else:
+                fileobj = stack.enter_context(zstandard.ZstdDecompressor().stream_reader(fileobj))
+            tar_mode = f"{mode}|"
+        else:
+            tar_mode = f"{mode}|gz"
+        yield stack.enter_context(tarfile.open(
+            fileobj=fileobj, mode=tar_mode,
+            bufsize=ARCHIVE_BUFFER_SIZE, copybufsize=ARCHIVE_BUFFER_SIZE
+        ))
+
+
 def verify_archive_integrity(archive_path: Path, extracted_dir: Path) -> bool:
     """Verify that an archive was extracted correctly by comparing file counts and sizes.
     
     Parameters
     ----------
     archive_path : Path
-        Path to the .tar.gz archive
+        Path to the .tar.zst or .tar.gz archive
     extracted_dir : Path
         Path to the extracted directory
         
@@ -533,51 +661,58 @@ def verify_archive_integrity(archive_path: Path, extracted_dir: Path) -> bool:
         True if verification passes, False otherwise
     """
     try:
-        # Get list of files in archive
-        with tarfile.open(archive_path, 'r:gz') as tar:
-            archive_members = tar.getmembers()
-            archive_files = {m.name: m.size for m in archive_members if m.isfile()}
+        # Get list of files in archive (streaming mode: members are read
+        # sequentially without building a seekable index)
+        with _open_archive_stream(archive_path, 'r') as tar:
+            archive_files = {m.name: m.size for m in tar if m.isfile()}
         
         # Get list of files in extracted directory
-        extracted_files = {}
-        for root, dirs, files in os.walk(extracted_dir):
-            for f in files:
-                filepath = Path(root) / f
-                rel_path = filepath.relative_to(extracted_dir.parent)
-                extracted_files[str(rel_path)] = filepath.stat().st_size
-        
-        # Compare
-        if len(archive_files) != len(extracted_files):
-            logger.error(f"File count mismatch: archive has {len(archive_files)}, extracted has {len(extracted_files)}")
-            return False
+        extracted_files = _collect_file_sizes(extracted_dir)
         
-        for name, size in archive_files.items():
-            if name not in extracted_files:
-                logger.error(f"Missing file after extraction: {name}")
-                return False
-            if extracted_files[name] != size:
-                logger.error(f"Size mismatch for {name}: archive {size}, extracted {extracted_files[name]}")
-                return False
+        # Compare (single dict comparison; details only computed on failure)
+        if archive_files == extracted_files:
+            return True
         
-        return True
+        if len(archive_files) != len(extracted_files):
+            logger.error("File count mismatch: archive has %d, extracted has %d",
+                         len(archive_files), len(extracted_files))
+        for name in sorted(archive_files.keys() - extracted_files.keys()):
+            logger.error("Missing file after extraction: %s", name)
+        for name in sorted(archive_files.keys() & extracted_files.keys()):
+            if archive_files[name] != extracted_files[name]:
+                logger.error("Size mismatch for %s: archive %s, extracted %s",
+                             name, archive_files[name], extracted_files[name])
+        return False
         
     except Exception as e:
-        logger.error(f"Archive verification failed: {e}")
+        logger.error("Archive verification failed: %s", e)
         return False
 
 
-def create_verified_archive(source_path: Path, archive_path: Path) -> bool:
-    """Create a tar.gz archive with verification.
+def create_verified_archive(
+    source_path: Path,
+    archive_path: Path,
+    paranoid: bool = False
+) -> bool:
+    """Create a compressed tar archive with verification.
     
-    Creates the archive and verifies it can be read back correctly before
-    considering it successful.
+    The source tree is indexed before writing, and the size of every member
+    is recorded as it is written to the archive. Both are compared before
+    the archive is considered successful, so the archive does not have to
+    be decompressed a second time. Write errors (including source files
+    shrinking while being archived) are raised by tarfile and fail the
+    archive as well.
     
     Parameters
     ----------
     source_path : Path
         Path to the directory to compress
     archive_path : Path
-        Path for the output .tar.gz file
+        Path for the output archive. A .tar.zst extension selects zstd
+        compression (requires ``zstandard``), anything else gzip.
+    paranoid : bool
+        If True, additionally decompress the written archive and check its
+        members against the source. Default: False
         
     Returns
     -------
@@ -587,48 +722,54 @@ def create_verified_archive(source_path: Path, archive_path: Path) -> bool:
     temp_archive = archive_path.parent / f".{archive_path.name}.tmp"
     
     try:
-        # Create archive
-        logger.info(f"Creating archive: {archive_path.name}...")
-        with tarfile.open(temp_archive, "w:gz") as tar:
-            tar.add(source_path, arcname=source_path.name)
-        
-        # Verify archive by reading it back
-        logger.info(f"Verifying archive integrity...")
-        with tarfile.open(temp_archive, 'r:gz') as tar:
-            members = tar.getmembers()
-            archive_files = {m.name: m.size for m in members if m.isfile()}
-        
-        # Compare with source
-        source_files = {}
-        for root, dirs, files in os.walk(source_path):
-            for f in files:
-                filepath = Path(root) / f
-                rel_path = filepath.relative_to(source_path.parent)
-                source_files[str(rel_path)] = filepath.stat().st_size
-        
-        if len(archive_files) != len(source_files):
-            logger.error(f"Archive verification failed: file count mismatch "
-                        f"(source: {len(source_files)}, archive: {len(archive_files)})")
+        # Index source files before writing
+        source_files = _collect_file_sizes(source_path)
+        
+        # Create archive, recording member sizes as they are written
+        archive_files = {}
+        
+        def _record_member(tarinfo: tarfile.TarInfo) -> tarfile.TarInfo:
+            if tarinfo.isfile():
+                archive_files[tarinfo.name] = tarinfo.size
+            # Owner names are not needed: archives are extracted with numeric_owner
+            tarinfo.uname = ''
+            tarinfo.gname = ''
+            return tarinfo
+        
+        logger.info("Creating archive: %s...", archive_path.name)
+        with _open_archive_stream(temp_archive, 'w', archive_name=archive_path.name) as tar:
+            tar.add(source_path, arcname=source_path.name, filter=_record_member)
+        
+        # Compare written members with source
+        logger.info("Verifying archive integrity...")
+        if archive_files != source_files:
+            if len(archive_files) != len(source_files):
+                logger.error("Archive verification failed: file count mismatch "
+                             "(source: %d, archive: %d)", len(source_files), len(archive_files))
+            for name in sorted(source_files.keys() - archive_files.keys()):
+                logger.error("Archive verification failed: missing file %s", name)
+            for name in sorted(source_files.keys() & archive_files.keys()):
+                if archive_files[name] != source_files[name]:
+                    logger.error("Archive verification failed: size mismatch for %s", name)
             temp_archive.unlink(missing_ok=True)
             return False
         
-        for name, size in source_files.items():
-            if name not in archive_files:
-                logger.error(f"Archive verification failed: missing file {name}")
-                temp_archive.unlink(missing_ok=True)
-                return False
-            if archive_files[name] != size:
-                logger.error(f"Archive verification failed: size mismatch for {name}")
+        if paranoid:
+            logger.info("Re-reading archive for full verification...")
+            with _open_archive_stream(temp_archive, 'r', archive_name=archive_path.name) as tar:
+                written_files = {m.name: m.size for m in tar if m.isfile()}
+            if written_files != source_files:
+                logger.error("Archive verification failed: re-read archive does not match source")
                 temp_archive.unlink(missing_ok=True)
                 return False
         
         # Move temp file to final location
         temp_archive.rename(archive_path)
-        logger.info(f"✓ Archive created and verified: {archive_path.name}")
+        logger.info("✓ Archive created and verified: %s", archive_path.name)
         return True
         
     except Exception as e:
-        logger.error(f"Failed to create archive: {e}")
+        logger.error("Failed to create archive: %s", e)
         temp_archive.unlink(missing_ok=True)
         return False
 
@@ -657,7 +798,6 @@ def extract_archive_if_needed(
         (Path to source directory or None if not found, True if was extracted from archive)
     """
     source_path = mrs_dir / source_name
-    archive_path = mrs_dir / f"{source_name}.tar.gz"
     
     # If directory exists, use it directly
     if source_path.exists():
@@ -665,31 +805,130 @@ def extract_archive_if_needed(
     
     # If only_uncompressed is True, don't use archives
     if only_uncompressed:
-        logger.debug(f"--only-uncompressed is set, skipping archive check for {source_name}")
+        logger.debug("--only-uncompressed is set, skipping archive check for %s", source_name)
         return None, False
     
     # If archive exists, extract it
-    if archive_path.exists():
-        logger.info(f"Directory {source_name} not found, extracting from archive...")
+    archive_path = find_source_archive(mrs_dir, source_name)
+    if archive_path is not None:
+        logger.info("Directory %s not found, extracting from archive...", source_name)
         try:
-            with tarfile.open(archive_path, 'r:gz') as tar:
-                tar.extractall(path=mrs_dir)
+            with _open_archive_stream(archive_path, 'r') as tar:
+                # numeric_owner skips the per-member passwd/group name lookups
+                tar.extractall(path=mrs_dir, numeric_owner=True)
             
             if source_path.exists():
-                logger.info(f"✓ Extracted {source_name} from archive")
+                logger.info("✓ Extracted %s from archive", source_name)
                 return source_path, True
             else:
-                logger.error(f"Archive extracted but {source_name} directory not found")
+                logger.error("Archive extracted but %s directory not found", source_name)
                 return None, False
                 
         except Exception as e:
-            logger.error(f"Failed to extract archive {archive_path.name}: {e}")
+            logger.error("Failed to extract archive %s: %s", archive_path.name, e)
             return None, False
     
     # Neither directory nor archive exists
     return None, False
 
 
+@lru_cache(maxsize=32)
+def _resolve_tool(tool: str, venv_path: Optional[str] = None) -> Optional[str]:
+    """Locate an executable, looking in a virtual environment first.
+    
+    Results are cached for the lifetime of the process, so repeated imports
+    do not search the PATH again.
+    
+    Parameters
+    ----------
+    tool : str
+        Name of the executable (e.g., 'spec2bids')
+    venv_path : Optional[str]
+        Virtual environment whose bin/ directory is searched before PATH
+        
+    Returns
+    -------
+    Optional[str]
+        Full path to the executable, or None if not found
+    """
+    search_path = os.environ.get('PATH', os.defpath)
+    if venv_path is not None:
+        search_path = os.pathsep.join([os.path.join(venv_path, 'bin'), search_path])
+    return shutil.which(tool, path=search_path)
+
+
+def _convert_mrs_participant(
+    participant_id: str,
+    source_name: str,
+    mrs_dir: Path,
+    rawdata_dir: Path,
+    config_file: Path,
+    session: Optional[str],
+    spec2bids_path: str,
+    spec2bids_env: Optional[Dict[str, str]],
+    only_uncompressed: bool
+) -> Tuple[str, bool, Optional[Path], bool]:
+    """Run spec2bids for a single participant.
+    
+    Runs in a worker process of ``import_mrs``. The source directory is
+    extracted from its archive if needed, and an extracted directory is
+    removed again as soon as spec2bids has finished. Compression of
+    uncompressed sources is left to the caller.
+    
+    Returns
+    -------
+    Tuple[str, bool, Optional[Path], bool]
+        (participant ID, True if conversion succeeded, source directory,
+        True if the source directory was extracted from an archive)
+    """
+    # Try to get source path (extract from archive if needed)
+    source_path, was_extracted = extract_archive_if_needed(mrs_dir, source_name, only_uncompressed=only_uncompressed)
+    
+    if source_path is None:
+        if only_uncompressed:
+            logger.error("Source MRS not found: %s (checked directory only, --only-uncompressed is active)", source_name)
+        else:
+            logger.error("Source MRS not found: %s (checked directory and .tar.zst/.tar.gz archive)", source_name)
+        logger.error("Expected naming convention: %s", source_name)
+        return participant_id, False, None, False
+    
+    # Run spec2bids
+    logger.info("Running spec2bids for %s...", participant_id)
+    
+    # Build spec2bids command (executed directly, without a shell)
+    cmd = [spec2bids_path, '-p', participant_id]
+    if session:
+        cmd += ['-s', session]
+    cmd += ['-o', str(rawdata_dir), '-d', str(source_path), '-c', str(config_file)]
+    
+    try:
+        result = subprocess.run(
+            cmd,
+            env=spec2bids_env,
+            check=True,
+            capture_output=True,
+            text=True
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error("✗ Failed to import MRS data for %s: %s", participant_id, e.stderr)
+        
+        # If we extracted from archive and conversion failed, still clean up
+        if was_extracted and source_path.exists():
+            logger.info("Cleaning up extracted directory after failed conversion: %s", source_path.name)
+            shutil.rmtree(source_path)
+        return participant_id, False, source_path, was_extracted
+    
+    logger.info("✓ Successfully imported MRS data for %s", participant_id)
+    if result.stdout:
+        logger.debug(result.stdout)
+    
+    # If we extracted from archive and conversion succeeded, clean up extracted directory
+    if was_extracted:
+        logger.info("Cleaning up extracted directory: %s", source_path.name)
+        shutil.rmtree(source_path)
+    return participant_id, True, source_path, was_extracted
+
+
 def import_mrs(
     dataset: str,
     participant_labels: Optional[List[str]],
@@ -700,7 +939,10 @@ def import_mrs(
     compress_source: bool = True,
     venv_path: Optional[Path] = None,
     overwrite: bool = False,
-    only_uncompressed: bool = False
+    only_uncompressed: bool = False,
+    max_workers: Optional[int] = None,
+    compressor: str = 'gzip',
+    verify_archives: bool = False
 ) -> tuple[bool, List[str]]:
     """Import MRS data to BIDS format using spec2bids.
     
@@ -732,6 +974,16 @@ def import_mrs(
     only_uncompressed : bool
         If True, only check for uncompressed folders and disregard compressed archives.
         Default: False
+    max_workers : Optional[int]
+        Number of participants converted in parallel.
+        Default: DEFAULT_MRS_WORKERS
+    compressor : str
+        Compression used for new source archives: 'gzip' (default) or
+        'zstd', which needs the zstandard package and falls back to gzip
+        with a warning when it is not installed.
+    verify_archives : bool
+        If True, re-read each new source archive and check it against the
+        source directory before the directory is deleted. Default: False
         
     Returns
     -------
@@ -740,7 +992,7 @@ def import_mrs(
     """
     # Validate paths
     if not sourcedata_dir.exists():
-        logger.error(f"Source data directory not found: {sourcedata_dir}")
+        logger.error("Source data directory not found: %s", sourcedata_dir)
         return (False, [])
     
     # MRS data can be in 'mrs' or 'pfiles' directory
@@ -748,7 +1000,7 @@ def import_mrs(
     if not mrs_dir.exists():
         mrs_dir = sourcedata_dir / "pfiles"
         if not mrs_dir.exists():
-            logger.error(f"MRS directory not found in {sourcedata_dir} (tried 'mrs' and 'pfiles')")
+            logger.error("MRS directory not found in %s (tried 'mrs' and 'pfiles')", sourcedata_dir)
             return (False, [])
     
     # Check for spec2bids config
@@ -757,13 +1009,14 @@ def import_mrs(
         config_file = sourcedata_dir / "configs" / "spec2bids.json"
         if not config_file.exists():
             logger.error(
-                f"spec2bids config not found at:\n"
-                f"  {sourcedata_dir}/spec2bids/config.json\n"
-                f"  {sourcedata_dir}/configs/spec2bids.json"
+                "spec2bids config not found at:\n"
+                "  %s/spec2bids/config.json\n"
+                "  %s/configs/spec2bids.json",
+                sourcedata_dir, sourcedata_dir
             )
             return (False, [])
     
-    logger.info(f"Using spec2bids config: {config_file}")
+    logger.info("Using spec2bids config: %s", config_file)
     
     # Validate config structure
     try:
@@ -776,7 +1029,7 @@ def import_mrs(
             logger.error("spec2bids config missing 'descriptions' field")
             return (False, [])
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in config file: {e}")
+        logger.error("Invalid JSON in config file: %s", e)
         return (False, [])
     
     # If ds_initials not provided, extract from dataset name
@@ -789,10 +1042,10 @@ def import_mrs(
             name_part = parts[1]  # e.g., "Fantastic_Fox"
             words = name_part.replace('_', ' ').split()
             ds_initials = ''.join([w[0].upper() for w in words if w])
-            logger.info(f"Inferred dataset initials: {ds_initials}")
+            logger.info("Inferred dataset initials: %s", ds_initials)
         else:
-            logger.error(f"Could not infer dataset initials from '{dataset}'. "
-                        f"Please provide --ds-initials explicitly.")
+            logger.error("Could not infer dataset initials from '%s'. "
+                         "Please provide --ds-initials explicitly.", dataset)
             return (False, [])
     
     # Discover participants if not provided
@@ -801,7 +1054,7 @@ def import_mrs(
         participant_labels = discover_participants_from_mrs_dir(mrs_dir, ds_initials, only_uncompressed=only_uncompressed)
         
         if not participant_labels:
-            logger.error(f"No participants found in {mrs_dir} matching pattern {ds_initials}*")
+            logger.error("No participants found in %s matching pattern %s*", mrs_dir, ds_initials)
             return (False, [])
     
     # Filter out existing participants unless overwrite is enabled
@@ -816,7 +1069,7 @@ def import_mrs(
                 existing_mrs_dir = rawdata_dir / f"sub-{participant_id}" / "mrs"
             
             if existing_mrs_dir.exists():
-                logger.info(f"Participant {participant_id} already has MRS data, skipping (use --overwrite to re-process)")
+                logger.info("Participant %s already has MRS data, skipping (use --overwrite to re-process)", participant_id)
             else:
                 new_participants.append(participant)
         
@@ -826,39 +1079,36 @@ def import_mrs(
         
         participant_labels = new_participants
     
-    # Check for spec2bids executable (priority order)
+    # Check for spec2bids executable (priority order). The executable and
+    # its environment are resolved once and reused for every participant.
     spec2bids_path = None
-    venv_cmd = ""
+    spec2bids_env = None
     
     # Priority 1: Check /opt/ln2t/spec2bids/venv/spec2bids
     opt_spec2bids = Path("/opt/ln2t/spec2bids/venv/spec2bids")
     if opt_spec2bids.exists() and opt_spec2bids.is_file():
-        spec2bids_path = opt_spec2bids
-        logger.info(f"Using spec2bids from priority path: {spec2bids_path}")
+        spec2bids_path = str(opt_spec2bids)
+        logger.info("Using spec2bids from priority path: %s", spec2bids_path)
     else:
-        # Priority 2: Setup virtual environment
+        # Priority 2: Setup virtual environment (equivalent to sourcing bin/activate)
         if venv_path is None:
             venv_path = Path("/opt/ln2t/venv/ln2t_tools")
         
         activate_script = venv_path / "bin" / "activate"
         if not activate_script.exists():
-            logger.warning(f"Virtual environment not found at {venv_path}, will try system spec2bids")
-            venv_cmd = ""
+            logger.warning("Virtual environment not found at %s, will try system spec2bids", venv_path)
         else:
-            venv_cmd = f". {activate_script} && "
+            spec2bids_env = os.environ.copy()
+            spec2bids_env['VIRTUAL_ENV'] = str(venv_path)
+            spec2bids_env['PATH'] = os.pathsep.join(
+                [str(venv_path / "bin"), spec2bids_env.get('PATH', os.defpath)]
+            )
         
-        # Priority 3: Check if spec2bids is available via which
-        check_cmd = f"{venv_cmd}which spec2bids"
-        result = subprocess.run(
-            check_cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            executable='/bin/bash'
-        )
+        # Priority 3: Check if spec2bids is available on the (venv) PATH
+        spec2bids_path = _resolve_tool('spec2bids', str(venv_path) if spec2bids_env else None)
         
-        if result.returncode == 0:
-            logger.info(f"Found spec2bids via which: {result.stdout.strip()}")
+        if spec2bids_path:
+            logger.info("Found spec2bids via which: %s", spec2bids_path)
         else:
             logger.error(
                 "spec2bids not found. Please install it:\n"
@@ -871,100 +1121,76 @@ def import_mrs(
     # Create rawdata directory if needed
     rawdata_dir.mkdir(parents=True, exist_ok=True)
     
-    # Process each participant
+    # Normalize participant IDs and source directory names once.
+    # Use strict naming convention: AB042 or AB042SES4
+    ses_suffix = f"SES{session}" if session else ""
+    participant_ids = [participant.replace('sub-', '') for participant in participant_labels]
+    jobs = [
+        (participant_id, f"{ds_initials}{participant_id}{ses_suffix}")
+        for participant_id in participant_ids
+    ]
+    
+    # Convert participants in parallel; each conversion is independent
+    conversions = {}
+    with ProcessPoolExecutor(max_workers=max_workers or DEFAULT_MRS_WORKERS) as executor:
+        futures = {
+            executor.submit(
+                _convert_mrs_participant,
+                participant_id, source_name, mrs_dir, rawdata_dir, config_file,
+                session, spec2bids_path, spec2bids_env, only_uncompressed
+            ): participant_id
+            for participant_id, source_name in jobs
+        }
+        
+        for future in as_completed(futures):
+            try:
+                participant_id, success, source_path, was_extracted = future.result()
+            except Exception as e:
+                # A crashed worker only fails its own participant
+                participant_id = futures[future]
+                logger.error("Error converting MRS data for %s: %s", participant_id, e)
+                success, source_path, was_extracted = False, None, False
+            conversions[participant_id] = (success, source_path, was_extracted)
+    
+    # Post-process serially, in the original participant order
+    archive_suffix = _default_archive_suffix(compressor)
     success_count = 0
     failed_participants = []
     successful_participants = []  # Track participants that were successfully processed
     
-    for participant in participant_labels:
-        participant_id = participant.replace('sub-', '')
-        
-        # Determine source directory name using strict pattern
-        # Use strict naming convention: AB042 or AB042SES4
-        if session:
-            source_name = f"{ds_initials}{participant_id}SES{session}"
-        else:
-            source_name = f"{ds_initials}{participant_id}"
-        
-        # Try to get source path (extract from archive if needed)
-        source_path, was_extracted = extract_archive_if_needed(mrs_dir, source_name, only_uncompressed=only_uncompressed)
+    for participant_id in participant_ids:
+        success, source_path, was_extracted = conversions[participant_id]
         
-        if source_path is None:
-            if only_uncompressed:
-                logger.error(f"Source MRS not found: {source_name} (checked directory only, --only-uncompressed is active)")
-            else:
-                logger.error(f"Source MRS not found: {source_name} (checked directory and .tar.gz archive)")
-            logger.error(f"Expected naming convention: {ds_initials}{participant_id}" + 
-                       (f"SES{session}" if session else ""))
+        if not success:
             failed_participants.append(participant_id)
             continue
         
-        # Run spec2bids
-        logger.info(f"Running spec2bids for {participant_id}...")
-        
-        # Build spec2bids command
-        # Use the full path if we found it in the priority location, otherwise use the venv command
-        if spec2bids_path:
-            cmd = f"{spec2bids_path} -p {participant_id}"
-        else:
-            cmd = f"{venv_cmd}spec2bids -p {participant_id}"
+        success_count += 1
+        successful_participants.append(participant_id)  # Track successful import
         
-        if session:
-            cmd += f" -s {session}"
-        cmd += f" -o {rawdata_dir} -d {source_path} -c {config_file}"
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                check=True,
-                capture_output=True,
-                text=True,
-                executable='/bin/bash'
-            )
-            logger.info(f"✓ Successfully imported MRS data for {participant_id}")
-            if result.stdout:
-                logger.debug(result.stdout)
-            success_count += 1
-            successful_participants.append(participant_id)  # Track successful import
-            
-            # Compress source data if requested (only after successful conversion)
-            if compress_source and not was_extracted:
-                # Don't compress if we just extracted from an archive
-                compressed_file = mrs_dir / f"{source_path.name}.tar.gz"
-                if not compressed_file.exists():
-                    if create_verified_archive(source_path, compressed_file):
-                        # Archive verified successfully, safe to delete original
-                        logger.info(f"Deleting original directory after successful compression: {source_path.name}")
-                        shutil.rmtree(source_path)
-                        logger.info(f"✓ Deleted {source_path.name}")
-                    else:
-                        logger.warning(f"Archive creation/verification failed, keeping original directory: {source_path.name}")
+        # Compress source data if requested (only after successful conversion)
+        if compress_source and not was_extracted:
+            # Don't compress if we just extracted from an archive
+            existing_archive = find_source_archive(mrs_dir, source_path.name)
+            if existing_archive is None:
+                compressed_file = mrs_dir / f"{source_path.name}{archive_suffix}"
+                if create_verified_archive(source_path, compressed_file, paranoid=verify_archives):
+                    # Archive verified successfully, safe to delete original
+                    logger.info("Deleting original directory after successful compression: %s", source_path.name)
+                    shutil.rmtree(source_path)
+                    logger.info("✓ Deleted %s", source_path.name)
                 else:
-                    logger.info(f"Archive already exists: {compressed_file.name}")
-            
-            # If we extracted from archive and conversion succeeded, clean up extracted directory
-            if was_extracted:
-                logger.info(f"Cleaning up extracted directory: {source_path.name}")
-                shutil.rmtree(source_path)
-            
-        except subprocess.CalledProcessError as e:
-            logger.error(f"✗ Failed to import MRS data for {participant_id}: {e.stderr}")
-            failed_participants.append(participant_id)
-            
-            # If we extracted from archive and conversion failed, still clean up
-            if was_extracted and source_path.exists():
-                logger.info(f"Cleaning up extracted directory after failed conversion: {source_path.name}")
-                shutil.rmtree(source_path)
-            continue
+                    logger.warning("Archive creation/verification failed, keeping original directory: %s", source_path.name)
+            else:
+                logger.info("Archive already exists: %s", existing_archive.name)
     
     # Summary
-    logger.info(f"\n{'='*60}")
-    logger.info(f"MRS Import Summary:")
-    logger.info(f"  Successful: {success_count}/{len(participant_labels)}")
+    logger.info("\n%s", '=' * 60)
+    logger.info("MRS Import Summary:")
+    logger.info("  Successful: %d/%d", success_count, len(participant_labels))
     if failed_participants:
-        logger.info(f"  Failed: {', '.join(failed_participants)}")
-    logger.info(f"{'='*60}\n")
+        logger.info("  Failed: %s", ', '.join(failed_participants))
+    logger.info("%s\n", '=' * 60)
     
     return (success_count > 0, successful_participants)
 
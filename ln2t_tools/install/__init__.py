@@ -0,0 +1 @@
+"""Post-install helpers for ln2t_tools."""
@@ -7,7 +7,7 @@ from pathlib import Path
 logger = logging.getLogger(__name__)
 
 def install_completion():
-    """Install bash completion script during package installation."""
+    """Install the bash completion script for the current user."""
     try:
         # Get the completion script from the package directory
         pkg_dir = Path(__file__).parent.parent
@@ -33,10 +33,11 @@ def install_completion():
         source_line = f"\n# ln2t_tools completion\nsource {completion_dest}\n"
         
         if bashrc.exists():
-            with open(bashrc, 'r') as f:
-                if str(completion_dest) not in f.read():
-                    with open(bashrc, 'a') as f:
-                        f.write(source_line)
+            # Scan line by line and append through the same handle if missing
+            with open(bashrc, 'r+') as f:
+                if not any(str(completion_dest) in line for line in f):
+                    f.seek(0, os.SEEK_END)
+                    f.write(source_line)
         
         print(f"✓ Installed completion script to {completion_dest}")
         print(f"✓ Added sourcing to {bashrc}")
@@ -46,8 +47,7 @@ def install_completion():
     except Exception as e:
         print(f"Warning: Failed to install completion script: {e}", flush=True)
         print(f"You can manually install it by running:", flush=True)
-        print(f"  python -m ln2t_tools.install.post_install", flush=True)
-        # Don't raise the exception - allow installation to continue
+        print(f"  ln2t_tools_install_completion", flush=True)
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
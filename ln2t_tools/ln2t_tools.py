@@ -1,11 +1,10 @@
 import os
 import logging
 import shutil
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, TYPE_CHECKING
 from pathlib import Path
 import re
 from datetime import datetime
-from bids import BIDSLayout
 
 from ln2t_tools.cli.cli import parse_args, setup_terminal_colors, configure_logging, log_minimal, MINIMAL, Colors, ColoredLoggerFormatter
 from ln2t_tools.utils.utils import (
@@ -28,17 +27,14 @@ from ln2t_tools.utils.utils import (
     download_meld_weights,
     get_dataset_initials
 )
-from ln2t_tools.utils.demographics import (
-    create_meld_demographics_from_participants,
-    validate_meld_demographics
-)
+from ln2t_tools.tools import get_tool
+from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.tools.cvrmap import CvrMapTool
 from ln2t_tools.tools.bids_validator import BidsValidatorTool
 from ln2t_tools.utils.hpc import (
     submit_hpc_job,
     submit_multiple_jobs,
     validate_hpc_config,
-    check_required_data,
     print_download_command,
     check_apptainer_image_exists_on_hpc,
     get_hpc_image_build_command,
@@ -66,6 +62,9 @@ from ln2t_tools.utils.defaults import (
 from ln2t_tools.import_data import import_dicom, import_mrs, pre_import_mrs, import_physio, pre_import_physio, import_meg
 from ln2t_tools.import_data.dicom import discover_participants_from_dicom_dir
 
+if TYPE_CHECKING:
+    from bids import BIDSLayout
+
 # Setup initial logging with colored formatter (will be reconfigured based on --verbosity)
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
@@ -83,7 +82,7 @@ def get_available_datasets(rawdata_dir: str) -> List[str]:
 
 
 def get_additional_contrasts(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     session: Optional[str] = None,
     run: Optional[str] = None
@@ -129,7 +128,7 @@ def handle_hpc_status(args):
     """
     from ln2t_tools.utils.hpc_status import (
         load_all_jobs, get_jobs_for_dataset, get_jobs_for_tool,
-        check_job_status, JobStatus
+        refresh_all, JobStatus
     )
     
     hpc_status_arg = getattr(args, 'hpc_status', None)
@@ -198,23 +197,29 @@ def handle_hpc_status(args):
     
     can_query = username and hostname
     
+    # Try to get live status for all jobs at once if we have HPC credentials
+    live_statuses = {}
+    if can_query:
+        # squeue and sacct queries share one multiplexed connection
+        start_ssh_control_master(username, hostname, keyfile, gateway)
+        try:
+            # Chunked bulk queries; changed states are saved to the job history
+            live_statuses = refresh_all(
+                {job_info.job_id: job_info for job_info in jobs_to_check},
+                username,
+                hostname,
+                keyfile,
+                gateway
+            )
+        except Exception as e:
+            logger.debug(f"Could not query live job status: {e}")
+    
     for job_info in jobs_to_check:
         status = None
         details = {'state': job_info.state}
         
-        # Try to get live status if we have HPC credentials
-        if can_query:
-            try:
-                status, details = check_job_status(
-                    job_info.job_id,
-                    username,
-                    hostname,
-                    keyfile,
-                    gateway
-                )
-            except Exception as e:
-                logger.debug(f"Could not query live status for job {job_info.job_id}: {e}")
-                status = None
+        if job_info.job_id in live_statuses:
+            status, details = live_statuses[job_info.job_id]
         
         # Use local status if live query failed
         if status is None:
@@ -590,7 +595,10 @@ def handle_import(args):
                 compress_source=compress_source,
                 venv_path=venv_path,
                 overwrite=overwrite,
-                only_uncompressed=getattr(args, 'only_uncompressed', False)
+                only_uncompressed=getattr(args, 'only_uncompressed', False),
+                max_workers=getattr(args, 'jobs', None),
+                compressor=getattr(args, 'source_compressor', 'gzip'),
+                verify_archives=getattr(args, 'verify_archives', False)
             )
             import_success['mrs'] = import_success_status
         
@@ -799,7 +807,7 @@ def launch_and_check(apptainer_cmd: str, tool_name: str, participant_label: str)
 
 
 def process_freesurfer_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -834,7 +842,7 @@ def process_freesurfer_subject(
 
 def process_single_t1w(
     t1w: str,
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -958,7 +966,7 @@ def build_bids_subdir(
 
 
 def process_fastsurfer_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1061,7 +1069,7 @@ def process_fastsurfer_subject(
 
 
 def process_fmriprep_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1165,7 +1173,7 @@ def process_fmriprep_subject(
     launch_and_check(apptainer_cmd, "fMRIPrep", participant_label)
 
 def process_mri2print_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1240,7 +1248,7 @@ def process_mri2print_subject(
     launch_and_check(apptainer_cmd, "mri2print", participant_label)
 
 def process_qsiprep_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1303,7 +1311,7 @@ def process_qsiprep_subject(
     launch_and_check(apptainer_cmd, "QSIPrep", participant_label)
 
 def process_qsirecon_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1378,7 +1386,7 @@ def process_qsirecon_subject(
     launch_and_check(apptainer_cmd, "QSIRecon", participant_label)
 
 def process_meldgraph_subject(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     args,
     dataset_rawdata: Path,
@@ -1530,7 +1538,7 @@ def process_meldgraph_subject(
 
 
 def process_meld_harmonization(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_labels: List[str],
     args,
     dataset_rawdata: Path,
@@ -1556,6 +1564,11 @@ def process_meld_harmonization(
         dataset_code: Path to code directory
         apptainer_img: Path to container image
     """
+    from ln2t_tools.utils.demographics import (
+        create_meld_demographics_from_participants,
+        validate_meld_demographics
+    )
+    
     if len(participant_labels) < 20:
         logger.warning(
             f"Harmonization recommended with at least 20 subjects. "
@@ -1837,7 +1850,9 @@ def main(args=None) -> None:
             try:
                 dataset_rawdata = Path(DEFAULT_RAWDATA) / f"{dataset}-rawdata"
                 if dataset_rawdata.exists():
-                    layout = BIDSLayout(dataset_rawdata)
+                    layout = BaseTool.get_or_build_layout(
+                        dataset_rawdata, getattr(args, 'bids_db', None)
+                    )
                     participant_list = args.participant_label if args.participant_label else []
                     participant_list = check_participants_exist(layout, participant_list)
                     all_participants.update([f"sub-{p}" for p in participant_list])
@@ -1929,7 +1944,9 @@ def main(args=None) -> None:
                         # Get participant list from --participant-label arguments
                         participant_list = args.participant_label if args.participant_label else []
                         
-                        layout = BIDSLayout(dataset_rawdata)
+                        layout = BaseTool.get_or_build_layout(
+                            dataset_rawdata, getattr(args, 'bids_db', None)
+                        )
                         participant_list = check_participants_exist(layout, participant_list)
                         if not participant_list:
                             logger.error(
@@ -1978,6 +1995,7 @@ def main(args=None) -> None:
                             logger.error(f"participants.tsv not found: {participants_tsv}")
                             failed_datasets.append(dataset)
                             continue
+                        from ln2t_tools.utils.demographics import create_meld_demographics_from_participants
                         demographics_path = create_meld_demographics_from_participants(
                             participants_tsv=participants_tsv,
                             participant_labels=participant_list,
@@ -2040,10 +2058,12 @@ def main(args=None) -> None:
                     first_tool = list(tools_to_run.keys())[0] if tools_to_run else 'freesurfer'
                     version = tools_to_run.get(first_tool, DEFAULT_FS_VERSION)
                     output_dir = dataset_derivatives / f"{first_tool}_{version}"
-                    list_missing_subjects(dataset_rawdata, output_dir)
+                    list_missing_subjects(dataset_rawdata, output_dir, getattr(args, 'bids_db', None))
                     continue
 
-                layout = BIDSLayout(dataset_rawdata)
+                layout = BaseTool.get_or_build_layout(
+                    dataset_rawdata, getattr(args, 'bids_db', None)
+                )
                 
                 # Get participants to process (use getattr for tools that don't have participant_label)
                 participant_label_arg = getattr(args, 'participant_label', None)
@@ -2129,39 +2149,8 @@ def main(args=None) -> None:
                         if getattr(args, 'hpc', False):
                             log_minimal(logger, f"Submitting {tool} jobs to HPC for {len(participant_list)} participants...")
                             
-                            # Get HPC connection parameters (already validated earlier)
-                            username = args.hpc_username
-                            hostname = args.hpc_hostname
-                            keyfile = args.hpc_keyfile
-                            gateway = getattr(args, 'hpc_gateway', None)
-                            hpc_rawdata = getattr(args, 'hpc_rawdata', None) or '$GLOBALSCRATCH/rawdata'
-                            hpc_derivatives = getattr(args, 'hpc_derivatives', None) or '$GLOBALSCRATCH/derivatives'
-                            
-                            # Check required data on HPC for each participant
-                            all_data_ready = True
-                            for participant_label in participant_list:
-                                data_ready = check_required_data(
-                                    tool=tool,
-                                    dataset=dataset,
-                                    participant_label=participant_label,
-                                    args=args,
-                                    username=username,
-                                    hostname=hostname,
-                                    keyfile=keyfile,
-                                    gateway=gateway,
-                                    hpc_rawdata=hpc_rawdata,
-                                    hpc_derivatives=hpc_derivatives
-                                )
-                                if not data_ready:
-                                    all_data_ready = False
-                                    break
-                            
-                            if not all_data_ready:
-                                logger.error("Required data not available on HPC. Skipping this tool.")
-                                dataset_success = False
-                                continue
-                            
-                            # Submit jobs for all participants in parallel
+                            # submit_multiple_jobs checks the required data on the HPC
+                            # for all participants concurrently before submitting
                             job_ids = submit_multiple_jobs(
                                 tool=tool,
                                 participant_labels=participant_list,
@@ -2212,6 +2201,31 @@ def main(args=None) -> None:
                                 dataset_success = False
                             continue  # Move to next tool
 
+                        # Tools driven through BaseTool can fan out across participants
+                        jobs = getattr(args, 'jobs', 1)
+                        use_cohort = (
+                            jobs != 1
+                            or getattr(args, 'async_jobs', 0)
+                            or getattr(args, 'batch_size', 1) > 1
+                        )
+                        tool_class = get_tool(tool)
+                        if tool_class is not None and tool_class.supports_cohort and use_cohort:
+                            results = tool_class.process_cohort(
+                                layout=layout,
+                                participant_labels=participant_list,
+                                args=args,
+                                dataset_rawdata=dataset_rawdata,
+                                dataset_derivatives=dataset_derivatives,
+                                apptainer_img=apptainer_img,
+                                max_workers=jobs or None
+                            )
+                            for participant_label, ok in results.items():
+                                if ok:
+                                    log_minimal(logger, f"✓ Successfully processed participant {participant_label} with {tool}")
+                                else:
+                                    dataset_success = False
+                            continue
+
                         # Process each participant with this tool
                         for participant_label in participant_list:
                             log_minimal(logger, f"Processing participant {participant_label} with {tool}")
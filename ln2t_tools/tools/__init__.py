@@ -9,7 +9,7 @@ To add a new tool:
 1. Create a new directory under tools/ (e.g., tools/mytool/)
 2. Create an __init__.py that exports a class inheriting from BaseTool
 3. Implement all required methods (see BaseTool docstring)
-4. The tool will be automatically discovered and registered
+4. The tool will be automatically discovered and registered on first use
 
 See docs/adding_tools.md for detailed instructions.
 """
@@ -20,36 +20,67 @@ from .base import BaseTool, ToolRegistry
 registry = ToolRegistry()
 
 
+_discovered = False
+
+
+def _load_tool_module(module_name: str) -> None:
+    """Import a tool subpackage and register its TOOL_CLASS, if any."""
+    import importlib
+    
+    try:
+        module = importlib.import_module(f'.{module_name}', package='ln2t_tools.tools')
+        # Look for a tool class in the module
+        if hasattr(module, 'TOOL_CLASS'):
+            tool_class = module.TOOL_CLASS
+            registry.register(tool_class)
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(f"Failed to load tool '{module_name}': {e}")
+
+
+def list_tool_names():
+    """List the tool subpackages of the tools/ directory without importing them.
+    
+    Tool subpackages are named after their tool, so these are also the
+    names accepted by get_tool().
+    
+    Returns:
+        List[str]: Sorted subpackage names
+    """
+    import os
+    
+    tools_dir = os.path.dirname(__file__)
+    
+    # Tool packages are the subdirectories holding an __init__.py
+    with os.scandir(tools_dir) as entries:
+        return sorted(
+            entry.name for entry in entries
+            if entry.is_dir(follow_symlinks=False)
+            and entry.name.isidentifier()
+            and entry.name != 'base'
+            and os.path.isfile(os.path.join(entry.path, '__init__.py'))
+        )
+
+
 def discover_tools():
     """Discover and register all tools from the tools/ directory."""
-    import importlib
-    import pkgutil
-    from pathlib import Path
+    global _discovered
     
-    tools_dir = Path(__file__).parent
+    for module_name in list_tool_names():
+        _load_tool_module(module_name)
     
-    for _, module_name, is_pkg in pkgutil.iter_modules([str(tools_dir)]):
-        if is_pkg and module_name not in ('base', '__pycache__'):
-            try:
-                module = importlib.import_module(f'.{module_name}', package='ln2t_tools.tools')
-                # Look for a tool class in the module
-                if hasattr(module, 'TOOL_CLASS'):
-                    tool_class = module.TOOL_CLASS
-                    registry.register(tool_class)
-            except Exception as e:
-                import logging
-                logging.getLogger(__name__).warning(f"Failed to load tool '{module_name}': {e}")
+    _discovered = True
 
 
 # Convenience functions for external access
 def auto_discover_tools():
     """Auto-discover and register all tools.
     
-    Note: Tools are automatically discovered on module import.
-    This function can be called to re-discover tools if needed.
+    Discovery is lazy: it runs on the first call to this function or to
+    get_all_tools(), not when the module is imported.
     """
     # Only discover if not already done
-    if not registry._tools:
+    if not _discovered:
         discover_tools()
 
 
@@ -57,21 +88,35 @@ def get_all_tools():
     """Get all registered tools.
     
     Returns:
-        Dict[str, Type[BaseTool]]: Dictionary mapping tool names to tool classes
+        Mapping[str, Type[BaseTool]]: Read-only mapping of tool names to tool classes
     """
+    auto_discover_tools()
     return registry.get_all()
 
 
 def get_tool(name: str):
     """Get a specific tool by name.
     
+    Tool subpackages are named after their tool, so only the requested
+    subpackage is imported; a full discovery is used as a fallback.
+    
     Args:
         name: The tool name (e.g., 'freesurfer', 'fmriprep')
         
     Returns:
         Type[BaseTool]: The tool class, or None if not found
     """
-    return registry.get(name)
+    tool_class = registry.get(name)
+    if tool_class is None and not _discovered:
+        from pathlib import Path
+        
+        if name.isidentifier() and (Path(__file__).parent / name / '__init__.py').is_file():
+            _load_tool_module(name)
+            tool_class = registry.get(name)
+        if tool_class is None:
+            auto_discover_tools()
+            tool_class = registry.get(name)
+    return tool_class
 
 
 def register_tool(tool_class):
@@ -87,14 +132,12 @@ def register_tool(tool_class):
     return tool_class
 
 
-# Discover tools on import
-discover_tools()
-
 __all__ = [
     'BaseTool', 
     'ToolRegistry', 
     'registry', 
     'discover_tools',
+    'list_tool_names',
     'auto_discover_tools',
     'get_all_tools',
     'get_tool',
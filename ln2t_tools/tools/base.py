@@ -10,14 +10,56 @@ must implement. It provides a consistent interface for:
 """
 
 import argparse
+import asyncio
 import logging
+import os
 from abc import ABC, abstractmethod
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Type
-from bids import BIDSLayout
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import AbstractSet, Dict, FrozenSet, List, Mapping, Optional, Any, Tuple, Type, TYPE_CHECKING
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 logger = logging.getLogger(__name__)
 
+# In-process BIDSLayout cache keyed by (rawdata path, database directory)
+_layout_cache: Dict[tuple, 'BIDSLayout'] = {}
+
+# Per-dataset file index: subject label -> {(suffix, extension), ...}
+_file_index_cache: Dict[str, Dict[str, FrozenSet[Tuple[str, str]]]] = {}
+
+
+def _dataset_mtime(dataset_rawdata: Path) -> float:
+    """Return the newest mtime of the directories a BIDS import modifies.
+    
+    Looks at the dataset root, participants.tsv and the ``sub-*``,
+    ``ses-*`` and datatype directories below it, so a file added to an
+    existing ``anat/`` folder is noticed too. Only directory entries are
+    stat'ed; data files are never opened.
+    """
+    latest = os.stat(dataset_rawdata).st_mtime
+    try:
+        latest = max(latest, os.stat(os.path.join(dataset_rawdata, 'participants.tsv')).st_mtime)
+    except FileNotFoundError:
+        pass
+    
+    pending = [(str(dataset_rawdata), 0)]
+    while pending:
+        path, depth = pending.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                if depth == 0 and not entry.name.startswith('sub-'):
+                    continue
+                latest = max(latest, entry.stat().st_mtime)
+                # sub-* -> ses-* or datatype -> datatype
+                if depth < 2 and (depth == 0 or entry.name.startswith('ses-')):
+                    pending.append((entry.path, depth + 1))
+    return latest
+
 
 class BaseTool(ABC):
     """Abstract base class for all processing tools.
@@ -46,6 +88,19 @@ class BaseTool(ABC):
         Default version to use if not specified
     requires_gpu : bool
         Whether the tool benefits from GPU acceleration
+    cores_per_job : int
+        CPU cores one subject run is expected to use, used to size
+        parallel cohort processing
+    supports_cohort : bool
+        Whether the CLI dispatches this tool through process_cohort, which
+        enables the --jobs, --async-jobs and --parallel-backend options
+    supports_batch : bool
+        Whether build_batch_command can run several subjects in one
+        container invocation (enables --batch-size for cohort tools)
+    prepare_output_dirs : bool
+        Whether process_cohort should create the output directories of
+        the subjects that meet their requirements up front (see
+        prepare_output_tree)
     """
     
     # Class attributes that should be overridden
@@ -54,6 +109,10 @@ class BaseTool(ABC):
     description: str = ""
     default_version: str = ""
     requires_gpu: bool = False
+    cores_per_job: int = 1
+    supports_cohort: bool = False
+    supports_batch: bool = False
+    prepare_output_dirs: bool = False
     
     @classmethod
     @abstractmethod
@@ -107,7 +166,7 @@ class BaseTool(ABC):
     @abstractmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
@@ -168,7 +227,7 @@ class BaseTool(ABC):
     @abstractmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -201,11 +260,124 @@ class BaseTool(ABC):
             Command as list of strings
         """
         pass
+
+    @classmethod
+    def get_or_build_layout(
+        cls,
+        dataset_rawdata: Path,
+        cache_dir: Optional[Path] = None
+    ) -> 'BIDSLayout':
+        """Return a BIDSLayout for a dataset, reusing a saved index if possible.
+
+        Layouts are kept in memory for the lifetime of the process. When
+        a cache directory is given (or BIDS_DB_PATH is set), the pybids
+        SQLite index is stored under ``<cache_dir>/<rawdata name>`` and
+        loaded from there on subsequent runs instead of re-walking the
+        BIDS tree. The index is rebuilt when the dataset root,
+        participants.tsv or any subject, session or datatype directory
+        is newer than it, i.e. when files were added, removed or renamed.
+        Files rewritten in place are not detected.
+
+        Parameters
+        ----------
+        dataset_rawdata : Path
+            Path to BIDS rawdata directory
+        cache_dir : Optional[Path]
+            Directory holding persistent layout databases
+
+        Returns
+        -------
+        BIDSLayout
+            Indexed layout for the dataset
+        """
+        if cache_dir is None and os.environ.get('BIDS_DB_PATH'):
+            cache_dir = Path(os.environ['BIDS_DB_PATH'])
+
+        dataset_rawdata = Path(dataset_rawdata)
+        key = (str(dataset_rawdata.resolve()), str(cache_dir) if cache_dir else None)
+        layout = _layout_cache.get(key)
+        if layout is not None:
+            return layout
+
+        from bids import BIDSLayout
+
+        if cache_dir is None:
+            layout = BIDSLayout(str(dataset_rawdata))
+        else:
+            database_path = Path(cache_dir) / dataset_rawdata.name
+            index_file = database_path / 'layout_index.sqlite'
+            # Re-index when any directory that gains or loses files on an
+            # import is newer than the saved database
+            if (index_file.exists()
+                    and index_file.stat().st_mtime >= _dataset_mtime(dataset_rawdata)):
+                logger.debug("Loading BIDS layout index from %s", database_path)
+                layout = BIDSLayout.load(str(database_path))
+            else:
+                logger.info("Indexing %s into %s", dataset_rawdata, database_path)
+                database_path.mkdir(parents=True, exist_ok=True)
+                layout = BIDSLayout(
+                    str(dataset_rawdata),
+                    database_path=str(database_path),
+                    reset_database=True
+                )
+                layout.save(str(database_path))
+
+        _layout_cache[key] = layout
+        return layout
+
+    @classmethod
+    def _get_index(cls, layout_root: Path) -> Dict[str, FrozenSet[Tuple[str, str]]]:
+        """Return a per-subject index of the raw files in a BIDS dataset.
+        
+        The dataset is crawled once with os.scandir (only ``sub-*``
+        directories, as for the ``raw`` scope of pybids) and memoized by
+        root, so requirement checks become dictionary lookups instead of
+        one BIDSLayout query per participant.
+        
+        Parameters
+        ----------
+        layout_root : Path
+            Root of the BIDS rawdata directory (``layout.root``)
+            
+        Returns
+        -------
+        Dict[str, FrozenSet[Tuple[str, str]]]
+            Mapping of participant label (without 'sub-') to the set of
+            (suffix, extension) pairs present for that participant
+        """
+        root = os.path.abspath(str(layout_root))
+        index = _file_index_cache.get(root)
+        if index is not None:
+            return index
+        
+        found: Dict[str, set] = {}
+        with os.scandir(root) as top:
+            stack = [
+                (entry.path, entry.name[4:]) for entry in top
+                if entry.name.startswith('sub-') and entry.is_dir()
+            ]
+        while stack:
+            path, subject = stack.pop()
+            entries = found.setdefault(subject, set())
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, subject))
+                        continue
+                    stem, dot, ext = entry.name.partition('.')
+                    if dot:
+                        entries.add((stem.rpartition('_')[2], dot + ext))
+        
+        index = {subject: frozenset(files) for subject, files in found.items()}
+        _file_index_cache[root] = index
+        return index
     
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -216,8 +388,9 @@ class BaseTool(ABC):
         """Process a single subject with this tool.
         
         This is the main entry point for processing. The default
-        implementation checks requirements, builds the command, and
-        launches it. Override for custom processing logic.
+        implementation checks requirements, skips participants whose
+        output already exists, builds the command, and launches it.
+        Override for custom processing logic.
         
         Parameters
         ----------
@@ -243,11 +416,18 @@ class BaseTool(ABC):
         """
         from ln2t_tools.utils.utils import launch_apptainer
         
-        # Check requirements
-        if not cls.check_requirements(layout, participant_label, args):
-            logger.warning(f"Requirements not met for {participant_label} with {cls.name}")
+        # Check requirements (unless process_cohort already did)
+        if (not kwargs.get('requirements_checked')
+                and not cls.check_requirements(layout, participant_label, args)):
+            logger.warning("Requirements not met for %s with %s", participant_label, cls.name)
             return False
         
+        # Check if output already exists
+        output_dir = cls.get_output_dir(dataset_derivatives, participant_label, args)
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
+            logger.info("Output exists, skipping: %s", output_dir)
+            return True
+        
         # Build command
         cmd = cls.build_command(
             layout=layout,
@@ -260,18 +440,454 @@ class BaseTool(ABC):
         )
         
         if not cmd:
-            logger.error(f"Failed to build command for {participant_label}")
+            logger.error("Failed to build command for %s", participant_label)
             return False
         
         # Launch
         try:
-            # Join command list into string
-            cmd_str = ' '.join(cmd) if isinstance(cmd, list) else cmd
-            launch_apptainer(cmd_str)
+            # Argument lists are executed directly, strings via the shell
+            exit_code = launch_apptainer(cmd)
+        except Exception as e:
+            logger.error("Error processing %s with %s: %s", participant_label, cls.name, e)
+            return False
+        
+        if exit_code != 0:
+            logger.error("%s failed for %s (exit code %d)", cls.name, participant_label, exit_code)
+        return exit_code == 0
+    
+    @classmethod
+    def process_cohort(
+        cls,
+        layout: 'BIDSLayout',
+        participant_labels: List[str],
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        max_workers: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, bool]:
+        """Process several subjects concurrently with this tool.
+        
+        Each subject is handed to process_subject in a thread pool; the
+        work itself runs in Apptainer subprocesses, so threads are usually
+        enough. With ``--parallel-backend process`` a process pool is used
+        instead and each worker rebuilds the layout from its root.
+        
+        Parameters
+        ----------
+        layout : BIDSLayout
+            BIDS dataset layout
+        participant_labels : List[str]
+            Participant IDs (without 'sub-' prefix)
+        args : argparse.Namespace
+            Parsed command line arguments
+        dataset_rawdata : Path
+            Path to BIDS rawdata directory
+        dataset_derivatives : Path
+            Path to derivatives directory
+        apptainer_img : str
+            Path to Apptainer image
+        max_workers : Optional[int]
+            Number of subjects to run at once. Default: CPU count divided
+            by cores_per_job
+        **kwargs : dict
+            Additional tool-specific parameters
+            
+        Returns
+        -------
+        Dict[str, bool]
+            Success flag per participant
+        """
+        if not participant_labels:
+            return {}
+        
+        if 'existing_outputs' not in kwargs:
+            # One directory listing instead of an exists() per subject
+            output_root = cls.get_output_dir(dataset_derivatives, participant_labels[0], args).parent
+            kwargs['existing_outputs'] = cls.scan_existing_outputs(output_root)
+        
+        results = {}
+        if cls.prepare_output_dirs:
+            # Only participants that can run get a directory: an empty
+            # sub-* directory would count as existing output on the next run
+            ready = []
+            for label in participant_labels:
+                if cls.check_requirements(layout, label, args):
+                    ready.append(label)
+                else:
+                    logger.warning("Requirements not met for %s with %s", label, cls.name)
+                    results[label] = False
+            participant_labels = ready
+            if not participant_labels:
+                return results
+            # Passed down so the per-subject steps neither re-check the
+            # requirements nor re-create the directories
+            kwargs['requirements_checked'] = True
+            kwargs['prepared_output_dirs'] = cls.prepare_output_tree(
+                dataset_derivatives, participant_labels, args
+            )
+        
+        async_jobs = getattr(args, 'async_jobs', 0) or 0
+        if async_jobs > 0:
+            results.update(asyncio.run(cls.aprocess_cohort(
+                layout=layout,
+                participant_labels=participant_labels,
+                args=args,
+                dataset_rawdata=dataset_rawdata,
+                dataset_derivatives=dataset_derivatives,
+                apptainer_img=apptainer_img,
+                max_in_flight=async_jobs,
+                **kwargs
+            )))
+            return results
+        
+        batch_size = getattr(args, 'batch_size', 1) or 1
+        if cls.supports_batch and batch_size > 1:
+            # One container invocation per chunk of participants
+            units = [
+                participant_labels[i:i + batch_size]
+                for i in range(0, len(participant_labels), batch_size)
+            ]
+        else:
+            units = [[label] for label in participant_labels]
+        
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 1) // max(1, cls.cores_per_job))
+        max_workers = max(1, min(max_workers, len(units)))
+        
+        if cls.requires_gpu and max_workers > 1:
+            logger.warning(
+                "%s uses the GPU; running %d subjects at once may exhaust GPU memory",
+                cls.name, max_workers
+            )
+        
+        common = dict(
+            args=args,
+            dataset_rawdata=dataset_rawdata,
+            dataset_derivatives=dataset_derivatives,
+            apptainer_img=apptainer_img,
+            **kwargs
+        )
+        
+        use_processes = getattr(args, 'parallel_backend', 'thread') == 'process'
+        if use_processes:
+            # BIDSLayout cannot be pickled: workers rebuild it from its root
+            # (loading the saved index when --bids-db / BIDS_DB_PATH is set)
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            common.update(layout_root=str(layout.root), bids_db=getattr(args, 'bids_db', None))
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            common.update(layout=layout)
+        
+        with executor:
+            futures = {}
+            for unit in units:
+                if use_processes:
+                    future = executor.submit(
+                        _process_unit_in_worker, cls, participant_labels=unit, **common
+                    )
+                elif len(unit) > 1:
+                    future = executor.submit(
+                        cls._process_batch, participant_labels=unit, **common
+                    )
+                else:
+                    future = executor.submit(
+                        cls.process_subject, participant_label=unit[0], **common
+                    )
+                futures[future] = unit
+            for future in as_completed(futures):
+                unit = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error("Error processing %s with %s: %s", ", ".join(unit), cls.name, e)
+                    outcome = False
+                if isinstance(outcome, dict):
+                    results.update(outcome)
+                else:
+                    results.update(dict.fromkeys(unit, bool(outcome)))
+        
+        return results
+    
+    @staticmethod
+    def scan_existing_outputs(output_root: Path) -> FrozenSet[str]:
+        """List the subject output directories already present.
+        
+        Parameters
+        ----------
+        output_root : Path
+            Tool output directory containing the ``sub-*`` folders
+            
+        Returns
+        -------
+        FrozenSet[str]
+            Names of the existing subdirectories
+        """
+        try:
+            with os.scandir(output_root) as entries:
+                return frozenset(entry.name for entry in entries if entry.is_dir())
+        except FileNotFoundError:
+            return frozenset()
+    
+    @staticmethod
+    def output_exists(
+        output_dir: Path,
+        existing_outputs: Optional[AbstractSet[str]] = None
+    ) -> bool:
+        """Check whether a subject output directory exists.
+        
+        Uses the precomputed ``existing_outputs`` listing of the parent
+        directory when given, and falls back to a stat otherwise.
+        """
+        if existing_outputs is None:
+            return output_dir.exists()
+        return output_dir.name in existing_outputs
+    
+    @classmethod
+    def prepare_output_tree(
+        cls,
+        dataset_derivatives: Path,
+        participant_labels: List[str],
+        args: argparse.Namespace
+    ) -> FrozenSet[str]:
+        """Create the output directories of a cohort in one pass.
+        
+        Each distinct parent is created once with os.makedirs, then the
+        subject directories with a single mkdir each.
+        
+        Parameters
+        ----------
+        dataset_derivatives : Path
+            Path to derivatives directory
+        participant_labels : List[str]
+            Participant IDs (without 'sub-' prefix)
+        args : argparse.Namespace
+            Parsed command line arguments
+            
+        Returns
+        -------
+        FrozenSet[str]
+            Created output directories, which process_cohort hands to
+            build_command as ``prepared_output_dirs``
+        """
+        output_dirs = {
+            str(cls.get_output_dir(dataset_derivatives, label, args))
+            for label in participant_labels
+        }
+        for parent in {os.path.dirname(path) for path in output_dirs}:
+            os.makedirs(parent, exist_ok=True)
+        for path in output_dirs:
+            try:
+                os.mkdir(path)
+            except FileExistsError:
+                pass
+        return frozenset(output_dirs)
+    
+    @classmethod
+    async def aprocess_subject(
+        cls,
+        layout: 'BIDSLayout',
+        participant_label: str,
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        **kwargs
+    ) -> bool:
+        """Asynchronous counterpart of process_subject.
+        
+        The container runs as an asyncio subprocess, so one event loop can
+        drive many subjects. Tools that override process_subject keep their
+        own logic and are run in a worker thread instead.
+        
+        Returns
+        -------
+        bool
+            True if the container exited successfully
+        """
+        common = dict(
+            layout=layout,
+            participant_label=participant_label,
+            args=args,
+            dataset_rawdata=dataset_rawdata,
+            dataset_derivatives=dataset_derivatives,
+            apptainer_img=apptainer_img,
+            **kwargs
+        )
+        if cls.process_subject.__func__ is not BaseTool.process_subject.__func__:
+            # run_in_executor rather than asyncio.to_thread (Python 3.9+)
+            loop = asyncio.get_running_loop()
+            return bool(await loop.run_in_executor(None, partial(cls.process_subject, **common)))
+        
+        if (not kwargs.get('requirements_checked')
+                and not cls.check_requirements(layout, participant_label, args)):
+            logger.warning("Requirements not met for %s with %s", participant_label, cls.name)
+            return False
+        
+        output_dir = cls.get_output_dir(dataset_derivatives, participant_label, args)
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
+            logger.info("Output exists, skipping: %s", output_dir)
             return True
+        
+        cmd = cls.build_command(**common)
+        if not cmd:
+            logger.error("Failed to build command for %s", participant_label)
+            return False
+        
+        logger.info("Launching %s for %s", cls.name, participant_label)
+        try:
+            if isinstance(cmd, (list, tuple)):
+                proc = await asyncio.create_subprocess_exec(*[str(arg) for arg in cmd])
+            else:
+                proc = await asyncio.create_subprocess_shell(cmd)
+            exit_code = await proc.wait()
         except Exception as e:
-            logger.error(f"Error processing {participant_label} with {cls.name}: {e}")
+            logger.error("Error processing %s with %s: %s", participant_label, cls.name, e)
             return False
+        
+        if exit_code != 0:
+            logger.error("%s failed for %s (exit code %d)", cls.name, participant_label, exit_code)
+        return exit_code == 0
+    
+    @classmethod
+    async def aprocess_cohort(
+        cls,
+        layout: 'BIDSLayout',
+        participant_labels: List[str],
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        max_in_flight: int = 1,
+        **kwargs
+    ) -> Dict[str, bool]:
+        """Process several subjects from one event loop.
+        
+        At most ``max_in_flight`` containers run at the same time.
+        
+        Returns
+        -------
+        Dict[str, bool]
+            Success flag per participant
+        """
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+        
+        async def run_one(label: str) -> bool:
+            async with semaphore:
+                return await cls.aprocess_subject(
+                    layout=layout,
+                    participant_label=label,
+                    args=args,
+                    dataset_rawdata=dataset_rawdata,
+                    dataset_derivatives=dataset_derivatives,
+                    apptainer_img=apptainer_img,
+                    **kwargs
+                )
+        
+        outcomes = await asyncio.gather(
+            *(run_one(label) for label in participant_labels),
+            return_exceptions=True
+        )
+        results = {}
+        for label, outcome in zip(participant_labels, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error("Error processing %s with %s: %s", label, cls.name, outcome)
+                outcome = False
+            results[label] = bool(outcome)
+        return results
+    
+    @classmethod
+    def build_batch_command(
+        cls,
+        layout: 'BIDSLayout',
+        participant_labels: List[str],
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        **kwargs
+    ) -> List[str]:
+        """Build one Apptainer command processing several participants.
+        
+        Tools that set ``supports_batch = True`` must override this so
+        that process_cohort can amortize container startup over a chunk
+        of ``--batch-size`` participants.
+        
+        Parameters
+        ----------
+        layout : BIDSLayout
+            BIDS dataset layout
+        participant_labels : List[str]
+            Participant IDs (without 'sub-' prefix)
+        args : argparse.Namespace
+            Parsed command line arguments
+        dataset_rawdata : Path
+            Path to BIDS rawdata directory
+        dataset_derivatives : Path
+            Path to derivatives directory
+        apptainer_img : str
+            Path to Apptainer image
+        **kwargs : dict
+            Additional tool-specific parameters
+            
+        Returns
+        -------
+        List[str]
+            Command as list of strings
+        """
+        raise NotImplementedError(f"{cls.name} does not support batch processing")
+    
+    @classmethod
+    def _process_batch(
+        cls,
+        layout: 'BIDSLayout',
+        participant_labels: List[str],
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        **kwargs
+    ) -> Dict[str, bool]:
+        """Run a chunk of participants in a single container invocation."""
+        from ln2t_tools.utils.utils import launch_apptainer
+        
+        existing_outputs = kwargs.get('existing_outputs')
+        check_requirements = not kwargs.get('requirements_checked')
+        results = {}
+        ready = []
+        for label in participant_labels:
+            if check_requirements and not cls.check_requirements(layout, label, args):
+                logger.warning("Requirements not met for %s with %s", label, cls.name)
+                results[label] = False
+                continue
+            output_dir = cls.get_output_dir(dataset_derivatives, label, args)
+            if cls.output_exists(output_dir, existing_outputs):
+                logger.info("Output exists, skipping: %s", output_dir)
+                results[label] = True
+                continue
+            ready.append(label)
+        if not ready:
+            return results
+        
+        cmd = cls.build_batch_command(
+            layout=layout,
+            participant_labels=ready,
+            args=args,
+            dataset_rawdata=dataset_rawdata,
+            dataset_derivatives=dataset_derivatives,
+            apptainer_img=apptainer_img,
+            **kwargs
+        )
+        
+        try:
+            exit_code = launch_apptainer(cmd)
+        except Exception as e:
+            logger.error("Error processing %s with %s: %s", ", ".join(ready), cls.name, e)
+            exit_code = 1
+        
+        results.update(dict.fromkeys(ready, exit_code == 0))
+        return results
     
     @classmethod
     def generate_hpc_script(
@@ -310,6 +926,28 @@ class BaseTool(ABC):
         )
 
 
+def _process_unit_in_worker(
+    tool_class: Type[BaseTool],
+    participant_labels: List[str],
+    layout_root: str,
+    bids_db: Optional[Path],
+    **kwargs
+):
+    """Process-pool entry point for BaseTool.process_cohort.
+    
+    Rebuilds the (per-process cached) layout and runs one participant
+    through process_subject, or a chunk through _process_batch.
+    """
+    layout = tool_class.get_or_build_layout(Path(layout_root), bids_db)
+    if len(participant_labels) > 1:
+        return tool_class._process_batch(
+            layout=layout, participant_labels=participant_labels, **kwargs
+        )
+    return tool_class.process_subject(
+        layout=layout, participant_label=participant_labels[0], **kwargs
+    )
+
+
 class ToolRegistry:
     """Registry for managing available processing tools.
     
@@ -322,8 +960,12 @@ class ToolRegistry:
         Mapping of tool names to their classes
     """
     
+    __slots__ = ('_tools', '_tools_view', '_names')
+    
     def __init__(self):
         self._tools: Dict[str, Type[BaseTool]] = {}
+        self._tools_view = MappingProxyType(self._tools)
+        self._names: Tuple[str, ...] = ()
     
     def register(self, tool_class: Type[BaseTool]) -> None:
         """Register a tool class.
@@ -342,10 +984,11 @@ class ToolRegistry:
             raise ValueError(f"Tool class {tool_class.__name__} has no name defined")
         
         if tool_class.name in self._tools:
-            logger.warning(f"Tool '{tool_class.name}' already registered, overwriting")
+            logger.warning("Tool '%s' already registered, overwriting", tool_class.name)
         
         self._tools[tool_class.name] = tool_class
-        logger.debug(f"Registered tool: {tool_class.name}")
+        self._names = tuple(sorted(self._tools))
+        logger.debug("Registered tool: %s", tool_class.name)
     
     def get(self, name: str) -> Optional[Type[BaseTool]]:
         """Get a tool class by name.
@@ -362,15 +1005,15 @@ class ToolRegistry:
         """
         return self._tools.get(name)
     
-    def get_all(self) -> Dict[str, Type[BaseTool]]:
+    def get_all(self) -> Mapping[str, Type[BaseTool]]:
         """Get all registered tools.
         
         Returns
         -------
-        Dict[str, Type[BaseTool]]
-            Dictionary mapping tool names to tool classes
+        Mapping[str, Type[BaseTool]]
+            Read-only view mapping tool names to tool classes
         """
-        return dict(self._tools)
+        return self._tools_view
     
     def list_tools(self) -> List[str]:
         """Get list of registered tool names.
@@ -380,7 +1023,7 @@ class ToolRegistry:
         List[str]
             Sorted list of tool names
         """
-        return sorted(self._tools.keys())
+        return list(self._names)
     
     def items(self):
         """Iterate over registered tools.
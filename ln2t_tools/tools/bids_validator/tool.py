@@ -8,9 +8,10 @@ Brain Imaging Data Structure (BIDS) specification.
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_BIDS_VALIDATOR_VERSION
@@ -92,7 +93,7 @@ Typical runtime: A few seconds to minutes depending on dataset size
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: Optional[str],
         args: argparse.Namespace
     ) -> bool:
@@ -161,7 +162,7 @@ Typical runtime: A few seconds to minutes depending on dataset size
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: Optional[str],
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -210,7 +211,7 @@ Typical runtime: A few seconds to minutes depending on dataset size
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: Optional[str],
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -270,7 +271,7 @@ Typical runtime: A few seconds to minutes depending on dataset size
         
         # Launch
         try:
-            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
             exit_code = launch_apptainer(cmd_str)
             # BIDS validator returns non-zero if there are validation errors
             # We still consider the run successful if it executed
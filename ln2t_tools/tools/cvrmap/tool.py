@@ -11,9 +11,10 @@ Documentation: https://github.com/arovai/cvrmap
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_CVRMAP_VERSION, DEFAULT_CVRMAP_FMRIPREP_VERSION
@@ -63,6 +64,7 @@ Typical runtime: 10-30 minutes per subject
 """
     default_version = DEFAULT_CVRMAP_VERSION
     requires_gpu = False
+    supports_cohort = True
     
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -114,7 +116,7 @@ Typical runtime: 10-30 minutes per subject
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
@@ -195,7 +197,7 @@ Typical runtime: 10-30 minutes per subject
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -264,7 +266,7 @@ Typical runtime: 10-30 minutes per subject
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -304,7 +306,7 @@ Typical runtime: 10-30 minutes per subject
         output_dir = cls.get_output_dir(
             dataset_derivatives, participant_label, args
         )
-        if output_dir.exists():
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
             logger.info(f"Output exists, skipping: {output_dir}")
             return True
         
@@ -324,7 +326,7 @@ Typical runtime: 10-30 minutes per subject
         
         # Launch
         try:
-            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
             logger.info(f"Running CVRmap for participant {participant_label}")
             task = getattr(args, 'task', None)
             if task:
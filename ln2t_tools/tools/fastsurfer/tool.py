@@ -11,9 +11,10 @@ processing time. It consists of:
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_FASTSURFER_VERSION
@@ -124,7 +125,7 @@ Typical runtime: ~1-1.5 hours (full), ~5 min (seg-only) on GPU
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
@@ -198,7 +199,7 @@ Typical runtime: ~1-1.5 hours (full), ~5 min (seg-only) on GPU
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -290,7 +291,7 @@ Typical runtime: ~1-1.5 hours (full), ~5 min (seg-only) on GPU
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -375,7 +376,7 @@ Typical runtime: ~1-1.5 hours (full), ~5 min (seg-only) on GPU
             
             # Launch
             try:
-                cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+                cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
                 launch_apptainer(cmd_str)
             except Exception as e:
                 logger.error(f"Error processing {participant_label}: {e}")
@@ -402,7 +403,7 @@ Typical runtime: ~1-1.5 hours (full), ~5 min (seg-only) on GPU
     @staticmethod
     def _log_input_files(
         t1w: str,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         session: Optional[str],
         run: Optional[str]
@@ -9,9 +9,10 @@ coregistration, normalization, and confound extraction.
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_FMRIPREP_VERSION, DEFAULT_FS_VERSION
@@ -115,7 +116,7 @@ Typical runtime: 2-6 hours per subject (depending on data)
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
@@ -200,7 +201,7 @@ Typical runtime: 2-6 hours per subject (depending on data)
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -257,7 +258,7 @@ Typical runtime: 2-6 hours per subject (depending on data)
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -295,7 +296,7 @@ Typical runtime: 2-6 hours per subject (depending on data)
         
         # Check if output already exists
         output_dir = cls.get_output_dir(dataset_derivatives, participant_label, args)
-        if output_dir.exists():
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
             logger.info(f"Output exists, skipping: {output_dir}")
             return True
         
@@ -316,7 +317,7 @@ Typical runtime: 2-6 hours per subject (depending on data)
         
         # Launch
         try:
-            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
             launch_apptainer(cmd_str)
             return True
         except Exception as e:
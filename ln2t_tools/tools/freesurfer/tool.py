@@ -9,9 +9,10 @@ estimation.
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_FS_VERSION
@@ -91,7 +92,7 @@ Typical runtime: 6-12 hours per subject
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
@@ -165,7 +166,7 @@ Typical runtime: 6-12 hours per subject
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -262,7 +263,7 @@ Typical runtime: 6-12 hours per subject
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -347,7 +348,7 @@ Typical runtime: 6-12 hours per subject
             
             # Launch
             try:
-                cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+                cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
                 launch_apptainer(cmd_str)
             except Exception as e:
                 logger.error(f"Error processing {participant_label}: {e}")
@@ -373,7 +374,7 @@ Typical runtime: 6-12 hours per subject
     
     @staticmethod
     def _get_additional_contrasts(
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         session: Optional[str],
         run: Optional[str]
@@ -440,7 +441,7 @@ Typical runtime: 6-12 hours per subject
     @staticmethod
     def _log_input_files(
         t1w: str,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         session: Optional[str],
         run: Optional[str],
@@ -14,9 +14,10 @@ Features:
 import argparse
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import (
@@ -78,7 +79,7 @@ class MELDGraphTool(BaseTool):
     @classmethod
     def validate_inputs(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> Tuple[bool, str]:
@@ -138,7 +139,7 @@ class MELDGraphTool(BaseTool):
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         apptainer_img: str,
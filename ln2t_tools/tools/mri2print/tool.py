@@ -2,13 +2,19 @@
 
 import argparse
 import logging
+import shlex
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
-from ln2t_tools.utils.defaults import DEFAULT_MRI2PRINT_VERSION
+from ln2t_tools.utils.defaults import (
+    DEFAULT_DERIVATIVES,
+    DEFAULT_FS_VERSION,
+    DEFAULT_MRI2PRINT_VERSION,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +35,18 @@ class Mri2PrintTool(BaseTool):
     description = "MRI to Print - Create 3D-printable brain models from FreeSurfer output"
     default_version = DEFAULT_MRI2PRINT_VERSION
     requires_gpu = False
+    supports_cohort = True
+    supports_batch = True
+    prepare_output_dirs = True
+    
+    # Runs the image's runscript once per participant inside one container.
+    # Arguments come in (FreeSurfer subject, participant) pairs; {output_label}
+    # and {tool_args} are filled with shell-quoted values.
+    _batch_script = (
+        'status=0; while [ "$#" -ge 2 ]; do '
+        '/.singularity.d/runscript -f "/fsdir/$1" -o /derivatives/{output_label} "$2"{tool_args} || status=1; '
+        'shift 2; done; exit $status'
+    )
     
     @classmethod
     def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
@@ -46,22 +64,93 @@ class Mri2PrintTool(BaseTool):
         FreeSurfer version is optional and will be auto-detected if not provided.
         """
         # No validation needed - fs-version is optional
+        cls._resolve_args(args)
         return True
     
+    @classmethod
+    def _resolve_args(cls, args: argparse.Namespace) -> Tuple[str, Optional[str]]:
+        """Return the (version, fs_version) to use, cached on ``args``.
+        
+        The cache is refreshed whenever ``args.version`` changes, since the
+        main loop reassigns it for each requested tool.
+        """
+        resolved = vars(args).get('_mri2print_resolved')
+        if resolved is None or resolved[0] != args.version:
+            resolved = (
+                args.version,
+                args.version or cls.default_version,
+                getattr(args, 'fs_version', None),
+            )
+            args._mri2print_resolved = resolved
+        return resolved[1], resolved[2]
+    
+    @classmethod
+    def _output_label(cls, args: argparse.Namespace) -> str:
+        """Return the derivatives folder name (``--output-label`` or mri2print_<version>)."""
+        version, _ = cls._resolve_args(args)
+        return args.output_label or f"{cls.name}_{version}"
+    
+    @classmethod
+    def _fs_subject_dir(
+        cls,
+        layout: 'BIDSLayout',
+        participant_label: str,
+        dataset_derivatives: Path
+    ) -> Optional[Path]:
+        """Locate the FreeSurfer subject directory of a participant.
+        
+        Session and run are taken from the first T1w image, as in
+        process_mri2print_subject, so session/run FreeSurfer subjects
+        are found as well.
+        """
+        from ln2t_tools.utils.utils import get_freesurfer_output
+        
+        anat_files = layout.get(
+            subject=participant_label,
+            scope="raw",
+            suffix="T1w",
+            extension=".nii.gz",
+            return_type="filename"
+        )
+        if not anat_files:
+            logger.warning(f"No anatomical images found for participant {participant_label}")
+            return None
+        
+        entities = layout.parse_file_entities(anat_files[0])
+        return get_freesurfer_output(
+            derivatives_dir=dataset_derivatives,
+            participant_label=participant_label,
+            version=DEFAULT_FS_VERSION,
+            session=entities.get('session'),
+            run=entities.get('run')
+        )
+    
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
-        args: argparse.Namespace
+        args: argparse.Namespace,
+        dataset_derivatives: Optional[Path] = None
     ) -> bool:
         """Check if FreeSurfer outputs exist for this participant."""
-        # Check for required FreeSurfer output files
-        # This is a simplified check; in practice you'd check the actual FreeSurfer directory
-        logger.info(
-            f"mri2print requires FreeSurfer recon-all output. "
-            f"Ensure 'freesurfer' tool has been run for participant {participant_label}"
-        )
+        if dataset_derivatives is None:
+            dataset = getattr(args, 'dataset', None)
+            if not dataset:
+                logger.info(
+                    "mri2print requires FreeSurfer recon-all output. "
+                    "Ensure 'freesurfer' tool has been run for participant %s",
+                    participant_label
+                )
+                return True
+            dataset_derivatives = Path(DEFAULT_DERIVATIVES) / f"{dataset}-derivatives"
+        
+        if cls._fs_subject_dir(layout, participant_label, Path(dataset_derivatives)) is None:
+            logger.error(
+                f"FreeSurfer output not found for participant {participant_label}. "
+                f"Please run FreeSurfer first before using mri2print."
+            )
+            return False
         return True
     
     @classmethod
@@ -74,87 +163,107 @@ class Mri2PrintTool(BaseTool):
         run: Optional[str] = None
     ) -> Path:
         """Get the output directory path for this participant."""
-        version = args.version or cls.default_version
-        logger.debug(f"get_output_dir: args.version={args.version}, cls.default_version={cls.default_version}, using version={version}")
         subdir = f"sub-{participant_label}"
         if session:
             subdir = f"{subdir}_ses-{session}"
         
-        output_path = dataset_derivatives / f"{cls.name}_{version}" / subdir
-        logger.debug(f"get_output_dir: output_path={output_path}")
+        output_path = dataset_derivatives / cls._output_label(args) / subdir
+        logger.debug("get_output_dir: output_path=%s", output_path)
         return output_path
     
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
         dataset_derivatives: Path,
         apptainer_img: str,
         **kwargs
-    ) -> List[str]:
+    ) -> Union[str, List[str]]:
         """Build the Apptainer command to run the tool.
         
-        mri2print processes FreeSurfer outputs and generates 3D-printable STL meshes.
+        The command is the one process_mri2print_subject launches: the
+        participant's FreeSurfer directory is bound to /fsdir and the
+        ``--output-label`` folder to /derivatives.
         """
-        version = args.version or cls.default_version
-        logger.info(f"build_command: Using version {version}")
-        output_dir = cls.get_output_dir(
-            dataset_derivatives, participant_label, args
+        from ln2t_tools.utils.utils import build_apptainer_cmd
+        
+        fs_output_dir = cls._fs_subject_dir(layout, participant_label, dataset_derivatives)
+        if fs_output_dir is None:
+            logger.error(
+                f"FreeSurfer output not found for participant {participant_label}. "
+                f"Please run FreeSurfer first before using mri2print."
+            )
+            return []
+        
+        output_label = cls._output_label(args)
+        output_dir = dataset_derivatives / output_label
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        return build_apptainer_cmd(
+            tool="mri2print",
+            fs_license=args.fs_license,
+            rawdata=str(dataset_rawdata),
+            derivatives=str(output_dir),
+            participant_label=participant_label,
+            output_label=output_label,
+            apptainer_img=apptainer_img,
+            fs_subjects_dir=str(fs_output_dir),
+            tool_args=getattr(args, 'tool_args', '') or ''
         )
+    
+    @classmethod
+    def build_batch_command(
+        cls,
+        layout: 'BIDSLayout',
+        participant_labels: List[str],
+        args: argparse.Namespace,
+        dataset_rawdata: Path,
+        dataset_derivatives: Path,
+        apptainer_img: str,
+        **kwargs
+    ) -> List[str]:
+        """Build one Apptainer command running mri2print for several participants.
         
-        # Create output directory
+        The FreeSurfer derivatives root and the ``--output-label`` folder
+        are bound once (to /fsdir and /derivatives, as in build_command),
+        and a shell loop inside the container calls the image runscript
+        with each participant's FreeSurfer subject directory.
+        """
+        output_label = cls._output_label(args)
+        output_dir = dataset_derivatives / output_label
         output_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"build_command: Created output directory {output_dir}")
-        
-        # Find FreeSurfer output directory
-        # User can specify a version with --fs-version, otherwise auto-detect
-        fs_version = getattr(args, 'fs_version', None)
-        
-        if fs_version:
-            # User specified a FreeSurfer version
-            fs_dir_pattern = f"freesurfer_{fs_version}"
-            logger.info(f"build_command: Looking for FreeSurfer version {fs_version}")
-        else:
-            # Auto-detect: look for any freesurfer_* directory
-            fs_dir_pattern = "freesurfer_*"
-            logger.info(f"build_command: Auto-detecting FreeSurfer version")
-        
-        # Search within the dataset_derivatives directory for freesurfer_* subdirectories
-        fs_dirs = sorted(dataset_derivatives.glob(fs_dir_pattern))
-        
-        if not fs_dirs:
-            logger.warning(
-                f"No FreeSurfer output found in {dataset_derivatives} matching '{fs_dir_pattern}'. "
-                f"Please run FreeSurfer first."
-            )
-            # Fallback to a reasonable default path
-            if fs_version:
-                fs_input_dir = dataset_derivatives / f"freesurfer_{fs_version}" / f"sub-{participant_label}"
-            else:
-                fs_input_dir = dataset_derivatives / "freesurfer" / f"sub-{participant_label}"
-        else:
-            # Use the most recent/last matching directory
-            fs_input_dir = fs_dirs[-1] / f"sub-{participant_label}"
-        
-        logger.info(f"build_command: Using FreeSurfer input from {fs_input_dir}")
-        
-        # Build Apptainer command
-        # Bind FreeSurfer input (read-only) and output directory
+        
+        # (FreeSurfer subject, participant) pairs for the loop
+        subjects = []
+        for label in participant_labels:
+            fs_output_dir = cls._fs_subject_dir(layout, label, dataset_derivatives)
+            if fs_output_dir is None:
+                fs_output_dir = dataset_derivatives / f"freesurfer_{DEFAULT_FS_VERSION}" / f"sub-{label}"
+                logger.warning(
+                    f"FreeSurfer output not found for participant {label}. "
+                    f"Please run FreeSurfer first before using mri2print."
+                )
+            subjects.extend((fs_output_dir.name, label))
+        fs_root = dataset_derivatives / f"freesurfer_{DEFAULT_FS_VERSION}"
+        
+        tool_args = shlex.split(getattr(args, 'tool_args', '') or '')
+        batch_script = cls._batch_script.format(
+            output_label=shlex.quote(output_label),
+            tool_args="".join(f" {shlex.quote(arg)}" for arg in tool_args)
+        )
+        
         cmd = [
-            "apptainer", "run",
-            "-B", f"{str(fs_input_dir)}:/freesurfer:ro",
-            "-B", f"{str(output_dir)}:/output",
+            "apptainer", "exec",
+            "-B", f"{fs_root}:/fsdir",
+            "-B", f"{output_dir}:/derivatives",
             str(apptainer_img),
-            "-f", "/freesurfer",
-            "-o", "/output",
-            participant_label,
+            "/bin/sh", "-c", batch_script, cls.name,
+            *subjects,
         ]
         
-        # Tool-specific options should be passed via --tool-args
-        # The mri2print container will handle them
-        
-        logger.info(f"build_command: Final command: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("build_batch_command: Final command: %s", ' '.join(cmd))
         return cmd
@@ -8,10 +8,13 @@ resampling to a common resolution.
 
 import argparse
 import logging
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_QSIPREP_VERSION
@@ -19,6 +22,18 @@ from ln2t_tools.utils.defaults import DEFAULT_QSIPREP_VERSION
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _resolve_output_label(version: str, output_label: Optional[str]) -> str:
+    """Return the QSIPrep derivatives folder name for a version/label pair."""
+    return output_label or f"qsiprep_{version}"
+
+
+@lru_cache(maxsize=None)
+def _output_root(dataset_derivatives: str, version: str, output_label: Optional[str]) -> str:
+    """Return the QSIPrep derivatives folder as a plain string path."""
+    return os.path.join(dataset_derivatives, _resolve_output_label(version, output_label))
+
+
 class QSIPrepTool(BaseTool):
     """QSIPrep diffusion MRI preprocessing tool.
     
@@ -95,11 +110,11 @@ Typical runtime: 4-8 hours per subject
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace
     ) -> bool:
-        """Check if DWI data exists for this participant.
+        """Check if DWI data (or a T1w image with --anat-only) exists for this participant.
         
         Parameters
         ----------
@@ -115,16 +130,17 @@ Typical runtime: 4-8 hours per subject
         bool
             True if requirements are met
         """
-        # Check for DWI data
-        dwi_files = layout.get(
-            subject=participant_label,
-            scope="raw",
-            suffix="dwi",
-            extension=".nii.gz",
-            return_type="filename"
-        )
+        # Both checks are set lookups in the dataset-wide file index
+        files = cls._get_index(layout.root).get(participant_label, frozenset())
         
-        if not dwi_files:
+        # --anat-only (passed via --tool-args) needs a T1w but no DWI data
+        if '--anat-only' in (getattr(args, 'tool_args', '') or '').split():
+            if ("T1w", ".nii.gz") not in files:
+                logger.warning(f"No T1w image found for participant {participant_label}")
+                return False
+            return True
+        
+        if ("dwi", ".nii.gz") not in files:
             logger.warning(f"No DWI data found for participant {participant_label}")
             return False
         
@@ -159,15 +175,16 @@ Typical runtime: 4-8 hours per subject
         Path
             Full path to output directory
         """
-        version = args.version or cls.default_version
-        output_label = args.output_label or f"qsiprep_{version}"
+        output_root = _output_root(
+            os.fspath(dataset_derivatives), args.version or cls.default_version, args.output_label
+        )
         
-        return dataset_derivatives / output_label / f"sub-{participant_label}"
+        return Path(os.path.join(output_root, f"sub-{participant_label}"))
     
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -201,10 +218,10 @@ Typical runtime: 4-8 hours per subject
         """
         from ln2t_tools.utils.utils import build_apptainer_cmd
         
-        version = args.version or cls.default_version
-        output_label = args.output_label or f"qsiprep_{version}"
-        output_dir = dataset_derivatives / output_label
-        output_dir.mkdir(parents=True, exist_ok=True)
+        output_dir = _output_root(
+            os.fspath(dataset_derivatives), args.version or cls.default_version, args.output_label
+        )
+        os.makedirs(output_dir, exist_ok=True)
         
         # Get tool_args from user
         tool_args = getattr(args, 'tool_args', '') or ''
@@ -213,7 +230,7 @@ Typical runtime: 4-8 hours per subject
             tool="qsiprep",
             fs_license=args.fs_license,
             rawdata=str(dataset_rawdata),
-            derivatives=str(output_dir),
+            derivatives=output_dir,
             participant_label=participant_label,
             apptainer_img=apptainer_img,
             tool_args=tool_args
@@ -224,7 +241,7 @@ Typical runtime: 4-8 hours per subject
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -266,7 +283,7 @@ Typical runtime: 4-8 hours per subject
         
         # Check if output already exists
         output_dir = cls.get_output_dir(dataset_derivatives, participant_label, args)
-        if output_dir.exists():
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
             logger.info(f"Output exists, skipping: {output_dir}")
             return True
         
@@ -287,7 +304,7 @@ Typical runtime: 4-8 hours per subject
         
         # Launch
         try:
-            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
             launch_apptainer(cmd_str)
             return True
         except Exception as e:
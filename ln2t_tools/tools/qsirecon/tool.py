@@ -8,9 +8,10 @@ supporting various diffusion models and connectome generation.
 import argparse
 import logging
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, TYPE_CHECKING
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.tools.base import BaseTool
 from ln2t_tools.utils.defaults import DEFAULT_QSIRECON_VERSION, DEFAULT_QSIPREP_VERSION
@@ -99,7 +100,7 @@ Please ensure QSIPrep has been run with version 1.1.1 before running QSIRecon.
     @classmethod
     def check_requirements(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_derivatives: Optional[Path] = None
@@ -187,7 +188,7 @@ Please ensure QSIPrep has been run with version 1.1.1 before running QSIRecon.
     @classmethod
     def build_command(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -250,7 +251,7 @@ Please ensure QSIPrep has been run with version 1.1.1 before running QSIRecon.
     @classmethod
     def process_subject(
         cls,
-        layout: BIDSLayout,
+        layout: 'BIDSLayout',
         participant_label: str,
         args: argparse.Namespace,
         dataset_rawdata: Path,
@@ -288,7 +289,7 @@ Please ensure QSIPrep has been run with version 1.1.1 before running QSIRecon.
         
         # Check if output already exists
         output_dir = cls.get_output_dir(dataset_derivatives, participant_label, args)
-        if output_dir.exists():
+        if cls.output_exists(output_dir, kwargs.get('existing_outputs')):
             logger.info(f"Output exists, skipping: {output_dir}")
             return True
         
@@ -309,7 +310,7 @@ Please ensure QSIPrep has been run with version 1.1.1 before running QSIRecon.
         
         # Launch
         try:
-            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else ' '.join(cmd)
+            cmd_str = cmd[0] if isinstance(cmd, list) and len(cmd) == 1 else cmd
             launch_apptainer(cmd_str)
             return True
         except Exception as e:
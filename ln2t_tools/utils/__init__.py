@@ -1,13 +1,27 @@
 """Utility functions for ln2t_tools."""
 
-from .demographics import (
-    create_meld_demographics_from_participants,
-    validate_meld_demographics
-)
-from .utils import get_dataset_initials
-
-__all__ = [
-    'create_meld_demographics_from_participants',
-    'validate_meld_demographics',
-    'get_dataset_initials'
-]
+import importlib
+
+# Re-exported names and the submodule that defines them. Submodules are
+# imported on first access (PEP 562) so that importing e.g.
+# ln2t_tools.utils.defaults does not pull in pandas or pybids.
+_LAZY_EXPORTS = {
+    'create_meld_demographics_from_participants': '.demographics',
+    'validate_meld_demographics': '.demographics',
+    'get_dataset_initials': '.utils',
+}
+
+__all__ = tuple(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,11 +2,109 @@
 
 import logging
 from pathlib import Path
-from typing import List, Optional
-import pandas as pd
+from typing import List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Candidate participants.tsv columns, in order of preference
+AGE_COLUMNS = ('age', 'Age', 'age_at_preoperative', 'Age at preoperative')
+SEX_COLUMNS = ('sex', 'Sex', 'gender', 'Gender')
+
+# participants.tsv columns used to build the MELD demographics file
+PARTICIPANT_COLUMNS = frozenset(('participant_id', 'group') + AGE_COLUMNS + SEX_COLUMNS)
+
+
+def _read_participants_tsv(participants_tsv: Path) -> 'pd.DataFrame':
+    """Read the columns of participants.tsv needed for MELD demographics.
+    
+    Uses the multithreaded pyarrow CSV reader with Arrow-backed dtypes when
+    pyarrow is installed, and pandas otherwise.
+    
+    Args:
+        participants_tsv: Path to BIDS participants.tsv file
+        
+    Returns:
+        DataFrame restricted to the known demographics columns
+    """
+    import pandas as pd
+    
+    # Let pandas parse the header so quoting and a UTF-8 BOM are handled
+    header = pd.read_csv(
+        participants_tsv, sep='\t', encoding='utf-8-sig', nrows=0
+    ).columns
+    logger.info(f"Available columns: {', '.join(header)}")
+    columns = [col for col in header if col in PARTICIPANT_COLUMNS]
+    
+    try:
+        import pyarrow.csv as pv
+    except ImportError:
+        return pd.read_csv(
+            participants_tsv, sep='\t', encoding='utf-8-sig', usecols=columns
+        )
+    
+    table = pv.read_csv(
+        str(participants_tsv),
+        parse_options=pv.ParseOptions(delimiter='\t'),
+        convert_options=pv.ConvertOptions(include_columns=columns)
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _normalize_sex(values: 'pd.Series') -> 'np.ndarray':
+    """Map sex codes (M/F/male/female, any case) to 'male'/'female'.
+    
+    Args:
+        values: Raw sex column
+        
+    Returns:
+        Object array of 'male'/'female', with None for unrecognized values
+    """
+    import numpy as np
+    import pandas as pd
+    
+    codes = pd.Categorical(
+        values.astype(str).str.lower(),
+        categories=['m', 'male', 'f', 'female']
+    ).codes
+    labels = np.array(['male', 'male', 'female', 'female', None], dtype=object)
+    return labels[codes]
+
+
+def _normalize_groups(values: 'pd.Series'):
+    """Lower-case group labels and replace anything but patient/control.
+    
+    Runs as pyarrow compute kernels when pyarrow is installed, and as
+    pandas/NumPy operations otherwise.
+    
+    Args:
+        values: Raw 'group' column
+        
+    Returns:
+        Tuple of (normalized group array, unique invalid values)
+    """
+    import numpy as np
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        group = values.astype('string').str.lower()
+        valid = group.isin(['patient', 'control']).to_numpy()
+        groups = np.where(valid, group.to_numpy(dtype=object), 'patient')
+        return groups, group[~valid].unique()
+    
+    lower = pc.utf8_lower(
+        pa.array(values.to_numpy(dtype=object), from_pandas=True).cast(pa.string())
+    )
+    valid = pc.is_in(lower, value_set=pa.array(['patient', 'control']))
+    groups = pc.if_else(valid, lower, pa.scalar('patient'))
+    invalid = pc.unique(pc.filter(lower, pc.invert(valid)))
+    return groups.to_numpy(zero_copy_only=False), invalid.to_pylist()
+
 
 def create_meld_demographics_from_participants(
     participants_tsv: Path,
@@ -38,71 +136,74 @@ def create_meld_demographics_from_participants(
     Returns:
         Path to created demographics file, or None if failed
     """
+    import numpy as np
+    import pandas as pd
+    
     if not participants_tsv.exists():
         logger.error(f"participants.tsv not found: {participants_tsv}")
         return None
     
     try:
         # Read participants.tsv
-        df = pd.read_csv(participants_tsv, sep='\t')
+        df = _read_participants_tsv(participants_tsv)
         logger.info(f"Loaded participants.tsv with {len(df)} subjects")
-        logger.info(f"Available columns: {', '.join(df.columns)}")
         
         # Filter to requested participants
         # participants.tsv has 'participant_id' with 'sub-' prefix
-        requested_ids = [f"sub-{label}" for label in participant_labels]
-        df_filtered = df[df['participant_id'].isin(requested_ids)].copy()
+        requested_ids = frozenset(f"sub-{label}" for label in participant_labels)
+        mask = df['participant_id'].map(requested_ids.__contains__).to_numpy(dtype=bool)
+        # Only the demographics columns were read, so no column projection is needed
+        df_filtered = df.loc[mask].reset_index(drop=True)
         
         if len(df_filtered) == 0:
-            logger.error(f"No participants found in participants.tsv matching: {requested_ids}")
+            logger.error(f"No participants found in participants.tsv matching: {sorted(requested_ids)}")
             return None
         
         if len(df_filtered) < len(requested_ids):
-            missing = set(requested_ids) - set(df_filtered['participant_id'])
+            missing = requested_ids - set(df_filtered['participant_id'])
             logger.warning(f"Some participants not found in participants.tsv: {missing}")
         
         # Check for required columns and map them
-        demographics = pd.DataFrame()
+        available_columns = set(df_filtered.columns)
+        # Columns are collected first and the DataFrame is built once at the end
+        data = {}
         
         # ID column (required)
-        demographics['ID'] = df_filtered['participant_id']
+        data['ID'] = df_filtered['participant_id'].to_numpy(dtype=object)
         
         # Harmo code (same for all)
-        demographics['Harmo code'] = harmo_code
+        data['Harmo code'] = harmo_code
         
         # Group column
-        if 'group' in df_filtered.columns:
-            demographics['Group'] = df_filtered['group'].str.lower()
-            # Ensure values are 'patient' or 'control'
-            valid_groups = demographics['Group'].isin(['patient', 'control'])
-            if not valid_groups.all():
-                invalid = demographics.loc[~valid_groups, 'Group'].unique()
+        if 'group' in available_columns:
+            groups, invalid = _normalize_groups(df_filtered['group'])
+            if len(invalid):
                 logger.warning(
                     f"Invalid group values found: {invalid}. "
                     f"MELD expects 'patient' or 'control'. Defaulting to 'patient'."
                 )
-                demographics.loc[~valid_groups, 'Group'] = 'patient'
+            data['Group'] = groups
         else:
             logger.warning(
                 "Column 'group' not found in participants.tsv. "
                 "Defaulting all participants to 'patient'."
             )
-            demographics['Group'] = 'patient'
+            data['Group'] = 'patient'
         
         # Age column
-        age_col = None
-        for possible_age_col in ['age', 'Age', 'age_at_preoperative', 'Age at preoperative']:
-            if possible_age_col in df_filtered.columns:
-                age_col = possible_age_col
-                break
+        age_col = next(
+            (col for col in AGE_COLUMNS if col in available_columns), None
+        )
         
         if age_col:
-            demographics['Age at preoperative'] = pd.to_numeric(
+            ages = pd.to_numeric(
                 df_filtered[age_col], errors='coerce'
-            )
+            ).to_numpy(dtype=float, na_value=np.nan)
+            data['Age at preoperative'] = ages
             # Check for NaN values
-            if demographics['Age at preoperative'].isna().any():
-                missing_age = demographics[demographics['Age at preoperative'].isna()]['ID']
+            missing_age_mask = np.isnan(ages)
+            if missing_age_mask.any():
+                missing_age = data['ID'][missing_age_mask]
                 logger.error(
                     f"Missing or invalid age values for: {missing_age.tolist()}. "
                     f"Age is required for MELD harmonization."
@@ -117,23 +218,18 @@ def create_meld_demographics_from_participants(
             return None
         
         # Sex column
-        sex_col = None
-        for possible_sex_col in ['sex', 'Sex', 'gender', 'Gender']:
-            if possible_sex_col in df_filtered.columns:
-                sex_col = possible_sex_col
-                break
+        sex_col = next(
+            (col for col in SEX_COLUMNS if col in available_columns), None
+        )
         
         if sex_col:
-            # Normalize sex values to 'male' or 'female'
-            sex_mapping = {
-                'M': 'male', 'm': 'male', 'male': 'male', 'Male': 'male',
-                'F': 'female', 'f': 'female', 'female': 'female', 'Female': 'female'
-            }
-            demographics['Sex'] = df_filtered[sex_col].map(sex_mapping)
+            # Normalize sex values to 'male' or 'female' (unknown codes -> None)
+            data['Sex'] = _normalize_sex(df_filtered[sex_col])
             
             # Check for invalid values
-            if demographics['Sex'].isna().any():
-                invalid_sex = df_filtered.loc[demographics['Sex'].isna(), ['participant_id', sex_col]]
+            invalid_sex_mask = pd.isna(data['Sex'])
+            if invalid_sex_mask.any():
+                invalid_sex = df_filtered.loc[invalid_sex_mask, ['participant_id', sex_col]]
                 logger.error(
                     f"Invalid sex values found:\n{invalid_sex}\n"
                     f"MELD expects 'male' or 'female' (or M/F)."
@@ -147,6 +243,8 @@ def create_meld_demographics_from_participants(
             )
             return None
         
+        demographics = pd.DataFrame(data, copy=False)
+        
         # Save demographics file
         demographics.to_csv(output_path, index=False)
         logger.info(f"Created MELD demographics file: {output_path}")
@@ -173,6 +271,8 @@ def validate_meld_demographics(demographics_path: Path) -> bool:
     Returns:
         True if valid, False otherwise
     """
+    import pandas as pd
+    
     required_columns = ['ID', 'Harmo code', 'Group', 'Age at preoperative', 'Sex']
     
     try:
@@ -184,8 +284,10 @@ def validate_meld_demographics(demographics_path: Path) -> bool:
             logger.error(f"Demographics file missing required columns: {missing_cols}")
             return False
         
-        # Validate values
-        if df['Group'].isna().any() or not df['Group'].isin(['patient', 'control']).all():
+        # Validate values. Missing and unexpected values both map to
+        # code -1, so a single pass over the int8 codes covers both checks.
+        group = pd.Categorical(df['Group'], categories=['patient', 'control'])
+        if (group.codes == -1).any():
             logger.error("Group column must contain only 'patient' or 'control'")
             return False
         
@@ -193,7 +295,8 @@ def validate_meld_demographics(demographics_path: Path) -> bool:
             logger.error("Age at preoperative column contains missing values")
             return False
         
-        if df['Sex'].isna().any() or not df['Sex'].isin(['male', 'female']).all():
+        sex = pd.Categorical(df['Sex'], categories=['male', 'female'])
+        if (sex.codes == -1).any():
             logger.error("Sex column must contain only 'male' or 'female'")
             return False
         
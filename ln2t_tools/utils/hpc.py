@@ -4,14 +4,21 @@ Supports SLURM-based HPC clusters with configurable connection settings.
 """
 
 import atexit
+import hashlib
 import logging
 import os
+import queue
 import re
+import shutil
+import string
 import subprocess
+import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-import tempfile
+from typing import Optional, Dict, Any, List, Tuple
 
 from ln2t_tools.cli.cli import (
     Colors, 
@@ -31,6 +38,30 @@ logger = logging.getLogger(__name__)
 _ssh_control_path: Optional[str] = None
 _ssh_control_process: Optional[subprocess.Popen] = None
 
+# Time (time.monotonic) of the last successful connection test per
+# (username, hostname, keyfile, gateway), and how long it stays valid
+_ssh_probe_ok_at: Dict[Tuple[str, str, str, Optional[str]], float] = {}
+_SSH_PROBE_TTL = 120.0
+
+# (hostname, path) pairs already found on the cluster; data is only ever
+# added there during a run, so positive checks need not be repeated
+_remote_paths_found: set = set()
+
+# Generated SSH configs (see _ssh_config_file), and shared sockets for
+# on-demand multiplexing when no explicit ControlMaster is running; %C (a
+# hash of the connection) keeps the socket path under the AF_UNIX length limit
+_SSH_CONFIG_DIR = Path.home() / ".ln2t_tools"
+_SSH_SOCKET_DIR = _SSH_CONFIG_DIR / "ssh-sockets"
+_SSH_CONTROL_PERSIST = "10m"
+_ssh_socket_dir_ready = False
+
+# Before Python 3.10, subprocess forks (copying the page tables of the whole
+# process) unless it can use posix_spawn, which needs an absolute
+# executable path and close_fds=False. The descriptors we open are not
+# inheritable (PEP 446), so keeping them open in the child is harmless.
+_SSH_EXECUTABLE = shutil.which("ssh") or "ssh"
+_SPAWN_KWARGS: Dict[str, Any] = {"close_fds": False} if sys.version_info < (3, 10) else {}
+
 
 def _get_control_path() -> str:
     """Get or create the SSH ControlMaster socket path."""
@@ -41,9 +72,119 @@ def _get_control_path() -> str:
     return _ssh_control_path
 
 
+def _control_master_alive() -> bool:
+    """Check whether a ControlMaster is listening on our socket."""
+    control_path = _get_control_path()
+    if not Path(control_path).exists():
+        return False
+    try:
+        # The destination is only used for ControlPath token expansion,
+        # so any placeholder works with an explicit socket path.
+        result = subprocess.run(
+            ["ssh", "-o", f"ControlPath={control_path}", "-O", "check", "ln2t-hpc"],
+            capture_output=True,
+            timeout=5,
+        )
+        return result.returncode == 0
+    except Exception:
+        return False
+
+
+def _prepare_ssh_socket_dir() -> Path:
+    """Create the shared socket directory and drop sockets of dead masters."""
+    global _ssh_socket_dir_ready
+    if not _ssh_socket_dir_ready:
+        _SSH_SOCKET_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        for socket_path in _SSH_SOCKET_DIR.glob("cm-*"):
+            try:
+                result = subprocess.run(
+                    ["ssh", "-o", f"ControlPath={socket_path}", "-O", "check", "ln2t-hpc"],
+                    capture_output=True,
+                    timeout=5,
+                )
+                if result.returncode != 0:
+                    socket_path.unlink()
+            except Exception:
+                pass
+        _ssh_socket_dir_ready = True
+    return _SSH_SOCKET_DIR
+
+
+@lru_cache(maxsize=8)
+def _ssh_config_file(username: str, hostname: str, keyfile: str, gateway: Optional[str]) -> str:
+    """Write the SSH config for one cluster and return its path.
+    
+    User, key, gateway and multiplexing settings all live in this file,
+    passed with -F, so ssh, scp and rsync commands stay short. Unlike -o
+    options, -F is also forwarded to the ssh process that ProxyJump spawns
+    for the gateway hop, which is therefore multiplexed too. The user and
+    system configs are included to keep their settings.
+    """
+    digest = hashlib.sha1(repr((username, hostname, keyfile, gateway)).encode()).hexdigest()[:12]
+    config_file = _SSH_CONFIG_DIR / f"ssh_config-{digest}"
+    
+    lines = [
+        f"# Generated by ln2t_tools for {username}@{hostname}",
+        f"Host {hostname}",
+        f"    User {username}",
+        f"    IdentityFile \"{Path(keyfile).expanduser()}\"",
+        "    ConnectTimeout 10",
+    ]
+    if gateway:
+        lines.append(f"    ProxyJump {username}@{gateway}")
+    lines += [
+        "Host *",
+        "    ControlMaster auto",
+        f"    ControlPath \"{_prepare_ssh_socket_dir()}/cm-%C\"",
+        f"    ControlPersist {_SSH_CONTROL_PERSIST}",
+        f"Include \"{Path.home() / '.ssh' / 'config'}\"",
+        "Include /etc/ssh/ssh_config",
+    ]
+    content = "\n".join(lines) + "\n"
+    
+    try:
+        current = config_file.read_text()
+    except OSError:
+        current = None
+    if current != content:
+        config_file.write_text(content)
+    return str(config_file)
+
+
+def _control_options() -> List[str]:
+    """SSH options to reuse the ControlMaster, if one is running.
+    
+    Without one, the generated config (see :func:`_ssh_config_file`) makes
+    the first connection to a host a master, kept for
+    ``_SSH_CONTROL_PERSIST`` after its last client, that later calls,
+    including from other ln2t_tools processes, reuse.
+    """
+    control_path = _get_control_path()
+    if Path(control_path).exists():
+        return ["-o", f"ControlPath={control_path}"]
+    return []
+
+
+def _ssh_options(username: str, hostname: str, keyfile: str, gateway: Optional[str]) -> List[str]:
+    """Options shared by the ssh, scp and rsync commands."""
+    return ["-F", _ssh_config_file(username, hostname, keyfile, gateway)] + _control_options()
+
+
 def _cleanup_ssh_control():
     """Cleanup SSH ControlMaster connection on exit."""
     global _ssh_control_process, _ssh_control_path
+    if _ssh_control_path and Path(_ssh_control_path).exists():
+        # With ControlPersist the master forks into the background, so
+        # terminating the process we started is not enough: ask the
+        # master itself to exit.
+        try:
+            subprocess.run(
+                ["ssh", "-o", f"ControlPath={_ssh_control_path}", "-O", "exit", "ln2t-hpc"],
+                capture_output=True,
+                timeout=5,
+            )
+        except Exception:
+            pass
     if _ssh_control_process is not None:
         try:
             _ssh_control_process.terminate()
@@ -65,8 +206,12 @@ atexit.register(_cleanup_ssh_control)
 def start_ssh_control_master(username: str, hostname: str, keyfile: str, gateway: Optional[str] = None) -> bool:
     """Start an SSH ControlMaster connection for connection reuse.
     
-    This establishes a persistent SSH connection that subsequent SSH commands
-    can reuse, avoiding rate limiting issues from rapid successive connections.
+    This establishes a persistent SSH connection that subsequent ssh, scp
+    and rsync commands reuse, so each remote call only opens a channel on
+    the existing connection instead of paying a new TCP/authentication
+    handshake. It also avoids rate limiting issues from rapid successive
+    connections. Requires OpenSSH >= 5.6 locally; nothing is needed on the
+    cluster side.
     
     Parameters
     ----------
@@ -88,17 +233,16 @@ def start_ssh_control_master(username: str, hostname: str, keyfile: str, gateway
     
     # If already running, check if it's still alive
     if _ssh_control_process is not None:
-        if _ssh_control_process.poll() is None:
-            return True  # Still running
+        if _ssh_control_process.poll() is None or _control_master_alive():
+            return True  # Still running (possibly backgrounded)
         else:
             _ssh_control_process = None  # Died, need to restart
     
     control_path = _get_control_path()
-    keyfile_expanded = str(Path(keyfile).expanduser())
     
     cmd = [
-        "ssh",
-        "-i", keyfile_expanded,
+        _SSH_EXECUTABLE,
+        "-F", _ssh_config_file(username, hostname, keyfile, gateway),
         "-o", "ConnectTimeout=15",
         "-o", "ControlMaster=yes",
         "-o", f"ControlPath={control_path}",
@@ -106,13 +250,9 @@ def start_ssh_control_master(username: str, hostname: str, keyfile: str, gateway
         "-o", "ServerAliveInterval=30",
         "-o", "ServerAliveCountMax=3",
         "-N",  # Don't execute remote command, just hold connection
+        hostname,
     ]
     
-    if gateway:
-        cmd.extend(["-J", f"{username}@{gateway}"])
-    
-    cmd.append(f"{username}@{hostname}")
-    
     try:
         logger.debug(f"Starting SSH ControlMaster: {' '.join(cmd)}")
         _ssh_control_process = subprocess.Popen(
@@ -123,8 +263,9 @@ def start_ssh_control_master(username: str, hostname: str, keyfile: str, gateway
         # Give it a moment to establish
         time.sleep(1)
         
-        # Check if it's still running (didn't fail immediately)
-        if _ssh_control_process.poll() is not None:
+        # Check if it's still running (didn't fail immediately). A clean
+        # exit means ControlPersist has forked the master to the background.
+        if _ssh_control_process.poll() is not None and not _control_master_alive():
             stderr = _ssh_control_process.stderr.read().decode() if _ssh_control_process.stderr else ""
             logger.warning(f"SSH ControlMaster failed to start: {stderr}")
             _ssh_control_process = None
@@ -146,7 +287,8 @@ def stop_ssh_control_master():
 def get_ssh_command(username: str, hostname: str, keyfile: str, gateway: Optional[str] = None) -> list:
     """Get SSH command with proper key configuration and optional ProxyJump.
     
-    If an SSH ControlMaster is active, the command will reuse that connection.
+    The command reuses the SSH ControlMaster if one is active, and otherwise
+    shares an on-demand master with the other calls to the same host.
     
     Parameters
     ----------
@@ -164,26 +306,118 @@ def get_ssh_command(username: str, hostname: str, keyfile: str, gateway: Optiona
     list
         SSH command with options
     """
-    control_path = _get_control_path()
+    return [_SSH_EXECUTABLE] + _ssh_options(username, hostname, keyfile, gateway) + [hostname]
+
+
+class _RemoteShell:
+    """Long-lived remote bash session for repeated short commands.
     
-    cmd = [
-        "ssh",
-        "-i", str(Path(keyfile).expanduser()),
-        "-o", "ConnectTimeout=10",
-    ]
+    Commands are written to the stdin of a single ``ssh <host> bash -s``
+    process and their output is read back up to a sentinel line, so that
+    polling does not start a new ssh client every time. The session is
+    restarted if it has died, e.g. after the connection dropped.
     
-    # If ControlMaster socket exists, use it
-    if Path(control_path).exists():
-        cmd.extend([
-            "-o", f"ControlPath={control_path}",
-        ])
+    Parameters
+    ----------
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH keyfile path
+    gateway : Optional[str]
+        ProxyJump gateway
+    """
     
-    if gateway:
-        cmd.extend(["-J", f"{username}@{gateway}"])
+    _SENTINEL = "__LN2T_COMMAND_DONE__"
     
-    cmd.append(f"{username}@{hostname}")
+    def __init__(self, username: str, hostname: str, keyfile: str, gateway: Optional[str] = None):
+        self._cmd = get_ssh_command(username, hostname, keyfile, gateway) + ["bash -s"]
+        self._proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
     
-    return cmd
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            self._cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            **_SPAWN_KWARGS
+        )
+        self._lines = queue.Queue()
+        # Read from a thread so that run() can give up after a timeout
+        threading.Thread(
+            target=self._read_lines, args=(self._proc.stdout, self._lines), daemon=True
+        ).start()
+    
+    @staticmethod
+    def _read_lines(stdout, lines: "queue.Queue[Optional[str]]") -> None:
+        for line in stdout:
+            lines.put(line)
+        lines.put(None)
+    
+    def run(self, command: str, timeout: float = 30.0) -> str:
+        """Run a command in the session and return its standard output.
+        
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the command does not complete within ``timeout`` seconds
+        OSError
+            If the session died and could not be restarted
+        """
+        for attempt in range(2):
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            try:
+                # Group the command so that every part of a compound command
+                # reads /dev/null rather than the session's own stdin
+                self._proc.stdin.write(f"{{ {command}\n}} < /dev/null\necho {self._SENTINEL}\n")
+                self._proc.stdin.flush()
+            except OSError:
+                self.close()
+                continue
+            
+            deadline = time.monotonic() + timeout
+            output = []
+            while True:
+                try:
+                    line = self._lines.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    # The session is busy with the stalled command: drop it
+                    self._proc.kill()
+                    self.close()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                if line is None:
+                    # Session ended before the command completed
+                    break
+                if line.rstrip("\n") == self._SENTINEL:
+                    return "".join(output)
+                output.append(line)
+            self.close()
+        raise OSError(f"Remote shell session failed: {' '.join(self._cmd)}")
+    
+    def close(self) -> None:
+        """Terminate the session."""
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+            try:
+                self._proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+                self._proc.wait()
+            self._proc = None
+    
+    def __enter__(self) -> "_RemoteShell":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 def resolve_hpc_env_var(
@@ -222,7 +456,7 @@ def resolve_hpc_env_var(
     ]
     
     try:
-        result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=30, **_SPAWN_KWARGS)
         if result.returncode == 0 and result.stdout.strip():
             # Take last line to skip shell init output
             resolved = result.stdout.strip().split('\n')[-1]
@@ -277,7 +511,7 @@ def check_apptainer_image_exists_on_hpc(
 
     try:
         logger.info(f"Checking for Apptainer image on HPC: {username}@{hostname}:{remote_path}")
-        result = subprocess.run(ssh_cmd, capture_output=True)
+        result = subprocess.run(ssh_cmd, capture_output=True, **_SPAWN_KWARGS)
         return result.returncode == 0
     except Exception as e:
         logger.error(f"Error checking Apptainer image on HPC: {e}")
@@ -526,16 +760,15 @@ def prompt_apptainer_build(
         print_info("This may take a while depending on the image size and network speed...", logger)
         
         try:
-            # Create remote directory if it doesn't exist (use login shell for env var expansion)
-            ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [f"bash -l -c 'mkdir -p {hpc_apptainer_dir}'"]
-            subprocess.run(ssh_cmd, check=True, capture_output=True)
-            
-            # Resolve remote path for scp (need to expand $GLOBALSCRATCH)
-            if hpc_apptainer_dir.startswith('$'):
-                resolve_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [f"bash -l -c 'echo {remote_path}'"]
-                result = subprocess.run(resolve_cmd, capture_output=True, text=True, timeout=30)
-                if result.returncode == 0 and result.stdout.strip():
-                    remote_path = result.stdout.strip().split('\n')[-1]
+            # Create remote directory if it doesn't exist and resolve the remote
+            # path for scp (need to expand $GLOBALSCRATCH) in one round-trip
+            # (use login shell for env var expansion)
+            ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
+                f"bash -l -c 'mkdir -p {hpc_apptainer_dir} && echo {remote_path}'"
+            ]
+            result = subprocess.run(ssh_cmd, check=True, capture_output=True, text=True, timeout=30)
+            if result.stdout.strip():
+                remote_path = result.stdout.strip().split('\n')[-1]
             
             # Push the image using scp
             scp_cmd = get_scp_command(username, hostname, keyfile, gateway) + [
@@ -581,36 +814,18 @@ def prompt_apptainer_build(
         print_info(f"Submitting Apptainer build job...", logger)
         
         try:
-            # Create temporary script file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-                f.write(script_content)
-                temp_script = f.name
-            
-            # Create remote directory for job scripts
+            # Copy script to HPC and submit job in one SSH session
             remote_dir = f"~/ln2t_hpc_jobs/apptainer_builds"
-            ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [f"mkdir -p {remote_dir}"]
-            subprocess.run(ssh_cmd, check=True, capture_output=True)
-            
-            # Copy script to HPC
-            remote_script = f"{remote_dir}/build_{tool}_{version.replace('.', '_')}.sh"
-            scp_cmd = get_scp_command(username, hostname, keyfile, gateway) + [
-                temp_script, f"{username}@{hostname}:{remote_script}"
-            ]
-            subprocess.run(scp_cmd, check=True, capture_output=True)
-            
-            # Submit job
+            script_name = f"build_{tool}_{version.replace('.', '_')}.sh"
+            remote_script = f"{remote_dir}/{script_name}"
             ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
-                f"cd {remote_dir} && sbatch build_{tool}_{version.replace('.', '_')}.sh"
+                _remote_sbatch_command(remote_dir, script_name)
             ]
-            result = subprocess.run(ssh_cmd, capture_output=True, text=True, check=True)
+            result = subprocess.run(
+                ssh_cmd, input=script_content, capture_output=True, text=True, check=True
+            )
             
-            # Parse job ID
-            job_id = None
-            for text in [result.stdout.strip(), result.stderr.strip()]:
-                match = re.search(r'Submitted batch job (\d+)', text)
-                if match:
-                    job_id = match.group(1)
-                    break
+            job_id = _parse_sbatch_job_id(result.stdout, result.stderr)
             
             # Save script locally for reference
             with open(local_script_path, 'w') as f:
@@ -629,9 +844,6 @@ def prompt_apptainer_build(
             print_info(f"3. Once complete, re-run your original command", logger, indent=1)
             print_info("", logger)
             
-            # Cleanup
-            Path(temp_script).unlink(missing_ok=True)
-            
             return True
             
         except subprocess.CalledProcessError as e:
@@ -696,6 +908,9 @@ def prompt_apptainer_build(
 def get_scp_command(username: str, hostname: str, keyfile: str, gateway: Optional[str] = None) -> list:
     """Get SCP command with proper key configuration and optional ProxyJump.
     
+    The command reuses the SSH ControlMaster if one is active, and otherwise
+    shares an on-demand master with the other calls to the same host.
+    
     Parameters
     ----------
     username : str
@@ -712,15 +927,7 @@ def get_scp_command(username: str, hostname: str, keyfile: str, gateway: Optiona
     list
         SCP command with options
     """
-    cmd = [
-        "scp",
-        "-i", str(Path(keyfile).expanduser()),
-    ]
-    
-    if gateway:
-        cmd.extend(["-o", f"ProxyJump={username}@{gateway}"])
-    
-    return cmd
+    return ["scp"] + _ssh_options(username, hostname, keyfile, gateway)
 
 
 def validate_hpc_config(args) -> None:
@@ -747,9 +954,21 @@ def validate_hpc_config(args) -> None:
             )
 
 
-def test_ssh_connection(username: str, hostname: str, keyfile: str, gateway: Optional[str] = None) -> bool:
+def test_ssh_connection(
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None,
+    force: bool = False
+) -> bool:
     """Test SSH connection to HPC and establish ControlMaster for connection reuse.
     
+    A successful test is remembered for two minutes, so back-to-back
+    submissions do not each pay for another probe. If a multiplexing master
+    for the host is already up (e.g. left by a previous run within its
+    ControlPersist time), asking it for its status over the local socket
+    replaces the probe.
+    
     Parameters
     ----------
     username : str
@@ -760,12 +979,30 @@ def test_ssh_connection(username: str, hostname: str, keyfile: str, gateway: Opt
         Path to SSH private key file
     gateway : Optional[str]
         ProxyJump gateway hostname
+    force : bool
+        Probe the connection even if a recent test succeeded
         
     Returns
     -------
     bool
         True if connection successful, False otherwise
     """
+    target = (username, hostname, keyfile, gateway)
+    if not force and time.monotonic() - _ssh_probe_ok_at.get(target, float('-inf')) < _SSH_PROBE_TTL:
+        return True
+    
+    # A live master answers "-O check" locally, without any network round trip
+    try:
+        check_cmd = [_SSH_EXECUTABLE] + _ssh_options(username, hostname, keyfile, gateway) + [
+            "-O", "check", hostname
+        ]
+        if subprocess.run(check_cmd, capture_output=True, timeout=2, **_SPAWN_KWARGS).returncode == 0:
+            logger.info(f"✓ SSH connection to {username}@{hostname} available (reusing ControlMaster)")
+            _ssh_probe_ok_at[target] = time.monotonic()
+            return True
+    except Exception as e:
+        logger.debug(f"ControlMaster check failed: {e}")
+    
     # First, start the ControlMaster for connection reuse
     if not start_ssh_control_master(username, hostname, keyfile, gateway):
         logger.warning("Could not establish SSH ControlMaster, will use individual connections")
@@ -776,10 +1013,12 @@ def test_ssh_connection(username: str, hostname: str, keyfile: str, gateway: Opt
             cmd,
             capture_output=True,
             text=True,
-            timeout=15
+            timeout=15,
+            **_SPAWN_KWARGS
         )
         if result.returncode == 0 and "connected" in result.stdout:
-            logger.info(f"✓ SSH connection to {username}@{hostname} successful")
+            logger.info(f"✓ SSH connection to {username}@{hostname} successful (new connection)")
+            _ssh_probe_ok_at[target] = time.monotonic()
             return True
         else:
             logger.error(f"SSH connection failed: {result.stderr}")
@@ -814,6 +1053,9 @@ def check_remote_path_exists(username: str, hostname: str, keyfile: str, gateway
     bool
         True if path exists, False otherwise
     """
+    if (hostname, remote_path) in _remote_paths_found:
+        return True
+    
     try:
         # Quote the remote_path to avoid remote shell word-splitting/expansion issues
         remote_test = f"test -e '{remote_path}' && echo 'exists' || echo 'not_found'"
@@ -822,7 +1064,8 @@ def check_remote_path_exists(username: str, hostname: str, keyfile: str, gateway
             cmd,
             capture_output=True,
             text=True,
-            timeout=10
+            timeout=10,
+            **_SPAWN_KWARGS
         )
 
         # If the test failed, log the command and returned output to help debugging
@@ -833,8 +1076,10 @@ def check_remote_path_exists(username: str, hostname: str, keyfile: str, gateway
                 logger.debug("SSH command for remote check (could not join cmd list)")
             logger.debug(f"Remote check stdout: {result.stdout!r}")
             logger.debug(f"Remote check stderr: {result.stderr!r}")
+            return False
 
-        return result.returncode == 0 and "exists" in result.stdout
+        _remote_paths_found.add((hostname, remote_path))
+        return True
     except Exception as e:
         logger.error(f"Error checking remote path {remote_path}: {e}")
         return False
@@ -885,10 +1130,7 @@ def prompt_upload_data(local_path: str, remote_path: str, username: str, hostnam
         subprocess.run(ssh_cmd, check=True, capture_output=True)
         
         # Upload data using rsync for better performance
-        if gateway:
-            proxy_cmd = f"ssh -i {keyfile} -J {username}@{gateway}"
-        else:
-            proxy_cmd = f"ssh -i {keyfile}"
+        proxy_cmd = " ".join([_SSH_EXECUTABLE] + _ssh_options(username, hostname, keyfile, gateway))
         
         rsync_cmd = [
             "rsync", "-avz", "--progress",
@@ -909,7 +1151,7 @@ def prompt_upload_data(local_path: str, remote_path: str, username: str, hostnam
 
 def check_required_data(tool: str, dataset: str, participant_label: str, args: Any,
                        username: str, hostname: str, keyfile: str, gateway: Optional[str],
-                       hpc_rawdata: str, hpc_derivatives: str) -> bool:
+                       hpc_rawdata: str, hpc_derivatives: str, prompt: bool = True) -> bool:
     """Check if required input data exists on HPC, prompt for upload if missing.
     
     Parameters
@@ -934,6 +1176,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         HPC rawdata path
     hpc_derivatives : str
         HPC derivatives path
+    prompt : bool
+        Offer to upload missing data; if False, just report it as missing
         
     Returns
     -------
@@ -959,7 +1203,7 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
             f"bash -l -c 'echo {hpc_rawdata_check}'"
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, **_SPAWN_KWARGS)
         if result.returncode == 0 and result.stdout.strip():
             hpc_rawdata_check = result.stdout.strip().split('\n')[-1]  # Take last line (skip any shell init output)
     
@@ -967,7 +1211,7 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
             f"bash -l -c 'echo {hpc_derivatives_check}'"
         ]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, **_SPAWN_KWARGS)
         if result.returncode == 0 and result.stdout.strip():
             hpc_derivatives_check = result.stdout.strip().split('\n')[-1]  # Take last line (skip any shell init output)
     
@@ -975,6 +1219,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
     rawdata_path = f"{hpc_rawdata_check}/{dataset}-rawdata"
     logger.info(f"  [sub-{participant_label}] Checking rawdata on HPC: {rawdata_path}")
     if not check_remote_path_exists(username, hostname, keyfile, gateway, rawdata_path):
+        if not prompt:
+            return False
         logger.warning(f"[sub-{participant_label}] Required data not found on HPC: {rawdata_path}")
         local_rawdata = Path.home() / "rawdata" / f"{dataset}-rawdata"
         if local_rawdata.exists():
@@ -1002,6 +1248,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
             logger.info(f"  [sub-{participant_label}] Checking FreeSurfer outputs on HPC (required by default): {fs_subject_path}")
             
             if not check_remote_path_exists(username, hostname, keyfile, gateway, fs_subject_path):
+                if not prompt:
+                    return False
                 logger.warning(f"[sub-{participant_label}] Required FreeSurfer outputs not found on HPC: {fs_subject_path}")
                 local_fs = Path.home() / "derivatives" / f"{dataset}-derivatives" / f"freesurfer_{fs_version}"
                 if local_fs.exists():
@@ -1028,6 +1276,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         logger.info(f"  [sub-{participant_label}] Checking FreeSurfer outputs on HPC: {fs_subject_path}")
         
         if not check_remote_path_exists(username, hostname, keyfile, gateway, fs_subject_path):
+            if not prompt:
+                return False
             logger.warning(f"[sub-{participant_label}] Required FreeSurfer outputs not found on HPC: {fs_subject_path}")
             local_fs = Path.home() / "derivatives" / f"{dataset}-derivatives" / f"freesurfer_{fs_version}"
             if local_fs.exists():
@@ -1050,6 +1300,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         logger.info(f"  [sub-{participant_label}] Checking QSIPrep outputs on HPC: {qsiprep_path}")
         
         if not check_remote_path_exists(username, hostname, keyfile, gateway, qsiprep_path):
+            if not prompt:
+                return False
             logger.warning(f"[sub-{participant_label}] Required QSIPrep outputs not found on HPC: {qsiprep_path}")
             local_qsiprep = Path.home() / "derivatives" / f"{dataset}-derivatives" / f"qsiprep_{qsiprep_version}"
             if local_qsiprep.exists():
@@ -1071,6 +1323,8 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
         logger.info(f"  [sub-{participant_label}] Checking fMRIPrep outputs on HPC: {fmriprep_path}")
         
         if not check_remote_path_exists(username, hostname, keyfile, gateway, fmriprep_path):
+            if not prompt:
+                return False
             logger.warning(f"[sub-{participant_label}] Required fMRIPrep outputs not found on HPC: {fmriprep_path}")
             local_fmriprep = Path.home() / "derivatives" / f"{dataset}-derivatives" / f"fmriprep_{fmriprep_version}"
             if local_fmriprep.exists():
@@ -1086,6 +1340,78 @@ def check_required_data(tool: str, dataset: str, participant_label: str, args: A
     return True
 
 
+# Fixed parts of the batch scripts, filled in with str.format
+_SBATCH_HEADER = """#!/bin/bash
+#SBATCH --job-name={job_name}
+#SBATCH --cpus-per-task={cpus}
+"""
+
+_SBATCH_RESOURCES = """#SBATCH --time={time_limit}
+#SBATCH --mem={memory}
+#SBATCH --output={log_name}.out
+#SBATCH --error={log_name}.err
+"""
+
+_JOB_PREAMBLE = """
+# Print job information
+echo "Job started at: $(date)"
+echo "Running on node: $(hostname)"
+echo "Job ID: $SLURM_JOB_ID"
+echo "CPUs: {cpus}"
+echo "Memory: {memory}"
+
+# Define data paths
+HPC_RAWDATA="{hpc_rawdata}"
+HPC_DERIVATIVES="{hpc_derivatives}"
+DATASET="{dataset}"
+PARTICIPANT="sub-{participant_label}"
+TOOL_ARGS="{tool_args}"
+"""
+
+_FIND_T1W = """# Find T1w image for this participant
+T1W_FILE=$(find "$HPC_RAWDATA/$DATASET-rawdata/$PARTICIPANT" -name "*_T1w.nii.gz" | head -1)
+if [ -z "$T1W_FILE" ]; then
+    echo "ERROR: No T1w file found for $PARTICIPANT"
+    exit 1
+fi
+echo "Using T1w file: $T1W_FILE"
+"""
+
+# MELD input directory with its BIDS config and links to the raw data
+_MELD_SETUP = """
+# MELD Graph setup
+MELD_VERSION="{version}"
+MELD_DATA_DIR="{meld_data_dir}"
+mkdir -p "$MELD_DATA_DIR/input" "$MELD_DATA_DIR/output/predictions_reports"
+
+# Create MELD config files
+cat > "$MELD_DATA_DIR/input/meld_bids_config.json" << 'EOF'
+{{
+  "T1": {{"session": null, "datatype": "anat", "suffix": "T1w"}},
+  "FLAIR": {{"session": null, "datatype": "anat", "suffix": "FLAIR"}}
+}}
+EOF
+
+cat > "$MELD_DATA_DIR/input/dataset_description.json" << 'EOF'
+{{"Name": "{dataset}", "BIDSVersion": "1.6.0"}}
+EOF
+
+# Link rawdata (one ln call for all subjects; the trailing slash keeps
+# only directories and is stripped before linking)
+shopt -s nullglob
+SUBJECT_DIRS=("{rawdata_dir}"/sub-*/)
+shopt -u nullglob
+if [ ${{#SUBJECT_DIRS[@]}} -gt 0 ]; then
+    ln -sfn -t "$MELD_DATA_DIR/input" "${{SUBJECT_DIRS[@]%/}}"
+fi
+
+"""
+
+_SCRIPT_FOOTER = """
+echo "Job finished at: $(date)"
+"""
+
+
 def generate_hpc_script(
     tool: str,
     participant_label: str,
@@ -1093,13 +1419,18 @@ def generate_hpc_script(
     args: Any,
     hpc_rawdata: str,
     hpc_derivatives: str,
-    hpc_apptainer_dir: str
+    hpc_apptainer_dir: str,
+    participant_labels: Optional[List[str]] = None
 ) -> str:
     """Generate HPC batch script for job submission.
     
     This function generates SLURM batch scripts with tool_args pass-through.
     Tool-specific arguments should be provided via --tool-args on the CLI.
     
+    When ``participant_labels`` is given, a job-array script is generated
+    instead: one array task per participant, each picking its label from
+    a bash array indexed by ``$SLURM_ARRAY_TASK_ID``.
+    
     Parameters
     ----------
     tool : str
@@ -1116,6 +1447,9 @@ def generate_hpc_script(
         Path to derivatives on HPC (can be None to use $GLOBALSCRATCH/derivatives)
     hpc_apptainer_dir : str
         Path to apptainer images on HPC
+    participant_labels : Optional[List[str]]
+        Participants to run as a job array (``participant_label`` is then
+        ignored)
         
     Returns
     -------
@@ -1126,7 +1460,14 @@ def generate_hpc_script(
     tool_args = getattr(args, 'tool_args', '') or ''
     
     # Determine job name
-    job_name = f"{tool}-{dataset}-{participant_label}"
+    if participant_labels:
+        job_name = f"{tool}-{dataset}-array"
+        log_name = f"{job_name}_%A_%a"
+        # Resolved at run time by each array task (see below)
+        participant_label = "${PARTICIPANT_LABEL}"
+    else:
+        job_name = f"{tool}-{dataset}-{participant_label}"
+        log_name = f"{job_name}_%j"
     
     # Paths should be resolved by caller - these are fallbacks
     if not hpc_rawdata:
@@ -1144,19 +1485,19 @@ def generate_hpc_script(
     gpus = getattr(args, 'hpc_gpus', 1)
     
     # Start building script
-    script = f"""#!/bin/bash
-#SBATCH --job-name={job_name}
-#SBATCH --cpus-per-task={cpus}
-"""
+    script_parts = [_SBATCH_HEADER.format(job_name=job_name, cpus=cpus)]
     
     if partition:
-        script += f"#SBATCH --partition={partition}\n"
+        script_parts.append(f"#SBATCH --partition={partition}\n")
     
-    script += f"""#SBATCH --time={time_limit}
-#SBATCH --mem={memory}
-#SBATCH --output={job_name}_%j.out
-#SBATCH --error={job_name}_%j.err
-"""
+    if participant_labels:
+        array_max = getattr(args, 'hpc_array_max', None)
+        throttle = f"%{array_max}" if array_max else ""
+        script_parts.append(f"#SBATCH --array=0-{len(participant_labels) - 1}{throttle}\n")
+    
+    script_parts.append(_SBATCH_RESOURCES.format(
+        time_limit=time_limit, memory=memory, log_name=log_name
+    ))
     
     # Add GPU request for GPU-capable tools
     # fastsurfer: GPU strongly recommended for deep learning segmentation
@@ -1164,25 +1505,26 @@ def generate_hpc_script(
     if tool == 'fastsurfer':
         device = getattr(args, 'device', 'auto')
         if device != 'cpu':
-            script += f"#SBATCH --gres=gpu:{gpus}\n"
+            script_parts.append(f"#SBATCH --gres=gpu:{gpus}\n")
     elif tool == 'meld_graph' and not getattr(args, 'no_gpu', False):
-        script += f"#SBATCH --gres=gpu:{gpus}\n"
-    
-    script += f"""
-# Print job information
-echo "Job started at: $(date)"
-echo "Running on node: $(hostname)"
-echo "Job ID: $SLURM_JOB_ID"
-echo "CPUs: {cpus}"
-echo "Memory: {memory}"
-
-# Define data paths
-HPC_RAWDATA="{hpc_rawdata}"
-HPC_DERIVATIVES="{hpc_derivatives}"
-DATASET="{dataset}"
-PARTICIPANT="sub-{participant_label}"
-TOOL_ARGS="{tool_args}"
-"""
+        script_parts.append(f"#SBATCH --gres=gpu:{gpus}\n")
+    
+    if participant_labels:
+        script_parts.append(f"""
+# Participant handled by this array task
+PARTICIPANTS=({' '.join(participant_labels)})
+PARTICIPANT_LABEL="${{PARTICIPANTS[$SLURM_ARRAY_TASK_ID]}}"
+""")
+    
+    script_parts.append(_JOB_PREAMBLE.format(
+        cpus=cpus,
+        memory=memory,
+        hpc_rawdata=hpc_rawdata,
+        hpc_derivatives=hpc_derivatives,
+        dataset=dataset,
+        participant_label=participant_label,
+        tool_args=tool_args
+    ))
     
     # Tool-specific command generation
     if tool == "freesurfer":
@@ -1191,7 +1533,7 @@ TOOL_ARGS="{tool_args}"
         apptainer_img = f"{hpc_apptainer_dir}/freesurfer.freesurfer.{version}.sif"
         output_dir = f"$HPC_DERIVATIVES/$DATASET-derivatives/freesurfer_{version}"
         
-        script += f"""
+        script_parts.append(f"""
 # FreeSurfer setup
 FS_LICENSE="{fs_license}"
 OUTPUT_DIR="{output_dir}"
@@ -1201,14 +1543,7 @@ mkdir -p "$OUTPUT_DIR"
 export TMPDIR="${{LOCALSCRATCH:-/tmp}}/${{SLURM_JOB_ID:-$$}}"
 mkdir -p "$TMPDIR"
 
-# Find T1w image for this participant
-T1W_FILE=$(find "$HPC_RAWDATA/$DATASET-rawdata/$PARTICIPANT" -name "*_T1w.nii.gz" | head -1)
-if [ -z "$T1W_FILE" ]; then
-    echo "ERROR: No T1w file found for $PARTICIPANT"
-    exit 1
-fi
-echo "Using T1w file: $T1W_FILE"
-
+{_FIND_T1W}
 # Convert host path to container path
 T1W_CONTAINER_PATH="/data/$PARTICIPANT/anat/$(basename "$T1W_FILE")"
 
@@ -1227,7 +1562,7 @@ apptainer exec \\
 
 # Cleanup temp directory
 rm -rf "$TMPDIR"
-"""
+""")
     
     elif tool == "fastsurfer":
         version = getattr(args, 'version', 'v2.4.2')
@@ -1240,20 +1575,13 @@ rm -rf "$TMPDIR"
         if '--device cpu' in tool_args or 'device=cpu' in tool_args:
             gpu_flag = ""
         
-        script += f"""
+        script_parts.append(f"""
 # FastSurfer setup
 FS_LICENSE="{fs_license}"
 OUTPUT_DIR="{output_dir}"
 mkdir -p "$OUTPUT_DIR"
 
-# Find T1w image for this participant
-T1W_FILE=$(find "$HPC_RAWDATA/$DATASET-rawdata/$PARTICIPANT" -name "*_T1w.nii.gz" | head -1)
-if [ -z "$T1W_FILE" ]; then
-    echo "ERROR: No T1w file found for $PARTICIPANT"
-    exit 1
-fi
-echo "Using T1w file: $T1W_FILE"
-
+{_FIND_T1W}
 # Run FastSurfer
 apptainer exec {gpu_flag} \\
     -B "$HPC_RAWDATA/$DATASET-rawdata:/data:ro" \\
@@ -1267,7 +1595,7 @@ apptainer exec {gpu_flag} \\
     --t1 "$T1W_FILE" \\
     --fs_license /opt/freesurfer/license.txt \\
     $TOOL_ARGS
-"""
+""")
     
     elif tool == "fmriprep":
         from ln2t_tools.utils.defaults import DEFAULT_FMRIPREP_FS_VERSION
@@ -1282,7 +1610,7 @@ apptainer exec {gpu_flag} \\
         # Handle FreeSurfer inputs based on --fmriprep-reconall flag
         if allow_fs_reconall:
             # User allows fMRIPrep to run reconstruction
-            script += f"""
+            script_parts.append(f"""
 # fMRIPrep setup - allowing FreeSurfer reconstruction
 FS_LICENSE="{fs_license}"
 OUTPUT_DIR="{output_dir}"
@@ -1303,10 +1631,10 @@ apptainer run \\
     -w /work \\
     --skip-bids-validation \\
     $TOOL_ARGS
-"""
+""")
         else:
             # FreeSurfer is pre-computed and required
-            script += f"""
+            script_parts.append(f"""
 # fMRIPrep setup - using pre-computed FreeSurfer
 FS_LICENSE="{fs_license}"
 OUTPUT_DIR="{output_dir}"
@@ -1339,14 +1667,14 @@ apptainer run \\
     --fs-subjects-dir /fsdir \\
     --skip-bids-validation \\
     $TOOL_ARGS
-"""
+""")
     
     elif tool == "qsiprep":
         version = getattr(args, 'version', '1.0.1')
         apptainer_img = f"{hpc_apptainer_dir}/pennlinc.qsiprep.{version}.sif"
         output_dir = f"$HPC_DERIVATIVES/$DATASET-derivatives/qsiprep_{version}"
         
-        script += f"""
+        script_parts.append(f"""
 # QSIPrep setup
 OUTPUT_DIR="{output_dir}"
 WORK_DIR="$GLOBALSCRATCH/qsiprep_work"
@@ -1367,7 +1695,7 @@ apptainer run \\
     --work-dir /tmp/work/work \\
     $TOOL_ARGS
 
-"""
+""")
     
     elif tool == "qsirecon":
         from ln2t_tools.utils.defaults import DEFAULT_QSIPREP_VERSION
@@ -1379,7 +1707,7 @@ apptainer run \\
         qsiprep_dir = f"$HPC_DERIVATIVES/$DATASET-derivatives/qsiprep_{DEFAULT_QSIPREP_VERSION}"
         code_dir = f"$GLOBALSCRATCH/code/$DATASET-code"
         
-        script += f"""
+        script_parts.append(f"""
 # QSIRecon setup
 FS_LICENSE="{fs_license}"
 OUTPUT_DIR="{output_dir}"
@@ -1403,7 +1731,7 @@ apptainer run --containall --writable-tmpfs \\
     --fs-license-file /opt/freesurfer/license.txt \\
     -w /work \\
     $TOOL_ARGS
-"""
+""")
     
     elif tool == "meld_graph":
         version = getattr(args, 'version', 'v2.2.3')
@@ -1417,33 +1745,13 @@ apptainer run --containall --writable-tmpfs \\
             gpu_flag = ""
             env_vars = "--env CUDA_VISIBLE_DEVICES=''"
         
-        script += f"""
-# MELD Graph setup
-MELD_VERSION="{version}"
-MELD_DATA_DIR="$HPC_DERIVATIVES/$DATASET-derivatives/meld_graph_$MELD_VERSION/data"
-mkdir -p "$MELD_DATA_DIR/input" "$MELD_DATA_DIR/output/predictions_reports"
-
-# Create MELD config files
-cat > "$MELD_DATA_DIR/input/meld_bids_config.json" << 'EOF'
-{{
-  "T1": {{"session": null, "datatype": "anat", "suffix": "T1w"}},
-  "FLAIR": {{"session": null, "datatype": "anat", "suffix": "FLAIR"}}
-}}
-EOF
-
-cat > "$MELD_DATA_DIR/input/dataset_description.json" << 'EOF'
-{{"Name": "{dataset}", "BIDSVersion": "1.6.0"}}
-EOF
-
-# Link rawdata
-for subj_dir in $HPC_RAWDATA/$DATASET-rawdata/sub-*; do
-    if [ -d "$subj_dir" ]; then
-        subj=$(basename $subj_dir)
-        ln -sf "$subj_dir" "$MELD_DATA_DIR/input/$subj"
-    fi
-done
-
-# Run MELD
+        meld_setup = _MELD_SETUP.format(
+            version=version,
+            dataset=dataset,
+            meld_data_dir=f"{hpc_derivatives}/{dataset}-derivatives/meld_graph_{version}/data",
+            rawdata_dir=f"{hpc_rawdata}/{dataset}-rawdata",
+        )
+        script_parts.append(f"""{meld_setup}# Run MELD
 apptainer exec {gpu_flag} \\
     -B "$MELD_DATA_DIR:/data" \\
     -B "{fs_license}:/license.txt:ro" \\
@@ -1451,7 +1759,7 @@ apptainer exec {gpu_flag} \\
     {env_vars} \\
     {apptainer_img} \\
     python scripts/new_patient_pipeline/new_pt_pipeline.py -id sub-{participant_label} $TOOL_ARGS
-"""
+""")
     
     elif tool == "cvrmap":
         # CVRmap for cerebrovascular reactivity mapping
@@ -1467,7 +1775,7 @@ apptainer exec {gpu_flag} \\
         output_label = f"cvrmap_{version}"
         fmriprep_dir = f"$HPC_DERIVATIVES/$DATASET-derivatives/fmriprep_{DEFAULT_CVRMAP_FMRIPREP_VERSION}"
         
-        script += f"""
+        script_parts.append(f"""
 # CVRmap setup
 DERIVATIVES_DIR="{derivatives_dir}"
 OUTPUT_LABEL="{output_label}"
@@ -1484,44 +1792,80 @@ apptainer run \\
     --participant-label {participant_label} \\
     --derivatives fmriprep=/fmriprep \\
     $TOOL_ARGS
-"""
+""")
     
     else:
         raise NotImplementedError(f"HPC submission for {tool} not yet implemented")
     
-    script += """
-echo "Job finished at: $(date)"
-"""
+    script_parts.append(_SCRIPT_FOOTER)
     
-    return script
+    return "".join(script_parts)
 
 
-def submit_hpc_job(
+class _ScriptTemplate(string.Template):
+    """Template whose delimiter does not clash with bash ``$`` expansions."""
+    delimiter = "@@"
+
+
+def compile_hpc_script_template(
     tool: str,
-    participant_label: str,
     dataset: str,
-    args: Any
-) -> Optional[str]:
-    """Submit job to HPC cluster.
+    args: Any,
+    hpc_rawdata: str,
+    hpc_derivatives: str,
+    hpc_apptainer_dir: str
+) -> string.Template:
+    """Render the batch script of a tool once, leaving the participant open.
+    
+    Everything but the participant label is the same for all jobs of a
+    batch submission, so the script is generated once and each job only
+    needs ``template.substitute(participant_label=...)``.
     
     Parameters
     ----------
     tool : str
         Tool name
-    participant_label : str
-        Subject/participant label
     dataset : str
         Dataset name
     args : argparse.Namespace
         Parsed command line arguments
+    hpc_rawdata : str
+        Path to rawdata on HPC
+    hpc_derivatives : str
+        Path to derivatives on HPC
+    hpc_apptainer_dir : str
+        Path to apptainer images on HPC
         
     Returns
     -------
-    Optional[str]
-        Job ID if submission successful, None otherwise
+    string.Template
+        Script template with a ``participant_label`` placeholder
     """
-    logger.info(f"Preparing HPC job for {tool} on {participant_label}...")
+    return _ScriptTemplate(generate_hpc_script(
+        tool=tool,
+        participant_label="@@{participant_label}",
+        dataset=dataset,
+        args=args,
+        hpc_rawdata=hpc_rawdata,
+        hpc_derivatives=hpc_derivatives,
+        hpc_apptainer_dir=hpc_apptainer_dir
+    ))
+
+
+def _prepare_hpc_submission(args: Any) -> Optional[Dict[str, str]]:
+    """Validate HPC settings, open the connection and resolve remote paths.
     
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command line arguments
+        
+    Returns
+    -------
+    Optional[Dict[str, str]]
+        Connection settings and resolved HPC paths, or None if the cluster
+        cannot be reached
+    """
     # Validate configuration
     validate_hpc_config(args)
     
@@ -1543,9 +1887,141 @@ def submit_hpc_job(
     hpc_apptainer_dir = args.hpc_apptainer_dir or '$GLOBALSCRATCH/apptainer'
     
     # Resolve environment variables to actual paths
-    hpc_rawdata = resolve_hpc_env_var(hpc_rawdata, username, hostname, keyfile, gateway)
-    hpc_derivatives = resolve_hpc_env_var(hpc_derivatives, username, hostname, keyfile, gateway)
-    hpc_apptainer_dir = resolve_hpc_env_var(hpc_apptainer_dir, username, hostname, keyfile, gateway)
+    return {
+        'username': username,
+        'hostname': hostname,
+        'keyfile': keyfile,
+        'gateway': gateway,
+        'hpc_rawdata': resolve_hpc_env_var(hpc_rawdata, username, hostname, keyfile, gateway),
+        'hpc_derivatives': resolve_hpc_env_var(hpc_derivatives, username, hostname, keyfile, gateway),
+        'hpc_apptainer_dir': resolve_hpc_env_var(hpc_apptainer_dir, username, hostname, keyfile, gateway),
+    }
+
+
+def _parse_sbatch_job_id(output: str, stderr: str) -> Optional[str]:
+    """Extract the job ID from sbatch output.
+    
+    Parameters
+    ----------
+    output : str
+        sbatch stdout
+    stderr : str
+        sbatch stderr
+        
+    Returns
+    -------
+    Optional[str]
+        Job ID, or None if it could not be found
+    """
+    logger.debug(f"sbatch stdout: {output!r}")
+    logger.debug(f"sbatch stderr: {stderr!r}")
+    
+    # sbatch --parsable prints the bare job ID: "224780" or "224780;lyra"
+    match = re.search(r'^(\d+)(?:;\S*)?$', output.strip(), re.MULTILINE)
+    if match:
+        return match.group(1)
+    
+    # Otherwise look for job ID in stdout first, then stderr
+    # Format can be "Submitted batch job 224780" or "Submitted batch job 224780 on cluster lyra"
+    for text in [output, stderr]:
+        if "Submitted batch job" in text:
+            # Extract job ID - it's the number after "Submitted batch job"
+            match = re.search(r'Submitted batch job (\d+)', text)
+            if match:
+                return match.group(1)
+    return None
+
+
+def _record_submitted_job(
+    job_id: str,
+    tool: str,
+    dataset: str,
+    participant_label: str,
+    metadata: Optional[Dict[str, Any]] = None
+) -> None:
+    """Save job information for status tracking."""
+    try:
+        from ln2t_tools.utils.hpc_status import JobInfo, save_job_info
+        from datetime import datetime
+        
+        job_info = JobInfo(
+            job_id=job_id,
+            tool=tool,
+            dataset=dataset,
+            participant=participant_label,
+            submit_time=datetime.now().isoformat(),
+            state="SUBMITTED",
+            metadata=metadata or {}
+        )
+        save_job_info(job_info)
+        logger.debug(f"Saved job information for tracking")
+    except Exception as e:
+        logger.debug(f"Could not save job information: {e}")
+
+
+def _remote_sbatch_command(remote_dir: str, script_name: str, sbatch: str = "sbatch") -> str:
+    """Remote shell command that stores a job script read from stdin and submits it.
+    
+    Creating the directory, writing the script and calling sbatch happen in
+    a single SSH session, with the script content passed as the session's
+    standard input instead of a local temporary file copied with scp. The
+    script is still kept in ``remote_dir`` for reference, and sbatch runs
+    from there so relative ``--output``/``--error`` paths land next to it.
+    sbatch runs with ``--parsable`` so it prints the bare job ID.
+    
+    Parameters
+    ----------
+    remote_dir : str
+        Remote directory for job scripts
+    script_name : str
+        File name of the job script within ``remote_dir``
+    sbatch : str
+        sbatch invocation (e.g. ``"sbatch --wait"``)
+        
+    Returns
+    -------
+    str
+        Command to run over SSH
+    """
+    return f"mkdir -p {remote_dir} && cd {remote_dir} && cat > {script_name} && {sbatch} --parsable {script_name}"
+
+
+def submit_hpc_job(
+    tool: str,
+    participant_label: str,
+    dataset: str,
+    args: Any
+) -> Optional[str]:
+    """Submit job to HPC cluster.
+    
+    Parameters
+    ----------
+    tool : str
+        Tool name
+    participant_label : str
+        Subject/participant label
+    dataset : str
+        Dataset name
+    args : argparse.Namespace
+        Parsed command line arguments
+        
+    Returns
+    -------
+    Optional[str]
+        Job ID if submission successful, None otherwise
+    """
+    logger.info(f"Preparing HPC job for {tool} on {participant_label}...")
+    
+    context = _prepare_hpc_submission(args)
+    if context is None:
+        return None
+    
+    username = context['username']
+    hostname = context['hostname']
+    keyfile = context['keyfile']
+    gateway = context['gateway']
+    hpc_rawdata = context['hpc_rawdata']
+    hpc_derivatives = context['hpc_derivatives']
     
     if not check_required_data(tool, dataset, participant_label, args, username, hostname, 
                                keyfile, gateway, hpc_rawdata, hpc_derivatives):
@@ -1560,73 +2036,45 @@ def submit_hpc_job(
         args=args,
         hpc_rawdata=hpc_rawdata,
         hpc_derivatives=hpc_derivatives,
-        hpc_apptainer_dir=hpc_apptainer_dir
+        hpc_apptainer_dir=context['hpc_apptainer_dir']
     )
     
-    # Create temporary script file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as f:
-        f.write(script_content)
-        local_script = f.name
-    
     try:
-        # Create remote directory for job scripts
         remote_dir = f"~/ln2t_hpc_jobs/{dataset}"
-        ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [f"mkdir -p {remote_dir}"]
-        subprocess.run(ssh_cmd, check=True, capture_output=True)
+        script_name = f"{tool}_{participant_label}.sh"
+        logger.info(f"Copying job script to {username}@{hostname}:{remote_dir}/{script_name}")
         
-        # Copy script to HPC
-        remote_script = f"{remote_dir}/{tool}_{participant_label}.sh"
-        logger.info(f"Copying job script to {username}@{hostname}:{remote_script}")
-        scp_cmd = get_scp_command(username, hostname, keyfile, gateway) + [
-            local_script, f"{username}@{hostname}:{remote_script}"
-        ]
-        subprocess.run(scp_cmd, check=True, capture_output=True)
-        
-        # Submit job
-        logger.info("Submitting job to HPC...")
+        # Submit job. With --hpc-wait, sbatch --wait keeps the (multiplexed)
+        # SSH channel open until the job ends and SLURM does the waiting,
+        # instead of us polling squeue.
+        wait = getattr(args, 'hpc_wait', False)
+        sbatch = "sbatch --wait" if wait else "sbatch"
+        if wait:
+            logger.info("Submitting job to HPC and waiting for it to finish...")
+        else:
+            logger.info("Submitting job to HPC...")
         ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
-            f"cd {remote_dir} && sbatch {tool}_{participant_label}.sh"
+            _remote_sbatch_command(remote_dir, script_name, sbatch)
         ]
-        result = subprocess.run(ssh_cmd, capture_output=True, text=True, check=True)
+        # sbatch --wait exits with the job's exit code, so only treat a
+        # non-zero return as a submission failure when not waiting
+        result = subprocess.run(
+            ssh_cmd, input=script_content, capture_output=True, text=True, check=not wait,
+            **_SPAWN_KWARGS
+        )
         
-        # Parse job ID - check both stdout and stderr since output may vary
         output = result.stdout.strip()
         stderr = result.stderr.strip()
-        logger.debug(f"sbatch stdout: {output!r}")
-        logger.debug(f"sbatch stderr: {stderr!r}")
-        
-        # Look for job ID in stdout first, then stderr
-        # Format can be "Submitted batch job 224780" or "Submitted batch job 224780 on cluster lyra"
-        job_id = None
-        for text in [output, stderr]:
-            if "Submitted batch job" in text:
-                # Extract job ID - it's the number after "Submitted batch job"
-                match = re.search(r'Submitted batch job (\d+)', text)
-                if match:
-                    job_id = match.group(1)
-                    break
+        job_id = _parse_sbatch_job_id(output, stderr)
         
         if job_id:
             logger.info(f"✓ Job submitted successfully! Job ID: {job_id}")
-            
-            # Save job information for status tracking
-            try:
-                from ln2t_tools.utils.hpc_status import JobInfo, save_job_info
-                from datetime import datetime
-                
-                job_info = JobInfo(
-                    job_id=job_id,
-                    tool=tool,
-                    dataset=dataset,
-                    participant=participant_label,
-                    submit_time=datetime.now().isoformat(),
-                    state="SUBMITTED"
-                )
-                save_job_info(job_info)
-                logger.debug(f"Saved job information for tracking")
-            except Exception as e:
-                logger.debug(f"Could not save job information: {e}")
-            
+            _record_submitted_job(job_id, tool, dataset, participant_label)
+            if wait:
+                if result.returncode == 0:
+                    logger.info(f"✓ Job {job_id} finished successfully")
+                else:
+                    logger.warning(f"Job {job_id} finished with exit code {result.returncode}")
             return job_id
         else:
             logger.error(f"Could not parse job ID from sbatch output. stdout: {output!r}, stderr: {stderr!r}")
@@ -1635,8 +2083,213 @@ def submit_hpc_job(
     except subprocess.CalledProcessError as e:
         logger.error(f"Failed to submit HPC job: {e.stderr}")
         return None
-    finally:
-        Path(local_script).unlink(missing_ok=True)
+
+
+def submit_hpc_jobs_batch(
+    tool: str,
+    participant_labels: List[str],
+    dataset: str,
+    args: Any,
+    context: Dict[str, str],
+    remote_dir: str,
+    submission_delay: float = 0.5,
+    script_template: Optional[string.Template] = None
+) -> Dict[str, Optional[str]]:
+    """Copy and submit one job script per participant over one SSH session.
+    
+    A single ``bash -s`` session receives a shell program that writes each
+    job script (as a here-document) and calls sbatch on it, printing one
+    ``<participant>|<exit status>|<sbatch output>`` line per submission. Submissions
+    are ``submission_delay`` apart, and results are logged as they arrive.
+    
+    Connection setup, remote path resolution and data checks are expected
+    to have been done already (see :func:`submit_multiple_jobs`).
+    
+    Parameters
+    ----------
+    tool : str
+        Tool name
+    participant_labels : List[str]
+        Participant labels, one job each
+    dataset : str
+        Dataset name
+    args : argparse.Namespace
+        Parsed command line arguments
+    context : Dict[str, str]
+        Connection settings and resolved paths from the preparation step
+    remote_dir : str
+        Remote directory for job scripts
+    submission_delay : float
+        Delay in seconds between sbatch calls
+    script_template : Optional[string.Template]
+        Pre-rendered script (see :func:`compile_hpc_script_template`);
+        compiled here if not given
+        
+    Returns
+    -------
+    Dict[str, Optional[str]]
+        Job ID per participant label, None if its submission failed
+    """
+    username = context['username']
+    hostname = context['hostname']
+    keyfile = context['keyfile']
+    gateway = context['gateway']
+    
+    if script_template is None:
+        script_template = compile_hpc_script_template(
+            tool, dataset, args, context['hpc_rawdata'], context['hpc_derivatives'],
+            context['hpc_apptainer_dir']
+        )
+    
+    program = [f"mkdir -p {remote_dir} && cd {remote_dir} || exit 1\n"]
+    for i, participant_label in enumerate(participant_labels):
+        script_content = script_template.substitute(participant_label=participant_label)
+        if not script_content.endswith("\n"):
+            script_content += "\n"
+        script_name = f"{tool}_{participant_label}.sh"
+        if i and submission_delay > 0:
+            program.append(f"sleep {submission_delay}\n")
+        # Quoted delimiter: the script is written verbatim, and the job
+        # scripts use their own EOF here-documents
+        program.append(f"cat > {script_name} <<'LN2T_SCRIPT_EOF'\n{script_content}LN2T_SCRIPT_EOF\n")
+        program.append(
+            f"out=$(sbatch --parsable {script_name} 2>&1); "
+            f"printf '%s|%s|%s\\n' {participant_label} $? \"$(printf '%s' \"$out\" | tr '\\n' ' ')\"\n"
+        )
+    
+    logger.info(f"Submitting {len(participant_labels)} jobs to HPC over one SSH session...")
+    results: Dict[str, Optional[str]] = dict.fromkeys(participant_labels)
+    try:
+        proc = subprocess.Popen(
+            get_ssh_command(username, hostname, keyfile, gateway) + ["bash -s"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            **_SPAWN_KWARGS
+        )
+    except OSError as e:
+        logger.error(f"Failed to submit HPC jobs: {e}")
+        return results
+    
+    # Feed the program and drain stderr from a thread so that neither pipe
+    # can fill up while submission results are read below
+    stderr_chunks: List[str] = []
+    
+    def _feed() -> None:
+        try:
+            proc.stdin.write("".join(program))
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        stderr_chunks.append(proc.stderr.read())
+    
+    feeder = threading.Thread(target=_feed, daemon=True)
+    feeder.start()
+    
+    for line in proc.stdout:
+        participant_label, _, rest = line.rstrip("\n").partition("|")
+        returncode, _, output = rest.partition("|")
+        if participant_label not in results:
+            continue
+        # With --parsable, the job ID is the last word of a successful sbatch
+        # (stderr is merged in, so warnings may come first)
+        words = output.split()
+        job_id = _parse_sbatch_job_id(words[-1], "") if returncode == "0" and words else None
+        if job_id:
+            logger.info(f"✓ Job submitted for {participant_label}! Job ID: {job_id}")
+            _record_submitted_job(job_id, tool, dataset, participant_label)
+            results[participant_label] = job_id
+        else:
+            logger.error(f"Failed to submit HPC job for {participant_label}: {output.strip()}")
+    
+    proc.wait()
+    feeder.join()
+    if proc.returncode != 0:
+        logger.error(f"HPC job submission session failed: {''.join(stderr_chunks).strip()}")
+    
+    return results
+
+
+def submit_hpc_job_array(
+    tool: str,
+    participant_labels: List[str],
+    dataset: str,
+    args: Any,
+    context: Dict[str, str],
+    remote_dir: str
+) -> List[str]:
+    """Submit all participants as a single SLURM job array.
+    
+    One sbatch call and one scheduler entry cover the whole cohort, and
+    the array can be cancelled as a unit. ``--hpc-array-max`` limits how
+    many tasks run at once.
+    
+    Parameters
+    ----------
+    tool : str
+        Tool name
+    participant_labels : List[str]
+        Participant labels, one array task each
+    dataset : str
+        Dataset name
+    args : argparse.Namespace
+        Parsed command line arguments
+    context : Dict[str, str]
+        Connection settings and resolved paths from the preparation step
+    remote_dir : str
+        Remote directory for job scripts
+        
+    Returns
+    -------
+    List[str]
+        Array task IDs (``<job_id>_<index>``), in participant order
+    """
+    username = context['username']
+    hostname = context['hostname']
+    keyfile = context['keyfile']
+    gateway = context['gateway']
+    
+    script_content = generate_hpc_script(
+        tool=tool,
+        participant_label="",
+        dataset=dataset,
+        args=args,
+        hpc_rawdata=context['hpc_rawdata'],
+        hpc_derivatives=context['hpc_derivatives'],
+        hpc_apptainer_dir=context['hpc_apptainer_dir'],
+        participant_labels=participant_labels
+    )
+    
+    logger.info(f"Submitting job array for {len(participant_labels)} participants to HPC...")
+    ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
+        _remote_sbatch_command(remote_dir, f"{tool}_array.sh")
+    ]
+    try:
+        result = subprocess.run(
+            ssh_cmd, input=script_content, capture_output=True, text=True, check=True,
+            **_SPAWN_KWARGS
+        )
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Failed to submit HPC job array: {e.stderr}")
+        return []
+    
+    output = result.stdout.strip()
+    stderr = result.stderr.strip()
+    array_id = _parse_sbatch_job_id(output, stderr)
+    if not array_id:
+        logger.error(f"Could not parse job ID from sbatch output. stdout: {output!r}, stderr: {stderr!r}")
+        return []
+    
+    logger.info(f"✓ Job array submitted successfully! Job ID: {array_id}")
+    job_ids = []
+    for index, participant_label in enumerate(participant_labels):
+        job_id = f"{array_id}_{index}"
+        _record_submitted_job(
+            job_id, tool, dataset, participant_label, metadata={'array_parent': array_id}
+        )
+        job_ids.append(job_id)
+    return job_ids
 
 
 def submit_multiple_jobs(
@@ -1648,6 +2301,15 @@ def submit_multiple_jobs(
 ) -> List[str]:
     """Submit multiple jobs for different participants with staggered timing.
     
+    The connection is opened and remote paths are resolved once, and
+    input data is checked for all participants concurrently; participants
+    with missing data are then revisited one by one, which may prompt for
+    uploads. All job scripts are then written and submitted through a
+    single SSH session, ``submission_delay`` apart (see
+    :func:`submit_hpc_jobs_batch`).
+    With ``--hpc-array``, all participants are submitted as one SLURM job
+    array instead (see :func:`submit_hpc_job_array`).
+    
     Parameters
     ----------
     tool : str
@@ -1667,24 +2329,130 @@ def submit_multiple_jobs(
     List[str]
         List of job IDs for submitted jobs
     """
-    job_ids = []
-    
     logger.info(f"Submitting {len(participant_labels)} jobs (with {submission_delay}s delay between submissions)...")
     
-    for i, participant_label in enumerate(participant_labels):
-        job_id = submit_hpc_job(tool, participant_label, dataset, args)
+    context = _prepare_hpc_submission(args)
+    if context is None:
+        return []
+    
+    username = context['username']
+    hostname = context['hostname']
+    keyfile = context['keyfile']
+    gateway = context['gateway']
+    
+    def _check(participant_label: str, prompt: bool) -> bool:
+        return check_required_data(tool, dataset, participant_label, args, username, hostname,
+                                   keyfile, gateway, context['hpc_rawdata'], context['hpc_derivatives'],
+                                   prompt=prompt)
+    
+    # The checks are independent SSH round trips over the shared connection:
+    # run them concurrently without prompting, then go through the
+    # participants with missing data one at a time, offering uploads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        present = dict(zip(
+            participant_labels,
+            executor.map(lambda label: _check(label, False), participant_labels)
+        ))
+    
+    ready_labels = []
+    for participant_label in participant_labels:
+        if present[participant_label] or _check(participant_label, True):
+            ready_labels.append(participant_label)
+        else:
+            logger.warning(f"Failed to submit job for participant {participant_label}")
+    
+    if not ready_labels:
+        return []
+    
+    remote_dir = f"~/ln2t_hpc_jobs/{dataset}"
+    
+    if getattr(args, 'hpc_array', False):
+        job_ids = submit_hpc_job_array(tool, ready_labels, dataset, args, context, remote_dir)
+        if job_ids and getattr(args, 'hpc_wait', False):
+            wait_for_jobs(job_ids, username, hostname, keyfile, gateway)
+        return job_ids
+    
+    results = submit_hpc_jobs_batch(
+        tool, ready_labels, dataset, args, context, remote_dir, submission_delay
+    )
+    
+    job_ids = []
+    for participant_label in ready_labels:
+        job_id = results[participant_label]
         if job_id:
             job_ids.append(job_id)
         else:
             logger.warning(f"Failed to submit job for participant {participant_label}")
-        
-        # Add delay between submissions to stagger job starts and avoid file locking issues
-        if i < len(participant_labels) - 1:  # No delay after last submission
-            time.sleep(submission_delay)
+    
+    if job_ids and getattr(args, 'hpc_wait', False):
+        # One bulk status query per wake-up rather than one open
+        # sbatch --wait channel per job (sshd caps sessions per connection)
+        wait_for_jobs(job_ids, username, hostname, keyfile, gateway)
     
     return job_ids
 
 
+def wait_for_jobs(
+    job_ids: List[str],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None,
+    max_interval: float = 600.0
+) -> Dict[str, Any]:
+    """Block until none of the given jobs is pending or running.
+    
+    Jobs are polled together (one squeue call, plus one sacct call for
+    jobs that have left the queue) with exponential backoff: 5s, 10s,
+    20s, ... capped at ``max_interval``. Polls go through one remote shell
+    session kept open for the whole wait. A poll that fails (e.g. a
+    timeout) is skipped and retried after the next delay.
+    
+    Parameters
+    ----------
+    job_ids : List[str]
+        SLURM job IDs
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH keyfile path
+    gateway : Optional[str]
+        ProxyJump gateway
+    max_interval : float
+        Longest delay in seconds between two polls
+        
+    Returns
+    -------
+    Dict[str, Any]
+        Final (JobStatus, details) tuple for each job ID
+    """
+    from ln2t_tools.utils.hpc_status import check_job_statuses, JobStatus
+    
+    logger.info(f"Waiting for {len(job_ids)} job(s) to finish...")
+    active = {JobStatus.PENDING, JobStatus.RUNNING}
+    attempt = 0
+    with _RemoteShell(username, hostname, keyfile, gateway) as shell:
+        while True:
+            delay = min(max_interval, 5 * 2 ** attempt)
+            try:
+                statuses = check_job_statuses(job_ids, username, hostname, keyfile, gateway, shell=shell)
+            except RuntimeError as e:
+                logger.warning(f"{e}, retrying in {delay:.0f}s")
+            else:
+                remaining = [job_id for job_id, (status, _) in statuses.items() if status in active]
+                if not remaining:
+                    break
+                logger.info(f"{len(remaining)} job(s) still pending or running, next check in {delay:.0f}s")
+            time.sleep(delay)
+            attempt += 1
+    
+    for job_id, (status, _) in statuses.items():
+        logger.info(f"  Job {job_id}: {status.value}")
+    return statuses
+
+
 def print_download_command(tool: str, dataset: str, args: Any, job_ids: List[str]) -> None:
     """Print command for downloading results from HPC.
     
@@ -1768,19 +2536,14 @@ def check_job_status(job_id: str, username: str, hostname: str, keyfile: str,
     """
     try:
         ssh_cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
-            f"squeue -j {job_id} --format='%T|%M|%L'"
+            f"squeue -h -o %T,%M,%L -j {job_id}"
         ]
-        result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=10, **_SPAWN_KWARGS)
         
         if result.returncode == 0:
             lines = result.stdout.strip().split('\n')
-            if len(lines) > 1:
-                state, time_used, time_left = lines[1].split('|')
-                return {
-                    'state': state,
-                    'time_used': time_used,
-                    'time_left': time_left
-                }
+            if lines[0]:
+                return dict(zip(('state', 'time_used', 'time_left'), lines[0].split(',', 2)))
         return None
     except Exception as e:
         logger.error(f"Error checking job status: {e}")
@@ -4,18 +4,56 @@ Provides utilities to query SLURM job status, parse job states, and track
 job history across multiple sessions.
 """
 
+import csv
+import io
 import json
 import logging
+import os
 import re
 import subprocess
+import sys
+import tempfile
+import time
+from itertools import zip_longest
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict, field
+from typing import Dict, FrozenSet, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, field, replace
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+# orjson (optional, ``pip install ln2t_tools[perf]``) parses and serializes
+# job records several times faster than the stdlib; its JSONDecodeError
+# subclasses json.JSONDecodeError, so error handling is unchanged.
+try:
+    import orjson
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# In-memory copy of hpc_jobs.jsonl, keyed by the file's st_mtime_ns so
+# that writes from other processes are still picked up.
+_JOB_CACHE: Dict[str, Any] = {"mtime": None, "jobs": {}}
+
+# Results of recent status queries, keyed by (hostname, job_id) and
+# stamped with time.monotonic(), so that per-job lookups made right after
+# a bulk query (e.g. within one polling round) do not hit the cluster again
+_status_cache: Dict[Tuple[str, str], Tuple[float, Tuple["JobStatus", Dict[str, Any]]]] = {}
+_STATUS_CACHE_TTL = 5.0
+
 
 class JobState(Enum):
     """SLURM job states."""
@@ -41,7 +79,46 @@ class JobStatus(Enum):
     ERROR = "Error"
 
 
-@dataclass
+_STATUS_EMOJI: Dict[JobStatus, str] = {
+    JobStatus.PENDING: "⏳",
+    JobStatus.RUNNING: "▶️",
+    JobStatus.COMPLETED: "✅",
+    JobStatus.FAILED: "❌",
+    JobStatus.TIMEOUT: "⏱️",
+    JobStatus.CANCELLED: "⛔",
+    JobStatus.ERROR: "⚠️",
+}
+
+
+# SLURM state -> status category; anything else maps to JobStatus.ERROR
+_STATE_MAP: Dict[str, JobStatus] = {
+    "PENDING": JobStatus.PENDING,
+    "CONFIGURING": JobStatus.PENDING,
+    "RUNNING": JobStatus.RUNNING,
+    "STAGE_OUT": JobStatus.RUNNING,
+    "COMPLETED": JobStatus.COMPLETED,
+    "CANCELLED": JobStatus.CANCELLED,
+    "CANCELLED+": JobStatus.CANCELLED,
+    "FAILED": JobStatus.FAILED,
+    "NODE_FAIL": JobStatus.FAILED,
+}
+
+# Reason tokens (SLURM reasons are comma/space separated lists) that mark
+# a job as timed out or out of memory
+_TIMEOUT_TOKENS = frozenset({"TIME_LIMIT", "TIME_LIMIT_EXCEEDED", "TIMEOUT", "TimeLimit"})
+_OOM_TOKENS = frozenset({"OUT_OF_MEMORY", "OutOfMemory"})
+
+
+def _reason_tokens(reason: Optional[str]) -> FrozenSet[str]:
+    """Split a SLURM reason string into a set of tokens."""
+    return frozenset(reason.replace(",", " ").split()) if reason else frozenset()
+
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_SLOTS: Dict[str, bool] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class JobInfo:
     """Information about a submitted HPC job."""
     job_id: str
@@ -70,32 +147,20 @@ class JobInfo:
     @property
     def status_category(self) -> JobStatus:
         """Get human-readable status category."""
-        state = self.state.upper()
+        status = _STATE_MAP.get(self.state.upper(), JobStatus.ERROR)
         
-        if state in ["PENDING", "CONFIGURING"]:
-            return JobStatus.PENDING
-        elif state in ["RUNNING", "STAGE_OUT"]:
-            return JobStatus.RUNNING
-        elif state == "COMPLETED":
-            if self.exit_code == 0:
-                return JobStatus.COMPLETED
-            else:
-                # Failed with non-zero exit code
-                if self.reason and "TIME_LIMIT" in self.reason:
-                    return JobStatus.TIMEOUT
-                elif self.reason and "OUT_OF_MEMORY" in self.reason:
-                    return JobStatus.ERROR
-                else:
-                    return JobStatus.FAILED
-        elif state in ["CANCELLED", "CANCELLED+"]:
-            if self.reason and "TIME_LIMIT" in self.reason:
+        if status is JobStatus.COMPLETED and self.exit_code != 0:
+            # Failed with non-zero exit code
+            tokens = _reason_tokens(self.reason)
+            if tokens & _TIMEOUT_TOKENS:
                 return JobStatus.TIMEOUT
+            elif tokens & _OOM_TOKENS:
+                return JobStatus.ERROR
             else:
-                return JobStatus.CANCELLED
-        elif state in ["FAILED", "NODE_FAIL"]:
-            return JobStatus.FAILED
-        else:
-            return JobStatus.ERROR
+                return JobStatus.FAILED
+        if status is JobStatus.CANCELLED and _reason_tokens(self.reason) & _TIMEOUT_TOKENS:
+            return JobStatus.TIMEOUT
+        return status
 
 
 def get_job_storage_dir() -> Path:
@@ -111,67 +176,208 @@ def get_job_storage_dir() -> Path:
     return job_dir
 
 
+@contextmanager
+def _jobs_lock():
+    """Hold an exclusive lock on the job storage while modifying it.
+    
+    Uses ``fcntl.flock`` on a sidecar lock file so that concurrent
+    submissions (threads, or several ln2t_tools processes) do not
+    interleave writes or lose records during compaction. On platforms
+    without ``fcntl`` this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    lock_file = get_job_storage_dir() / ".hpc_jobs.lock"
+    with open(lock_file, 'w') as lf:
+        fcntl.flock(lf, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def _get_jobs_file() -> Path:
+    """Get the append-only job log, migrating the legacy JSON store.
+    
+    Each line of ``hpc_jobs.jsonl`` is one JobInfo record; later lines
+    for the same job ID supersede earlier ones. Job histories written by
+    older versions to ``hpc_jobs.json`` are converted on first use.
+    
+    Returns
+    -------
+    Path
+        Path to the job log
+    """
+    job_dir = get_job_storage_dir()
+    jobs_file = job_dir / "hpc_jobs.jsonl"
+    legacy_file = job_dir / "hpc_jobs.json"
+    
+    if legacy_file.exists() and not jobs_file.exists():
+        with _jobs_lock():
+            # Another process may have migrated it while we waited
+            if legacy_file.exists() and not jobs_file.exists():
+                try:
+                    with open(legacy_file, 'r') as f:
+                        jobs_data = _json_loads(f.read())
+                    _write_jobs_file(jobs_file, jobs_data.values())
+                    legacy_file.unlink()
+                except (json.JSONDecodeError, IOError) as e:
+                    logger.warning(f"Could not migrate job storage file: {e}")
+    
+    return jobs_file
+
+
+def _write_jobs_file(jobs_file: Path, job_dicts) -> None:
+    """Atomically replace the job log with the given records.
+    
+    Records are written to a temporary file in the same directory, which
+    is then renamed over the log, so readers never see a partial file.
+    """
+    with tempfile.NamedTemporaryFile(
+        'w', dir=jobs_file.parent, prefix='.hpc_jobs.', suffix='.tmp', delete=False
+    ) as f:
+        for job_dict in job_dicts:
+            f.write(_json_dumps(job_dict) + '\n')
+    try:
+        os.replace(f.name, jobs_file)
+    except OSError:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
+def _read_jobs_file(jobs_file: Path) -> Tuple[Dict[str, JobInfo], int]:
+    """Parse the job log.
+    
+    Returns
+    -------
+    Tuple[Dict[str, JobInfo], int]
+        Latest JobInfo per job ID, and the number of records read
+    """
+    jobs = {}
+    n_records = 0
+    with open(jobs_file, 'r') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            n_records += 1
+            try:
+                job_dict = _json_loads(line)
+                jobs[job_dict['job_id']] = JobInfo.from_dict(job_dict)
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Could not load job record: {e}")
+    return jobs, n_records
+
+
+def invalidate_job_cache() -> None:
+    """Drop the in-memory copy of the job storage file."""
+    _JOB_CACHE["mtime"] = None
+    _JOB_CACHE["jobs"] = {}
+
+
+def compact_jobs() -> None:
+    """Rewrite the job log keeping only the latest record per job ID."""
+    jobs_file = _get_jobs_file()
+    
+    with _jobs_lock():
+        # Re-read under the lock so records appended meanwhile are kept
+        try:
+            jobs, _ = _read_jobs_file(jobs_file)
+            _write_jobs_file(jobs_file, (job_info.to_dict() for job_info in jobs.values()))
+        except FileNotFoundError:
+            return
+        except IOError as e:
+            logger.warning(f"Could not compact job storage: {e}")
+            return
+        
+        _JOB_CACHE["mtime"] = jobs_file.stat().st_mtime_ns
+        _JOB_CACHE["jobs"] = jobs
+
+
 def save_job_info(job_info: JobInfo) -> None:
     """Save job information to local storage.
     
+    The record is appended to the job log under the storage lock, so
+    saving does not depend on the number of jobs already tracked and
+    concurrent saves cannot interleave.
+    
     Parameters
     ----------
     job_info : JobInfo
         Job information to save
     """
-    job_dir = get_job_storage_dir()
-    jobs_file = job_dir / "hpc_jobs.json"
-    
-    # Load existing jobs
-    jobs = {}
-    if jobs_file.exists():
-        try:
-            with open(jobs_file, 'r') as f:
-                jobs = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Could not read job storage file: {e}")
-            jobs = {}
+    save_jobs_info([job_info])
+
+
+def save_jobs_info(job_infos: List[JobInfo]) -> None:
+    """Save several job records with a single locked append.
     
-    # Update or add job
-    jobs[job_info.job_id] = job_info.to_dict()
+    Parameters
+    ----------
+    job_infos : List[JobInfo]
+        Job information to save
+    """
+    jobs_file = _get_jobs_file()
     
-    # Save back
-    try:
-        with open(jobs_file, 'w') as f:
-            json.dump(jobs, f, indent=2)
-    except IOError as e:
-        logger.warning(f"Could not save job information: {e}")
+    with _jobs_lock():
+        try:
+            cache_current = jobs_file.stat().st_mtime_ns == _JOB_CACHE["mtime"]
+        except FileNotFoundError:
+            cache_current = False
+        
+        try:
+            with open(jobs_file, 'a') as f:
+                f.write(''.join(_json_dumps(job_info.to_dict()) + '\n' for job_info in job_infos))
+        except IOError as e:
+            logger.warning(f"Could not save job information: {e}")
+            return
+        
+        # Keep the cache in step with what we just wrote instead of
+        # re-reading the file on the next lookup. If the file had changed
+        # behind the cache's back, leave it stale so the next load
+        # re-reads everything.
+        if cache_current:
+            for job_info in job_infos:
+                _JOB_CACHE["jobs"][job_info.job_id] = job_info
+            _JOB_CACHE["mtime"] = jobs_file.stat().st_mtime_ns
 
 
 def load_all_jobs() -> Dict[str, JobInfo]:
     """Load all saved job information.
     
+    The parsed file is cached in memory until its modification time
+    changes. Callers must not mutate the returned dictionary.
+    
     Returns
     -------
     Dict[str, JobInfo]
         Dictionary mapping job IDs to JobInfo objects
     """
-    job_dir = get_job_storage_dir()
-    jobs_file = job_dir / "hpc_jobs.json"
+    jobs_file = _get_jobs_file()
     
-    if not jobs_file.exists():
+    try:
+        mtime = jobs_file.stat().st_mtime_ns
+    except FileNotFoundError:
         return {}
     
+    if mtime == _JOB_CACHE["mtime"]:
+        return _JOB_CACHE["jobs"]
+    
     try:
-        with open(jobs_file, 'r') as f:
-            jobs_data = json.load(f)
-        
-        jobs = {}
-        for job_id, job_dict in jobs_data.items():
-            try:
-                jobs[job_id] = JobInfo.from_dict(job_dict)
-            except (TypeError, ValueError) as e:
-                logger.warning(f"Could not load job {job_id}: {e}")
-        
-        return jobs
-    except (json.JSONDecodeError, IOError) as e:
+        jobs, n_records = _read_jobs_file(jobs_file)
+    except IOError as e:
         logger.warning(f"Could not load job storage: {e}")
         return {}
+    
+    _JOB_CACHE["mtime"] = mtime
+    _JOB_CACHE["jobs"] = jobs
+    
+    # Drop superseded records once they dominate the log
+    if n_records > 4 * len(jobs):
+        compact_jobs()
+        return _JOB_CACHE["jobs"]
+    
+    return jobs
 
 
 def get_job_by_id(job_id: str) -> Optional[JobInfo]:
@@ -225,6 +431,152 @@ def get_jobs_for_tool(tool: str) -> List[JobInfo]:
     return [job for job in jobs.values() if job.tool == tool]
 
 
+def _expand_array_job_ids(job_id: str) -> List[str]:
+    """Expand a compressed job-array ID into one ID per array task.
+    
+    squeue and sacct report array tasks that have not started yet as a
+    single row such as ``12345_[0-3,7%2]``; this returns
+    ``['12345_0', '12345_1', '12345_2', '12345_3', '12345_7']``. Other IDs
+    are returned unchanged.
+    
+    Parameters
+    ----------
+    job_id : str
+        Job ID as printed by squeue/sacct
+        
+    Returns
+    -------
+    List[str]
+        Individual job IDs
+    """
+    match = re.fullmatch(r'(\d+)_\[([^\]]+)\]', job_id)
+    if not match:
+        return [job_id]
+    
+    array_id, spec = match.groups()
+    task_ids = []
+    # Drop the "%N" concurrency limit, then expand "a-b" ranges
+    for item in spec.split('%')[0].split(','):
+        start, _, end = item.partition('-')
+        try:
+            task_ids.extend(range(int(start), int(end or start) + 1))
+        except ValueError:
+            return [job_id]
+    return [f"{array_id}_{task_id}" for task_id in task_ids]
+
+
+# Separators printed between the outputs of a combined squeue + sacct call
+_SQUEUE_MARKER = "=== SQUEUE ==="
+_SACCT_MARKER = "=== SACCT ==="
+
+# Output formats of the status queries and the status dict key of each
+# column. Short flags and a comma separator for squeue: no quoting for the
+# remote shell, and unlike ':' the separator never appears inside timestamps
+_SQUEUE_FORMAT = "%i,%T,%S,%e"
+_SQUEUE_FIELDS = ('job_id', 'state', 'start_time', 'end_time')
+_SACCT_FORMAT = "JobID,State,ExitCode,Reason,Start,End,Elapsed"
+_SACCT_FIELDS = ('job_id', 'state', 'exit_code', 'reason', 'start_time', 'end_time', 'elapsed_time')
+
+
+def _squeue_command(job_ids: List[str]) -> str:
+    """Remote squeue command listing the given jobs."""
+    return f"squeue -h -o {_SQUEUE_FORMAT} -j {','.join(job_ids)}"
+
+
+def _sacct_command(job_ids: List[str]) -> str:
+    """Remote sacct command reporting the given jobs."""
+    return f"sacct -nP -o {_SACCT_FORMAT} -j {','.join(job_ids)}"
+
+
+def _parse_squeue_output(output: str) -> Dict[str, Dict[str, Any]]:
+    """Parse squeue output into status dicts keyed by job ID."""
+    statuses = {}
+    for line in output.splitlines():
+        # Split from the right since compressed array IDs (12345_[0-3,7])
+        # contain commas
+        parts = line.strip().rsplit(',', len(_SQUEUE_FIELDS) - 1)
+        if len(parts) >= 2:
+            info = dict(zip_longest(_SQUEUE_FIELDS, parts))
+            for job_id in _expand_array_job_ids(parts[0]):
+                statuses[job_id] = {**info, 'job_id': job_id}
+    return statuses
+
+
+def _parse_sacct_output(output: str) -> Dict[str, Dict[str, Any]]:
+    """Parse sacct --parsable2 output into status dicts keyed by job ID."""
+    # Split the whole --parsable2 buffer with the C csv parser rather
+    # than per-line str.split calls
+    rows = csv.reader(io.StringIO(output), delimiter='|', quoting=csv.QUOTE_NONE)
+    
+    # Skip job step rows (e.g. 1234.batch, 1234.extern) and keep only
+    # the first row reported for each job
+    job_rows = {}
+    for parts in rows:
+        if len(parts) >= 5 and '.' not in parts[0]:
+            job_rows.setdefault(parts[0], parts)
+    
+    statuses = {}
+    for parts in job_rows.values():
+        info = dict(zip_longest(_SACCT_FIELDS, parts[:len(_SACCT_FIELDS)]))
+        # Extract numeric exit code (format can be "0:0" or "0")
+        info['exit_code'] = int(parts[2].split(':')[0]) if parts[2] else None
+        info['reason'] = parts[3] or None
+        
+        for job_id in _expand_array_job_ids(parts[0]):
+            statuses[job_id] = {**info, 'job_id': job_id}
+    return statuses
+
+
+def query_squeue_status_bulk(
+    job_ids: List[str],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Query squeue for the status of several jobs in one SSH call.
+    
+    Parameters
+    ----------
+    job_ids : List[str]
+        SLURM job IDs
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH key path
+    gateway : Optional[str]
+        ProxyJump gateway
+        
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Job status dicts keyed by job ID; jobs no longer in the queue
+        are absent
+    """
+    from .hpc import _SPAWN_KWARGS, get_ssh_command
+    
+    if not job_ids:
+        return {}
+    
+    try:
+        # Query running jobs with squeue
+        cmd = get_ssh_command(username, hostname, keyfile, gateway) + [_squeue_command(job_ids)]
+        
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, **_SPAWN_KWARGS)
+        
+        # squeue exits non-zero when some of the IDs have left the queue,
+        # but still lists the ones it knows about
+        return _parse_squeue_output(result.stdout)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"Timeout querying squeue for jobs {', '.join(job_ids)}")
+        return {}
+    except Exception as e:
+        logger.debug(f"Error querying squeue: {e}")
+        return {}
+
+
 def query_squeue_status(
     job_id: str,
     username: str,
@@ -234,6 +586,8 @@ def query_squeue_status(
 ) -> Optional[Dict[str, Any]]:
     """Query squeue for running job status.
     
+    Thin wrapper around :func:`query_squeue_status_bulk`.
+    
     Parameters
     ----------
     job_id : str
@@ -252,40 +606,60 @@ def query_squeue_status(
     Optional[Dict[str, Any]]
         Job status dict or None if not found
     """
-    from .hpc import get_ssh_command
+    return query_squeue_status_bulk(
+        [job_id], username, hostname, keyfile, gateway
+    ).get(job_id)
+
+
+def query_sacct_status_bulk(
+    job_ids: List[str],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Query sacct for the status of several finished jobs in one SSH call.
+    
+    Parameters
+    ----------
+    job_ids : List[str]
+        SLURM job IDs
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH key path
+    gateway : Optional[str]
+        ProxyJump gateway
+        
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        Job status dicts keyed by job ID; unknown jobs are absent
+    """
+    from .hpc import _SPAWN_KWARGS, get_ssh_command
+    
+    if not job_ids:
+        return {}
     
     try:
-        # Query running jobs with squeue
-        cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
-            f"squeue -j {job_id} --format='%i:%T:%S:%e' --noheader"
-        ]
+        # Query job accounting with sacct
+        cmd = get_ssh_command(username, hostname, keyfile, gateway) + [_sacct_command(job_ids)]
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10, **_SPAWN_KWARGS)
         
         if result.returncode != 0:
-            return None  # Job not found in queue
+            logger.debug(f"sacct query failed for jobs {', '.join(job_ids)}: {result.stderr}")
+            return {}
         
-        output = result.stdout.strip()
-        if not output:
-            return None
-        
-        # Parse squeue output: job_id:state:start_time:end_time
-        parts = output.split(':')
-        if len(parts) >= 2:
-            return {
-                'job_id': parts[0],
-                'state': parts[1],
-                'start_time': parts[2] if len(parts) > 2 else None,
-                'end_time': parts[3] if len(parts) > 3 else None,
-            }
-        
-        return None
+        return _parse_sacct_output(result.stdout)
     except subprocess.TimeoutExpired:
-        logger.warning(f"Timeout querying squeue for job {job_id}")
-        return None
+        logger.warning(f"Timeout querying sacct for jobs {', '.join(job_ids)}")
+        return {}
     except Exception as e:
-        logger.debug(f"Error querying squeue: {e}")
-        return None
+        logger.debug(f"Error querying sacct: {e}")
+        return {}
 
 
 def query_sacct_status(
@@ -297,6 +671,8 @@ def query_sacct_status(
 ) -> Optional[Dict[str, Any]]:
     """Query sacct for completed job status.
     
+    Thin wrapper around :func:`query_sacct_status_bulk`.
+    
     Parameters
     ----------
     job_id : str
@@ -315,58 +691,157 @@ def query_sacct_status(
     Optional[Dict[str, Any]]
         Job status dict or None if not found
     """
-    from .hpc import get_ssh_command
+    return query_sacct_status_bulk(
+        [job_id], username, hostname, keyfile, gateway
+    ).get(job_id)
+
+
+def query_job_statuses_combined(
+    job_ids: List[str],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None,
+    shell: Optional[Any] = None
+) -> Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]]:
+    """Run squeue and sacct for several jobs in a single SSH call.
     
-    try:
-        # Query job accounting with sacct
-        # Format: jobid:state:exitcode:reason:start:end:elapsed
-        cmd = get_ssh_command(username, hostname, keyfile, gateway) + [
-            f"sacct -j {job_id} --format='JobID,State,ExitCode,Reason,Start,End,Elapsed' "
-            f"--parsable2 --noheader"
-        ]
+    Both commands are sent as one remote command, separated by marker
+    lines, and the output is split on the markers.
+    
+    Parameters
+    ----------
+    job_ids : List[str]
+        SLURM job IDs
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH key path
+    gateway : Optional[str]
+        ProxyJump gateway
+    shell : Optional[Any]
+        Open remote shell session (see ``hpc._RemoteShell``) to run the
+        query in instead of starting a new ssh process
         
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    Returns
+    -------
+    Optional[Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]]
+        squeue and sacct status dicts, each keyed by job ID, or None if
+        the query itself failed (connection error, timeout)
+    """
+    from .hpc import _SPAWN_KWARGS, get_ssh_command
+    
+    if not job_ids:
+        return {}, {}
+    
+    try:
+        # ';' rather than '&&': squeue exits non-zero once some of the jobs
+        # have left the queue, and sacct must still run
+        remote_cmd = (
+            f"echo '{_SQUEUE_MARKER}'; {_squeue_command(job_ids)}; "
+            f"echo '{_SACCT_MARKER}'; {_sacct_command(job_ids)}"
+        )
         
-        if result.returncode != 0:
-            logger.debug(f"sacct query failed for job {job_id}: {result.stderr}")
-            return None
+        if shell is not None:
+            stdout, stderr = shell.run(remote_cmd, timeout=20), ""
+        else:
+            cmd = get_ssh_command(username, hostname, keyfile, gateway) + [remote_cmd]
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=20, **_SPAWN_KWARGS)
+            stdout, stderr = result.stdout, result.stderr
         
-        output = result.stdout.strip()
-        if not output:
+        _, found, output = stdout.partition(_SQUEUE_MARKER)
+        if not found:
+            logger.debug(f"Job status query failed for jobs {', '.join(job_ids)}: {stderr}")
             return None
-        
-        # Parse sacct output (first line is the job, subsequent lines are steps)
-        lines = output.split('\n')
-        if not lines:
+        squeue_output, found, sacct_output = output.partition(_SACCT_MARKER)
+        if not found:
+            logger.debug(f"Job status query was cut short for jobs {', '.join(job_ids)}: {stderr}")
             return None
-        
-        # Parse first line (main job)
-        parts = lines[0].split('|')
-        if len(parts) >= 5:
-            exit_code = parts[2] if parts[2] else None
-            # Extract numeric exit code (format can be "0:0" or "0")
-            if exit_code:
-                exit_code = int(exit_code.split(':')[0])
-            
-            return {
-                'job_id': parts[0],
-                'state': parts[1],
-                'exit_code': exit_code,
-                'reason': parts[3] if parts[3] else None,
-                'start_time': parts[4] if len(parts) > 4 else None,
-                'end_time': parts[5] if len(parts) > 5 else None,
-                'elapsed_time': parts[6] if len(parts) > 6 else None,
-            }
-        
-        return None
+        return _parse_squeue_output(squeue_output), _parse_sacct_output(sacct_output)
     except subprocess.TimeoutExpired:
-        logger.warning(f"Timeout querying sacct for job {job_id}")
+        logger.warning(f"Timeout querying status for jobs {', '.join(job_ids)}")
         return None
     except Exception as e:
-        logger.debug(f"Error querying sacct: {e}")
+        logger.debug(f"Error querying job status: {e}")
         return None
 
 
+def check_job_statuses(
+    job_ids: List[str],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None,
+    shell: Optional[Any] = None
+) -> Dict[str, Tuple[JobStatus, Dict[str, Any]]]:
+    """Check status of several jobs on HPC cluster.
+    
+    Queries squeue (running jobs) and sacct (jobs that have left the
+    queue) together in one SSH call, whatever the number of jobs.
+    
+    Parameters
+    ----------
+    job_ids : List[str]
+        SLURM job IDs
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH key path
+    gateway : Optional[str]
+        ProxyJump gateway
+    shell : Optional[Any]
+        Open remote shell session to query through (see
+        :func:`query_job_statuses_combined`)
+        
+    Returns
+    -------
+    Dict[str, Tuple[JobStatus, Dict[str, Any]]]
+        Status category and detailed status info, keyed by job ID
+        
+    Raises
+    ------
+    RuntimeError
+        If the status query failed, so that no job can be told apart
+        from a job SLURM does not know about
+    """
+    statuses = {}
+    result = query_job_statuses_combined(
+        job_ids, username, hostname, keyfile, gateway, shell=shell
+    )
+    if result is None:
+        raise RuntimeError(f"Could not query status of jobs {', '.join(job_ids)}")
+    queued, finished = result
+    
+    # Prefer squeue (running jobs)
+    for job_id in job_ids:
+        status_info = queued.get(job_id)
+        if status_info:
+            state = status_info.get('state', 'UNKNOWN').upper()
+            statuses[job_id] = (_state_to_status(state, None), status_info)
+    
+    # Jobs not in squeue: use sacct (finished jobs)
+    remaining = [job_id for job_id in job_ids if job_id not in statuses]
+    for job_id in remaining:
+        status_info = finished.get(job_id)
+        if status_info:
+            state = status_info.get('state', 'UNKNOWN').upper()
+            reason = status_info.get('reason')
+            statuses[job_id] = (_state_to_status(state, reason), status_info)
+        else:
+            # Job not found
+            statuses[job_id] = (JobStatus.ERROR, {'state': 'NOT_FOUND'})
+    
+    now = time.monotonic()
+    for job_id, result in statuses.items():
+        _status_cache[(hostname, job_id)] = (now, result)
+    
+    return statuses
+
+
 def check_job_status(
     job_id: str,
     username: str,
@@ -377,6 +852,8 @@ def check_job_status(
     """Check status of a job on HPC cluster.
     
     Queries both squeue (running jobs) and sacct (historical jobs).
+    Thin wrapper around :func:`check_job_statuses`; a result fetched by
+    a query less than ``_STATUS_CACHE_TTL`` seconds ago is reused.
     
     Parameters
     ----------
@@ -395,25 +872,93 @@ def check_job_status(
     -------
     Tuple[JobStatus, Dict[str, Any]]
         Status category and detailed status info
+        
+    Raises
+    ------
+    RuntimeError
+        If the status query failed
     """
-    # First try squeue (running jobs)
-    status_info = query_squeue_status(job_id, username, hostname, keyfile, gateway)
+    cached = _status_cache.get((hostname, job_id))
+    if cached is not None and time.monotonic() - cached[0] < _STATUS_CACHE_TTL:
+        return cached[1]
+    return check_job_statuses([job_id], username, hostname, keyfile, gateway)[job_id]
+
+
+def refresh_all(
+    jobs: Dict[str, JobInfo],
+    username: str,
+    hostname: str,
+    keyfile: str,
+    gateway: Optional[str] = None,
+    max_workers: int = 8,
+    chunk_size: int = 200
+) -> Dict[str, Tuple[JobStatus, Dict[str, Any]]]:
+    """Refresh the stored state of jobs with bulk status queries.
     
-    if status_info:
-        state = status_info.get('state', 'UNKNOWN').upper()
-        return _state_to_status(state, None), status_info
+    Jobs are split into chunks of ``chunk_size`` IDs, each covered by one
+    bulk squeue/sacct call (see :func:`check_job_statuses`), so hundreds
+    of jobs need a handful of SSH channels on the multiplexed connection
+    rather than one ssh process per job. The chunks are queried from a
+    thread pool so their round trips overlap. Updated records are
+    appended to the job log in a single locked write.
     
-    # If not in squeue, try sacct (finished jobs)
-    status_info = query_sacct_status(job_id, username, hostname, keyfile, gateway)
+    Parameters
+    ----------
+    jobs : Dict[str, JobInfo]
+        Jobs to refresh, keyed by job ID (e.g. from load_all_jobs)
+    username : str
+        HPC username
+    hostname : str
+        HPC hostname
+    keyfile : str
+        SSH key path
+    gateway : Optional[str]
+        ProxyJump gateway
+    max_workers : int
+        Maximum number of concurrent SSH queries
+    chunk_size : int
+        Maximum number of job IDs per query
+        
+    Returns
+    -------
+    Dict[str, Tuple[JobStatus, Dict[str, Any]]]
+        Status category and detailed status info, keyed by job ID
+    """
+    statuses = {}
+    updated = []
+    
+    job_ids = list(jobs)
+    chunks = [job_ids[i:i + chunk_size] for i in range(0, len(job_ids), chunk_size)]
     
-    if status_info:
-        state = status_info.get('state', 'UNKNOWN').upper()
-        exit_code = status_info.get('exit_code')
-        reason = status_info.get('reason')
-        return _state_to_status(state, reason), status_info
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(check_job_statuses, chunk, username, hostname, keyfile, gateway): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            try:
+                chunk_statuses = future.result()
+            except Exception as e:
+                logger.debug(f"Could not query live status for jobs {', '.join(futures[future])}: {e}")
+                continue
+            statuses.update(chunk_statuses)
+            
+            for job_id, (status, details) in chunk_statuses.items():
+                job = jobs[job_id]
+                if details.get('state') in (None, 'NOT_FOUND'):
+                    continue
+                changes = {
+                    key: details[key]
+                    for key in ('state', 'exit_code', 'reason', 'start_time', 'end_time', 'elapsed_time')
+                    if details.get(key) is not None and details[key] != getattr(job, key)
+                }
+                if changes:
+                    updated.append(replace(job, **changes))
     
-    # Job not found
-    return JobStatus.ERROR, {'state': 'NOT_FOUND'}
+    if updated:
+        save_jobs_info(updated)
+    
+    return statuses
 
 
 def _state_to_status(state: str, reason: Optional[str]) -> JobStatus:
@@ -431,26 +976,11 @@ def _state_to_status(state: str, reason: Optional[str]) -> JobStatus:
     JobStatus
         Status category
     """
-    state = state.upper()
-    
-    if state in ["PENDING", "CONFIGURING"]:
-        return JobStatus.PENDING
-    elif state in ["RUNNING", "STAGE_OUT"]:
-        return JobStatus.RUNNING
-    elif state == "COMPLETED":
-        return JobStatus.COMPLETED
-    elif state in ["CANCELLED", "CANCELLED+"]:
-        if reason and "TIME_LIMIT" in reason:
-            return JobStatus.TIMEOUT
-        else:
-            return JobStatus.CANCELLED
-    elif state == "FAILED" or state == "NODE_FAIL":
-        if reason and "TIME_LIMIT" in reason:
-            return JobStatus.TIMEOUT
-        else:
-            return JobStatus.FAILED
-    else:
-        return JobStatus.ERROR
+    status = _STATE_MAP.get(state.upper(), JobStatus.ERROR)
+    
+    if status in (JobStatus.CANCELLED, JobStatus.FAILED) and _reason_tokens(reason) & _TIMEOUT_TOKENS:
+        return JobStatus.TIMEOUT
+    return status
 
 
 def format_job_status_report(job_info: JobInfo, status: JobStatus, details: Dict[str, Any]) -> str:
@@ -470,17 +1000,7 @@ def format_job_status_report(job_info: JobInfo, status: JobStatus, details: Dict
     str
         Formatted report
     """
-    status_emoji = {
-        JobStatus.PENDING: "⏳",
-        JobStatus.RUNNING: "▶️",
-        JobStatus.COMPLETED: "✅",
-        JobStatus.FAILED: "❌",
-        JobStatus.TIMEOUT: "⏱️",
-        JobStatus.CANCELLED: "⛔",
-        JobStatus.ERROR: "⚠️",
-    }
-    
-    emoji = status_emoji.get(status, "❓")
+    emoji = _STATUS_EMOJI.get(status, "❓")
     
     report = f"{emoji} Job {job_info.job_id} - {status.value}\n"
     report += f"  Tool: {job_info.tool}\n"
@@ -9,12 +9,14 @@ import json
 import socket
 import getpass
 import re
+import shlex
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union, TYPE_CHECKING
 from warnings import warn
 import subprocess
 
-from bids import BIDSLayout
+if TYPE_CHECKING:
+    from bids import BIDSLayout
 
 from ln2t_tools.utils.defaults import (
     DEFAULT_RAWDATA,
@@ -296,15 +298,19 @@ def list_available_datasets() -> None:
 
 def list_missing_subjects(
     rawdata_dir: Path,
-    output_dir: Path
+    output_dir: Path,
+    bids_db: Optional[Path] = None
 ) -> None:
     """List subjects present in rawdata but missing from output.
     
     Args:
         rawdata_dir: Path to BIDS rawdata directory
         output_dir: Path to derivatives output directory
+        bids_db: Optional directory of saved BIDS layout indexes
     """
-    raw_layout = BIDSLayout(rawdata_dir)
+    from ln2t_tools.tools.base import BaseTool
+    
+    raw_layout = BaseTool.get_or_build_layout(rawdata_dir, bids_db)
     raw_subjects = set(raw_layout.get_subjects())
     
     processed_subjects = {
@@ -798,24 +804,30 @@ def build_apptainer_cmd(tool: str, **options) -> str:
         raise ValueError(f"Unsupported tool: {tool}")
 
 
-def launch_apptainer(apptainer_cmd: str) -> int:
+def launch_apptainer(apptainer_cmd: Union[str, List[str]]) -> int:
     """Launch Apptainer command and return exit code.
     
     Args:
-        apptainer_cmd: The Apptainer command to execute
+        apptainer_cmd: The Apptainer command to execute, either as an
+            argument list (run directly) or as a shell command string
         
     Returns:
         Exit code (0 = success, non-zero = error)
     """
+    is_list = isinstance(apptainer_cmd, (list, tuple))
     logger.info("=" * 80)
     logger.info("Launching Apptainer container")
     logger.info("=" * 80)
-    logger.info(f"Command:\n{apptainer_cmd}")
+    logger.info(f"Command:\n{shlex.join(apptainer_cmd) if is_list else apptainer_cmd}")
     logger.info("=" * 80)
     
     try:
-        # Run with shell=True to preserve full command string semantics
-        completed = subprocess.run(apptainer_cmd, shell=True)
+        if is_list:
+            # Argument lists are executed directly, without a shell
+            completed = subprocess.run([str(arg) for arg in apptainer_cmd], check=False)
+        else:
+            # Run with shell=True to preserve full command string semantics
+            completed = subprocess.run(apptainer_cmd, shell=True)
         return completed.returncode
     except KeyboardInterrupt:
         logger.error("Apptainer run interrupted by user (KeyboardInterrupt)")
@@ -824,7 +836,7 @@ def launch_apptainer(apptainer_cmd: str) -> int:
 
 
 def get_additional_contrasts(
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str,
     session: Optional[str] = None,
     run: Optional[str] = None
@@ -984,7 +996,7 @@ def create_meld_dataset_description(config_dir: Path, dataset_name: str) -> Path
 
 def prepare_meld_input_symlinks(
     meld_input_dir: Path,
-    layout: BIDSLayout,
+    layout: 'BIDSLayout',
     participant_label: str
 ) -> bool:
     """Create symlinks in MELD input structure for a participant.